@@ -3,12 +3,14 @@ from flask import Flask
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_wtf import CSRFProtect
+from flask_login import LoginManager
 from app.models.engine.db_storage import DBStorage
 
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
 csrf = CSRFProtect()
+login_manager = LoginManager()
 
 def create_app():
     """ Creates the application instance"""
@@ -18,7 +20,12 @@ def create_app():
     app_config = Config()
     app.config.from_object(app_config)
 
+    from app.logging_config import configure_logging
+    configure_logging(app.config)
+
     csrf.init_app(app)
+    login_manager.init_app(app)
+    login_manager.login_view = 'auth.login'
     db.init_app(app)
     app.storage = DBStorage(db)
     jwt.init_app(app)
@@ -26,9 +33,42 @@ def create_app():
     migrate.init_app(app, db)
 
     with app.app_context():
+        # Import the models so their tables are registered on db.metadata
+        from app.models import user, deck, flashcard, progress, review_log, scheduler_parameters
+
         # Creating the database tables
         db.create_all()
 
+        # Set up the flashcard search index for the database in use
+        from app.search import register_search
+        register_search(app, db)
+
+        # Size the user identity cache from the config
+        from app.services.user_service import user_cache
+        user_cache.maxsize = app.config['USER_CACHE_SIZE']
+        user_cache.ttl = app.config['USER_CACHE_TTL']
+
+        # Size the review forecast cache from the config
+        from app.services.progress_service import forecast_cache, parameters_cache
+        forecast_cache.maxsize = app.config['FORECAST_CACHE_SIZE']
+        forecast_cache.ttl = app.config['FORECAST_CACHE_TTL']
+
+        # Register the request metrics hooks
+        from app.metrics import metrics, register_metrics
+        metrics.register_cache('user', user_cache)
+        metrics.register_cache('forecast', forecast_cache)
+        metrics.register_cache('scheduler_parameters', parameters_cache)
+        register_metrics(app)
+
+        # Cache compiled templates
+        from app.template_cache import register_template_cache
+        register_template_cache(app)
+
+        # Build the static asset bundles and the asset_url template helper
+        from app.assets import register_assets, assets_cli
+        register_assets(app)
+        app.cli.add_command(assets_cli)
+
         # Register routes
         from app.web_routes import auth_routes, decks_routes, flashcards_routes, profile_routes
         app.register_blueprint(auth_routes.bp)
@@ -43,22 +83,53 @@ def create_app():
         app.register_blueprint(decks.decks_view)
         app.register_blueprint(flashcards.flashcards_view)
         app.register_blueprint(progress.progress_view)
+
+        # API endpoints answer 401 instead of redirecting to the login page
+        for blueprint in (index.index_view, users.users_view, decks.decks_view,
+                          flashcards.flashcards_view, progress.progress_view):
+            login_manager.blueprint_login_views[blueprint.name] = None
         
         # Register error handlers
         from app.error_handlers import register_error_handlers
         register_error_handlers(app)
 
+        # Register the API response compression hook
+        from app.compression import register_compression
+        register_compression(app)
+
+        # Register the opt-in SQL query profiler
+        from app.query_profiler import register_query_profiler
+        register_query_profiler(app, db)
+
+        # Register the request profiling hooks and CLI
+        from app.request_profiler import register_request_profiler, profiling_cli
+        register_request_profiler(app)
+        app.cli.add_command(profiling_cli)
+
+        # Register the review log flush hooks and maintenance CLI
+        from app.review_log import register_review_log
+        register_review_log(app)
+
+        # Set up the optional progress ingestion queue and its CLI
+        from app.ingestion import register_ingestion
+        register_ingestion(app)
+
+        # Register the batch job CLI commands
+        from app.jobs.commands import jobs_cli
+        app.cli.add_command(jobs_cli)
+
     return app
 
-from flask import current_app as app
 
-'''
 @login_manager.user_loader
 def load_user(user_id):
     """ Loads the user """
-    from app.models.user import User
-    return app.storage.get(User, user_id)
-    
+    from app.services.user_service import UserService
+    return UserService.load_user(user_id)
+
+from flask import current_app as app
+
+'''
 with app.app_context():
     @app.teardown_appcontext
     def close_db():
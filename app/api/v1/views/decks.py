@@ -2,11 +2,15 @@
 """ Decks API Endpoint """
 
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from app.models.deck import Deck
 from app.services.deck_service import DeckService
+from app.services.flashcard_service import FlashcardService
+from app.exceptions import NotFoundError, ValidationError
+from app.schedulers import SCHEDULERS
 from app import db, csrf
+from app.http_cache import make_etag, not_modified, add_validators
 
 decks_view = Blueprint('decks_view', __name__, url_prefix='/api/v1/')
 
@@ -19,8 +23,81 @@ def get_all_decks():
     Retrieves all decks belonging to the current user.
 
     Returns:
-    tuple: A tuple containing a JSON response with a list of decks and an HTTP status code 200.
+    tuple: A tuple containing a JSON response with a list of decks and an HTTP status code 200,
+    or an empty 304 response when the client's copy (If-None-Match) is current.
     """
+    count, last_modified = DeckService.get_decks_version(current_user.id)
+    etag = make_etag('decks', current_user.id, count, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
     decks_objs = DeckService.get_decks_by_user(current_user.id)
     decks_list = [deck.to_dict() for deck in decks_objs]
-    return jsonify(decks_list), 200
+    return add_validators(jsonify(decks_list), etag, last_modified), 200
+
+
+@decks_view.route('/users/me/decks/<deck_id>/dedupe', methods=['POST'],
+                  strict_slashes=False)
+@login_required
+def dedupe_deck(deck_id):
+    """
+    Deletes the duplicate flashcards of a deck of the current user, keeping the most
+    reviewed card of each group of identical ones.
+
+    Args:
+        deck_id (str): The ID of the deck to deduplicate.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the number of flashcards removed
+        and an HTTP status code 200, or raises NotFoundError if the deck is not found.
+    """
+    if not DeckService.verify_deck_ownership(deck_id, current_user.id):
+        raise NotFoundError('Deck not found')
+
+    return jsonify({'removed': FlashcardService.dedupe_deck(deck_id)}), 200
+
+
+@decks_view.route('/schedulers', methods=['GET'], strict_slashes=False)
+@csrf.exempt
+def get_schedulers():
+    """
+    Lists the spaced repetition algorithms a deck can be scheduled with.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the 'name' and 'description' of
+        each scheduler and an HTTP status code 200.
+    """
+    return jsonify([{'name': name, 'description': scheduler.description}
+                    for name, scheduler in sorted(SCHEDULERS.items())]), 200
+
+
+@decks_view.route('/users/me/decks/<deck_id>/scheduler', methods=['PUT'],
+                  strict_slashes=False)
+@login_required
+def set_deck_scheduler(deck_id):
+    """
+    Selects the spaced repetition algorithm scheduling the reviews of a deck of the
+    current user.
+
+    Args:
+        deck_id (str): The ID of the deck.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the updated deck and an HTTP status
+        code 200, or raises NotFoundError if the deck is not found and ValidationError if
+        the scheduler is missing or unknown.
+    """
+    if not DeckService.verify_deck_ownership(deck_id, current_user.id):
+        raise NotFoundError('Deck not found')
+
+    data = request.get_json(silent=True) or {}
+    if not data.get('scheduler'):
+        raise ValidationError('scheduler is required')
+    try:
+        deck = DeckService.update_deck(deck_id, scheduler=data['scheduler'])
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    db.session.refresh(deck)
+    return jsonify(deck.to_dict()), 200
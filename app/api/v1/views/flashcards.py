@@ -1,12 +1,15 @@
 #!/usr/bin/python3
 """ Flashcards API Endpoints """
 
-from flask import Blueprint, jsonify, current_app as app
+from flask import Blueprint, jsonify, request, current_app as app
 from flask_login import login_required, current_user
 from app.models.flashcard import Flashcard
 from app.services.flashcard_service import FlashcardService
-from app.exceptions import NotFoundError
+from app.services.deck_service import DeckService
+from app.services.search_service import SearchService
+from app.exceptions import NotFoundError, ValidationError
 from app import db, csrf
+from app.http_cache import make_etag, not_modified, add_validators
 
 flashcards_view = Blueprint('flashcards_view', __name__, url_prefix='/api/v1/') 
 
@@ -22,13 +25,104 @@ def get_all_flashcards(deck_id):
         deck_id (str): The ID of the deck to retrieve flashcards from.
 
     Returns:
-        tuple: A tuple containing a JSON response with a list of flashcards and an HTTP status code 200.
+        tuple: A tuple containing a JSON response with a list of flashcards and an HTTP status code 200,
+               or an empty 304 response when the client's copy (If-None-Match) is current.
     """
+    count, last_modified = FlashcardService.get_deck_flashcards_version(deck_id)
+    etag = make_etag('flashcards', current_user.id, deck_id, count, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
     flashcards_objs = FlashcardService.get_flashcards_by_deck(deck_id)
     flashcards_list = [flashcard.to_dict() for flashcard in flashcards_objs]
+    return add_validators(jsonify(flashcards_list), etag, last_modified), 200
+
+
+@flashcards_view.route('/users/me/decks/<deck_id>/flashcards/import', methods=['POST'],
+                       strict_slashes=False)
+@login_required
+def import_flashcards(deck_id):
+    """
+    Imports many flashcards into a deck of the current user, skipping those identical
+    (after normalization) to a flashcard already in the deck or earlier in the import.
+
+    Args:
+        deck_id (str): The ID of the deck to import into.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the number of flashcards 'created' and
+               'duplicates' skipped and an HTTP status code 201, or raises NotFoundError if the
+               deck is not found, or ValidationError if the body is not a list of flashcards.
+    """
+    if not DeckService.verify_deck_ownership(deck_id, current_user.id):
+        raise NotFoundError('Deck not found')
+
+    data = request.get_json(silent=True)
+    cards = data.get('flashcards') if isinstance(data, dict) else data
+    if not isinstance(cards, list) or not cards:
+        raise ValidationError('Request body must be a non-empty list of flashcards')
+
+    return jsonify(FlashcardService.import_flashcards(deck_id, cards)), 201
+
+
+@flashcards_view.route('/users/me/flashcards/due', methods=['GET'],
+                       strict_slashes=False)
+@csrf.exempt
+@login_required
+def get_due_flashcards():
+    """
+    Retrieves the next flashcards due for review across all decks of the current user,
+    most overdue first, each with its progress, so one request drives a combined session.
+
+    Query parameters:
+        limit (int): Maximum number of flashcards (default 50, capped by REVIEW_QUEUE_SIZE).
+
+    Returns:
+        tuple: A tuple containing a JSON response with a list of flashcards (each with its
+               'progress') and an HTTP status code 200, or raises ValidationError if the
+               limit is not positive.
+    """
+    limit = request.args.get('limit', 50, type=int)
+    if limit < 1:
+        raise ValidationError('limit must be a positive integer')
+    limit = min(limit, app.config.get('REVIEW_QUEUE_SIZE', 100))
+
+    flashcards_list = []
+    for flashcard in FlashcardService.get_due_flashcards_by_user(current_user.id, limit):
+        card = flashcard.to_dict()
+        card['progress'] = flashcard.progress.to_dict()
+        flashcards_list.append(card)
     return jsonify(flashcards_list), 200
 
 
+@flashcards_view.route('/users/me/flashcards/search', methods=['GET'],
+                       strict_slashes=False)
+@csrf.exempt
+@login_required
+def search_flashcards():
+    """
+    Searches the questions and answers of the current user's flashcards.
+
+    Query parameters:
+        q (str): The search terms; the last one also matches as a prefix.
+        page (int): The 1-based page number (default 1).
+        per_page (int): Results per page, at most 100 (default 20).
+
+    Returns:
+        tuple: A tuple containing a JSON response with the page of flashcards ordered by
+               relevance (each with a 'score'), 'page', 'per_page' and 'has_next', and an
+               HTTP status code 200, or raises ValidationError if the query is empty.
+    """
+    results = SearchService.search_flashcards(
+        current_user.id,
+        request.args.get('q', ''),
+        request.args.get('page', 1, type=int),
+        request.args.get('per_page', 20, type=int)
+    )
+    return jsonify(results), 200
+
+
 @flashcards_view.route('/users/me/flashcards/<flashcard_id>',
                        methods=['GET'], strict_slashes=False)
 @csrf.exempt
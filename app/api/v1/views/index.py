@@ -1,7 +1,11 @@
 #!/usr/bin/python3
 """ Index API Endpoint """
 
-from flask import jsonify, Blueprint
+import hmac
+from flask import jsonify, Blueprint, Response, current_app, request
+from app import db
+from app.exceptions import NotFoundError, UnauthorizedError
+from app.metrics import metrics
 
 index_view = Blueprint('index_view', __name__, url_prefix='/api/v1')
 
@@ -14,3 +18,28 @@ def status():
         tuple: A tuple containing a JSON response with the status message "OK" and an HTTP status code 200.
     """
     return jsonify({"status": "OK"})
+
+
+@index_view.route('/metrics', methods=['GET'], strict_slashes=False)
+def get_metrics():
+    """
+    Returns the request, database pool and cache metrics of this process.
+
+    The endpoint is only served when METRICS_ENABLED is set and a
+    METRICS_TOKEN is configured, to scrapers sending that token as a
+    bearer token.
+
+    Returns:
+        Response: The metrics in the Prometheus text exposition format with an HTTP status code 200.
+
+    Raises:
+        NotFoundError: If the metrics endpoint is not enabled.
+        UnauthorizedError: If the request does not carry the metrics token.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if not current_app.config.get('METRICS_ENABLED', True) or not token:
+        raise NotFoundError()
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(credentials.encode(), token.encode()):
+        raise UnauthorizedError('Invalid metrics token')
+    return Response(metrics.render(db.engine), mimetype='text/plain; version=0.0.4')
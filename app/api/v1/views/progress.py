@@ -2,17 +2,26 @@
 """ Progress API Endpoints """
 
 from flask import Blueprint, jsonify, request, current_app as app
-from flask_login import login_required
+from flask_login import login_required, current_user
 from app.models.progress import Progress
 from app.models.flashcard import Flashcard
 from app.services.progress_service import ProgressService
 from app.services.flashcard_service import FlashcardService
+from app.services.scheduler_service import SchedulerService
+from app.services.review_log_service import ReviewLogService
 from app.exceptions import NotFoundError, ValidationError
 from app import db, csrf
+from app.http_cache import make_etag, not_modified, add_validators
+from app.ingestion import enqueue_progress
 from datetime import datetime
 
 progress_view = Blueprint('progress_view', __name__, url_prefix='/api/v1/') 
 
+# Fields a progress PUT may set, and those that must be numbers
+PROGRESS_FIELDS = ('review_count', 'correct_count', 'ease_factor', 'interval', 'last_review_date',
+                   'next_review_date', 'difficulty_rating', 'stability', 'difficulty')
+NUMERIC_FIELDS = ('review_count', 'correct_count', 'ease_factor', 'interval', 'stability', 'difficulty')
+
 @progress_view.route('/users/me/decks/<deck_id>/flashcards/progress', methods=['GET'],
                      strict_slashes=False)
 @csrf.exempt
@@ -26,8 +35,15 @@ def get_flashcards_progress(deck_id):
 
     Returns:
         tuple: A tuple containing a JSON response with the progress of flashcards in the deck
-               and an HTTP status code 200.
+               and an HTTP status code 200, or an empty 304 response when the client's
+               copy (If-None-Match) is current.
     """
+    count, last_modified, versions = ProgressService.get_deck_progress_version(deck_id)
+    etag = make_etag('progress', current_user.id, deck_id, count, versions, last_modified)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
     flashcards = FlashcardService.get_flashcards_by_deck(deck_id)
     progress_list = []
     for flashcard in flashcards:
@@ -35,7 +51,7 @@ def get_flashcards_progress(deck_id):
         if progress:
             progress_list.append(progress.to_dict())
     
-    return jsonify(progress_list), 200
+    return add_validators(jsonify(progress_list), etag, last_modified), 200
 
 
 @progress_view.route('/users/me/flashcards/<flashcard_id>/progress', methods=['GET'],
@@ -75,24 +91,176 @@ def update_flashcard_progress(flashcard_id):
     Returns:
         tuple: A tuple containing a JSON response with the updated progress of the flashcard
                and an HTTP status code 200 if successful, or a JSON response with an error
-               message and HTTP status code 404 if the flashcard is not found, or a JSON
+               message and HTTP status code 404 if the flashcard is not found (or belongs
+               to another user), or a JSON
                response with an error message and HTTP status code 400 if the request body
-               is not valid JSON or if the datetime format is invalid.
+               is not valid JSON or if the datetime format is invalid, or HTTP status code
+               409 if the body's 'version' is no longer current or another update won a race
+               (fetch the progress again and retry).
+               With PROGRESS_INGESTION enabled, the validated update is queued instead and
+               the response is 202 with the event ID (503 when the queue is full); a stale
+               version is then skipped by the writer.
     """
     data = request.get_json()
     if not data:
         raise ValidationError('Request body must be valid JSON')
 
-    # Validate datetime format if present
-    if 'next_review_date' in data:
-        try:
-            datetime.fromisoformat(data['next_review_date'].replace('Z', '+00:00'))
-        except ValueError:
-            raise ValidationError('Invalid datetime format for next_review_date')
+    # Validate datetime formats if present
+    for field in ('last_review_date', 'next_review_date'):
+        if field in data:
+            try:
+                datetime.fromisoformat(data[field].replace('Z', '+00:00'))
+            except (AttributeError, ValueError):
+                raise ValidationError('Invalid datetime format for {}'.format(field))
+
+    # Optimistic locking: the version of the progress the changes are based on
+    version = data.get('version')
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        raise ValidationError('version must be an integer')
+
+    # Checked before queueing too, so an unknown flashcard is a 404 rather than a dropped event
+    if not FlashcardService.verify_flashcard_ownership(flashcard_id, current_user.id):
+        raise NotFoundError('Progress not found for this flashcard')
+
+    if 'progress_queue' in app.extensions:
+        # Asynchronous ingestion: acknowledge now, the writer applies it shortly
+        payload = {field: data[field] for field in PROGRESS_FIELDS if field in data}
+        for field in NUMERIC_FIELDS:
+            if field in payload and (not isinstance(payload[field], (int, float))
+                                     or isinstance(payload[field], bool)):
+                raise ValidationError('{} must be a number'.format(field))
+        event_id = enqueue_progress(flashcard_id, payload, version)
+        return jsonify({'queued': True, 'event_id': event_id, 'flashcard_id': flashcard_id}), 202
 
     # Update progress using service
-    progress = ProgressService.update_progress(flashcard_id, data)
+    progress = ProgressService.update_progress(flashcard_id, data, expected_version=version)
     if not progress:
         raise NotFoundError('Progress not found for this flashcard')
 
     return jsonify(progress.to_dict()), 200
+
+
+@progress_view.route('/users/me/flashcards/<flashcard_id>/review', methods=['POST'],
+                     strict_slashes=False)
+@login_required
+def review_flashcard(flashcard_id):
+    """
+    Records a review of a specific flashcard and schedules its next review on the server,
+    with its deck's algorithm and the current user's fitted scheduler parameters.
+
+    Args:
+        flashcard_id (str): The ID of the reviewed flashcard.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the updated progress of the flashcard
+               and an HTTP status code 200 if successful, or raises NotFoundError if the
+               flashcard is not one of the user's and ValidationError if the rating is
+               missing or unknown.
+    """
+    data = request.get_json(silent=True) or {}
+    progress = ProgressService.review_flashcard(flashcard_id, data.get('rating'), current_user.id)
+    return jsonify(progress.to_dict()), 200
+
+
+@progress_view.route('/users/me/reviews', methods=['POST'], strict_slashes=False)
+@login_required
+def review_flashcards():
+    """
+    Records several reviews made at the same time, e.g. a session synced after working
+    offline, scheduling each deck's cards with its algorithm in one batch.
+
+    Request body:
+        reviews (list): Objects with a 'flashcard_id' and a 'rating', one per flashcard.
+
+    Returns:
+        tuple: A tuple containing a JSON response with the updated progress of each
+               flashcard, in order, and an HTTP status code 200, or raises ValidationError
+               for an invalid body or rating and NotFoundError for an unknown flashcard.
+    """
+    data = request.get_json(silent=True) or {}
+    reviews = data.get('reviews')
+    if not isinstance(reviews, list) or not all(isinstance(review, dict) for review in reviews):
+        raise ValidationError('reviews must be a list of objects with a flashcard_id and a rating')
+
+    progress_list = ProgressService.review_flashcards(
+        current_user.id, [(review.get('flashcard_id'), review.get('rating')) for review in reviews])
+    return jsonify([progress.to_dict() for progress in progress_list]), 200
+
+
+@progress_view.route('/users/me/review-queue', methods=['GET'], strict_slashes=False)
+@csrf.exempt
+@login_required
+def get_review_queue():
+    """
+    Retrieves the current user's next review queue: due cards by priority, then new
+    cards, with decks interleaved and the daily new/review limits applied.
+
+    Query parameters:
+        deck_id (str): Restrict the queue to one deck (optional).
+        limit (int): Maximum number of cards (optional, capped by REVIEW_QUEUE_SIZE).
+
+    Returns:
+        tuple: A tuple containing a JSON response with the 'cards' (each with its 'progress'
+               and 'queue' type) and the 'remaining' daily limits, and an HTTP status code 200.
+    """
+    queue = SchedulerService.get_review_queue(
+        current_user.id,
+        deck_id=request.args.get('deck_id'),
+        limit=request.args.get('limit', type=int)
+    )
+    return jsonify(queue), 200
+
+
+@progress_view.route('/users/me/forecast', methods=['GET'], strict_slashes=False)
+@csrf.exempt
+@login_required
+def get_review_forecast():
+    """
+    Retrieves how many of the current user's cards fall due on each of the next days.
+
+    Query parameters:
+        days (int): Number of days, today included (default 30, at most 365).
+
+    Returns:
+        tuple: A tuple containing a JSON response with the 'start' date, 'days', the per-day
+               'counts' (overdue cards are counted today) and the number of 'new' cards, and
+               an HTTP status code 200, or raises ValidationError if days is out of range.
+    """
+    forecast = ProgressService.get_review_forecast(current_user.id,
+                                                   request.args.get('days', 30, type=int))
+    return jsonify(forecast), 200
+
+
+@progress_view.route('/users/me/stats/retention', methods=['GET'], strict_slashes=False)
+@csrf.exempt
+@login_required
+def get_retention():
+    """
+    Retrieves the current user's retention from the review history: the share of repeat
+    reviews answered correctly, overall and by days elapsed since the previous review.
+
+    Query parameters:
+        days (int): Size of the window in days (default 30, at most 365).
+
+    Returns:
+        tuple: A tuple containing a JSON response with the overall 'reviews' and 'retention'
+               and the retention 'curve', and an HTTP status code 200, or raises
+               ValidationError if days is out of range.
+    """
+    retention = ReviewLogService.get_retention(current_user.id, request.args.get('days', 30, type=int))
+    return jsonify(retention), 200
+
+
+@progress_view.route('/users/me/stats/streaks', methods=['GET'], strict_slashes=False)
+@csrf.exempt
+@login_required
+def get_streaks():
+    """
+    Retrieves the current user's review streaks (consecutive days with reviews).
+
+    Returns:
+        tuple: A tuple containing a JSON response with the 'current' and 'longest' streaks,
+               the number of 'days_reviewed' and the 'last_review_date', and an HTTP status
+               code 200.
+    """
+    return jsonify(ReviewLogService.get_streaks(current_user.id)), 200
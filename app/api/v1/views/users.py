@@ -47,12 +47,11 @@ def get_current_user():
     """
     current_user_id = get_jwt_identity()
     
-    from app.models.user import User    
-    current_user = User.query.get(current_user_id)
+    current_user = UserService.get_identity(current_user_id)
     if not current_user:
         return jsonify({'error': 'Not Found'}), 404
 
-    return jsonify(current_user.to_dict()), 200
+    return jsonify(current_user), 200
 
 @users_view.route('/register', methods=['POST'], strict_slashes=False)
 def register_user():
@@ -0,0 +1,311 @@
+#!/usr/bin/python3
+"""
+Static Asset Pipeline
+Concatenates and minifies the page scripts and stylesheets into bundles with
+content-hashed filenames, served from /assets/ with immutable caching
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+import click
+from flask import abort, current_app, request, Response, url_for
+from flask.cli import AppGroup
+
+try:
+    import rjsmin
+except ImportError:  # optional; a conservative built-in minifier is used instead
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # optional
+    rcssmin = None
+
+# Bundle name -> source files under the static folder, in load order
+BUNDLES = {
+    'decks.js': [
+        'scripts/config.js',
+        'scripts/api-client.js',
+        'scripts/flashcard-manager.js',
+        'scripts/ui-manager.js',
+        'scripts/review-format.js',
+        'scripts/review-session.js',
+        'scripts/app.js',
+        'scripts/navbar_link_color.js',
+    ],
+    'flashcard_form.js': ['scripts/new_deck_textfield.js', 'scripts/navbar_link_color.js'],
+    'profile.js': ['scripts/profile.js', 'scripts/navbar_link_color.js'],
+    'app.css': ['styles/main.css', 'styles/components.css'],
+    'forms.css': ['styles/main.css', 'styles/forms.css'],
+}
+
+MIMETYPES = {'.js': 'text/javascript', '.css': 'text/css'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+Bundle = namedtuple('Bundle', ['name', 'filename', 'mimetype', 'content', 'gzipped'])
+
+assets_cli = AppGroup('assets', help='Build the static asset bundles.')
+
+
+# A '/' after one of these characters or keywords starts a regular expression
+# literal rather than a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                  'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+
+def _literal_end(source, start):
+    """
+    Finds the end of the string, template or regular expression literal
+    starting at source[start]
+
+    Returns:
+        int: The index after the literal, or None if it is not terminated
+            (a '/' that turns out not to start a regular expression)
+    """
+    quote = source[start]
+    index = start + 1
+    depth = 0  # nesting of ${...} inside a template literal
+    in_class = False  # inside [...] of a regular expression
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            index += 2
+            continue
+        if quote == '`':
+            if depth:
+                depth += {'{': 1, '}': -1}.get(char, 0)
+            elif char == '`':
+                return index + 1
+            elif source.startswith('${', index):
+                depth = 1
+                index += 1
+        elif quote == '/':
+            if char == '\n':
+                return None
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                index += 1
+                while index < len(source) and (source[index].isalnum() or source[index] == '_'):
+                    index += 1
+                return index
+        elif char == quote or char == '\n':
+            return index + 1
+        index += 1
+    return None if quote == '/' else len(source)
+
+
+def _regex_allowed(code, after_literal):
+    """
+    Tells whether a '/' following this code (itself following a literal,
+    or the start of the script) starts a regular expression literal
+    """
+    code = code.rstrip()
+    if not code:
+        return not after_literal
+    if code[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', code)
+    return bool(word) and word.group() in REGEX_KEYWORDS
+
+
+def _js_tokens(source):
+    """
+    Splits a script into code and literal (string, template and regular
+    expression) chunks, dropping the comments found in the code
+
+    Returns:
+        list: (is_literal, text) tuples
+    """
+    tokens = []
+    code = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if source.startswith('//', index):
+            end = source.find('\n', index)
+            index = len(source) if end == -1 else end
+            continue
+        if source.startswith('/*', index):
+            end = source.find('*/', index + 2)
+            end = len(source) if end == -1 else end + 2
+            # Keep a separator, and the line break automatic semicolon insertion may need
+            code.append('\n' if '\n' in source[index:end] else ' ')
+            index = end
+            continue
+        end = None
+        if char in '\'"`' or (char == '/' and _regex_allowed(''.join(code), bool(tokens))):
+            end = _literal_end(source, index)
+        if end is None:
+            code.append(char)
+            index += 1
+            continue
+        tokens.append((False, ''.join(code)))
+        tokens.append((True, source[index:end]))
+        code = []
+        index = end
+    tokens.append((False, ''.join(code)))
+    return tokens
+
+
+def minify_js(source):
+    """
+    Minifies JavaScript with rjsmin when it is installed. Otherwise removes
+    comments, blank lines and indentation conservatively: line breaks are
+    kept (so automatic semicolon insertion is unaffected) and string,
+    template and regular expression literals are copied verbatim
+
+    Args:
+        source (str): The script
+
+    Returns:
+        str: The minified script
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+
+    # Literals are set aside so that trimming lines cannot alter them
+    literals = []
+    code = []
+    for is_literal, text in _js_tokens(source):
+        if is_literal:
+            code.append('\x00{}\x00'.format(len(literals)))
+            literals.append(text)
+        else:
+            code.append(text)
+    lines = (line.strip() for line in ''.join(code).splitlines())
+    minified = '\n'.join(line for line in lines if line)
+    return re.sub('\x00(\\d+)\x00', lambda match: literals[int(match.group(1))], minified)
+
+
+def minify_css(source):
+    """
+    Minifies CSS with rcssmin when it is installed, otherwise by removing
+    comments and insignificant whitespace
+
+    Args:
+        source (str): The stylesheet
+
+    Returns:
+        str: The minified stylesheet
+    """
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    return source.replace(';}', '}').strip()
+
+
+def build_bundle(static_folder, name, sources, minify=True):
+    """
+    Builds one bundle from its source files
+
+    Args:
+        static_folder (str): The application's static folder
+        name (str): The bundle name, e.g. 'decks.js'
+        sources (list): Source paths relative to the static folder
+        minify (bool): Whether to minify the bundle
+
+    Returns:
+        Bundle: The bundle with its content-hashed filename
+    """
+    stem, extension = os.path.splitext(name)
+    parts = []
+    for source in sources:
+        with open(os.path.join(static_folder, source), encoding='utf-8') as source_file:
+            text = source_file.read()
+        if minify:
+            text = minify_js(text) if extension == '.js' else minify_css(text)
+        parts.append(text)
+
+    # Scripts are separated by ';' in case a file lacks its final semicolon
+    content = ('\n;\n' if extension == '.js' else '\n').join(parts).encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    return Bundle(name, '{}.{}{}'.format(stem, digest, extension), MIMETYPES[extension],
+                  content, gzip.compress(content, 9, mtime=0))
+
+
+def build_bundles(static_folder, minify=True):
+    """
+    Builds every bundle in BUNDLES
+
+    Returns:
+        dict: Bundle name -> Bundle
+    """
+    return {name: build_bundle(static_folder, name, sources, minify)
+            for name, sources in BUNDLES.items()}
+
+
+def asset_url(name):
+    """
+    Returns the URL of a bundle's current content-hashed file, for templates
+
+    Args:
+        name (str): The bundle name, e.g. 'decks.js'
+    """
+    bundle = current_app.extensions['assets'][name]
+    return url_for('serve_asset', filename=bundle.filename)
+
+
+def register_assets(app):
+    """
+    Build the asset bundles and register the /assets/ route and the
+    `asset_url` template helper with the Flask application
+
+    Args:
+        app: Flask application instance
+    """
+    bundles = build_bundles(app.static_folder, app.config.get('ASSETS_MINIFY', True))
+    app.extensions['assets'] = bundles
+    files = {bundle.filename: bundle for bundle in bundles.values()}
+
+    def serve_asset(filename):
+        """Serve a bundle; its name changes with its content, so it never goes stale"""
+        bundle = files.get(filename)
+        if bundle is None:
+            abort(404)
+        if 'gzip' in request.accept_encodings:
+            response = Response(bundle.gzipped, mimetype=bundle.mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(bundle.content, mimetype=bundle.mimetype)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    app.add_url_rule('/assets/<filename>', 'serve_asset', serve_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
+
+
+@assets_cli.command('build')
+@click.option('--output-dir', type=click.Path(file_okay=False), default=None,
+              help='Directory to write the bundles to (defaults to <static folder>/dist).')
+def build(output_dir):
+    """
+    Writes the bundles and a manifest.json mapping bundle names to files,
+    e.g. for serving them from a CDN or reverse proxy.
+    """
+    output_dir = output_dir or os.path.join(current_app.static_folder, 'dist')
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {}
+    for bundle in build_bundles(current_app.static_folder,
+                                current_app.config.get('ASSETS_MINIFY', True)).values():
+        with open(os.path.join(output_dir, bundle.filename), 'wb') as bundle_file:
+            bundle_file.write(bundle.content)
+        with open(os.path.join(output_dir, bundle.filename + '.gz'), 'wb') as bundle_file:
+            bundle_file.write(bundle.gzipped)
+        manifest[bundle.name] = bundle.filename
+        click.echo('{:<20} -> {} ({} bytes, {} gzipped)'.format(
+            bundle.name, bundle.filename, len(bundle.content), len(bundle.gzipped)))
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
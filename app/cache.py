@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+In-process Caching
+A small thread-safe LRU cache with per-entry expiry
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    A least-recently-used cache whose entries expire after a fixed TTL.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept.
+        ttl (float): The number of seconds an entry stays valid.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that missed or had expired.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): The maximum number of entries kept.
+            ttl (float): The number of seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key.
+
+        Args:
+            key: The cache key.
+            default: The value returned when the key is missing or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry when full.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Removes a key from the cache if present.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate):
+        """
+        Removes every key the predicate accepts, e.g. all the entries of
+        one user when keys start with a user ID.
+
+        Args:
+            predicate (callable): Called with each key; True removes it.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """ Removes every entry from the cache """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """ Returns the number of entries, including not yet evicted expired ones """
+        return len(self._entries)
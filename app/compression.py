@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Response Compression
+Compresses API responses with brotli (when the optional `brotli` package is
+installed) or gzip, negotiated from the request's Accept-Encoding
+"""
+
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+API_PREFIX = '/api/'
+# Only these content types are worth compressing
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def choose_encoding(accept_encodings):
+    """
+    Picks the best encoding the client accepts
+
+    Args:
+        accept_encodings: The request's parsed Accept-Encoding header
+
+    Returns:
+        'br', 'gzip' or None when neither is acceptable
+    """
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return accept_encodings.best_match(candidates)
+
+
+def _compressor(encoding, config):
+    """
+    Creates a streaming compressor for an encoding
+
+    Returns:
+        Tuple of (compress(chunk) -> bytes, flush() -> bytes)
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESSION_BROTLI_QUALITY'])
+        return compressor.process, compressor.finish
+    # wbits 31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(config['COMPRESSION_LEVEL'], zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def compress(data, encoding, config):
+    """
+    Compresses a complete body
+
+    Args:
+        data (bytes): The body
+        encoding (str): 'br' or 'gzip'
+        config: The application config
+
+    Returns:
+        bytes: The compressed body
+    """
+    process, finish = _compressor(encoding, config)
+    return process(data) + finish()
+
+
+def compress_stream(chunks, encoding, config):
+    """
+    Compresses a streamed body chunk by chunk
+
+    Args:
+        chunks: Iterable of str or bytes chunks
+        encoding (str): 'br' or 'gzip'
+        config: The application config
+
+    Yields:
+        bytes: Compressed chunks
+    """
+    process, finish = _compressor(encoding, config)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        compressed = process(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def register_compression(app):
+    """
+    Register the response compression hook with the Flask application when
+    COMPRESSION_ENABLED is set
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+
+    @app.after_request
+    def compress_response(response):
+        """Compress eligible responses for clients that accept it"""
+        if not request.path.startswith(API_PREFIX):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            # The size is unknown up front, so streams are always compressed
+            response.response = compress_stream(response.response, encoding, app.config)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress(data, encoding, app.config))
+
+        response.headers['Content-Encoding'] = encoding
+        # The compressed bytes differ from the identity representation
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
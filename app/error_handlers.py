@@ -9,7 +9,7 @@ from werkzeug.exceptions import HTTPException
 from app.exceptions import APIException
 import logging
 
-# Configure logging
+# Repeated client errors carry a sample_key so they are rate limited in the logs
 logger = logging.getLogger(__name__)
 
 
@@ -24,9 +24,11 @@ def register_error_handlers(app):
     @app.errorhandler(APIException)
     def handle_api_exception(error):
         """Handle custom API exceptions"""
+        # Only client errors are sampled; every server error is logged
         logger.warning(f"API Exception: {error.message}", extra={
             'status_code': error.status_code,
-            'payload': error.payload
+            'payload': error.payload,
+            'sample_key': f'api_exception_{error.status_code}' if error.status_code < 500 else None
         })
         response = jsonify(error.to_dict())
         response.status_code = error.status_code
@@ -35,7 +37,7 @@ def register_error_handlers(app):
     @app.errorhandler(ValueError)
     def handle_value_error(error):
         """Handle ValueError exceptions from services"""
-        logger.warning(f"ValueError: {str(error)}")
+        logger.warning(f"ValueError: {str(error)}", extra={'sample_key': 'value_error'})
         response = jsonify({
             'error': str(error),
             'status_code': 400
@@ -49,7 +51,7 @@ def register_error_handlers(app):
         # Only return JSON for API routes
         from flask import request
         if request.path.startswith('/api/'):
-            logger.info(f"404 Not Found: {request.path}")
+            logger.info(f"404 Not Found: {request.path}", extra={'sample_key': 'http_404'})
             response = jsonify({
                 'error': 'Resource not found',
                 'status_code': 404,
@@ -65,7 +67,7 @@ def register_error_handlers(app):
         """Handle 401 Unauthorized errors"""
         from flask import request
         if request.path.startswith('/api/'):
-            logger.warning(f"401 Unauthorized: {request.path}")
+            logger.warning(f"401 Unauthorized: {request.path}", extra={'sample_key': 'http_401'})
             response = jsonify({
                 'error': 'Unauthorized access',
                 'status_code': 401,
@@ -80,7 +82,7 @@ def register_error_handlers(app):
         """Handle 403 Forbidden errors"""
         from flask import request
         if request.path.startswith('/api/'):
-            logger.warning(f"403 Forbidden: {request.path}")
+            logger.warning(f"403 Forbidden: {request.path}", extra={'sample_key': 'http_403'})
             response = jsonify({
                 'error': 'Forbidden',
                 'status_code': 403,
@@ -95,7 +97,8 @@ def register_error_handlers(app):
         """Handle 405 Method Not Allowed errors"""
         from flask import request
         if request.path.startswith('/api/'):
-            logger.warning(f"405 Method Not Allowed: {request.method} {request.path}")
+            logger.warning(f"405 Method Not Allowed: {request.method} {request.path}",
+                           extra={'sample_key': 'http_405'})
             response = jsonify({
                 'error': 'Method not allowed',
                 'status_code': 405,
@@ -111,7 +114,7 @@ def register_error_handlers(app):
         """Handle 422 Unprocessable Entity errors"""
         from flask import request
         if request.path.startswith('/api/'):
-            logger.warning(f"422 Unprocessable Entity: {request.path}")
+            logger.warning(f"422 Unprocessable Entity: {request.path}", extra={'sample_key': 'http_422'})
             response = jsonify({
                 'error': 'Unprocessable entity',
                 'status_code': 422,
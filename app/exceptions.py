@@ -72,3 +72,10 @@ class ServerError(APIException):
     
     def __init__(self, message="Internal server error", payload=None):
         super().__init__(message, status_code=500, payload=payload)
+
+
+class ServiceUnavailableError(APIException):
+    """Exception raised when the server is temporarily overloaded"""
+    
+    def __init__(self, message="Service temporarily unavailable", payload=None):
+        super().__init__(message, status_code=503, payload=payload)
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+HTTP Caching
+ETag / Last-Modified helpers answering conditional GETs with 304 before
+the response body is built
+"""
+
+import hashlib
+from datetime import timezone
+from typing import Optional
+from flask import request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds an ETag from the values that identify a representation
+
+    Args:
+        *parts: Values such as a scope name, row count and max updated_at
+
+    Returns:
+        The ETag value (without quotes)
+    """
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+
+
+def not_modified(etag: str, last_modified=None) -> Optional[Response]:
+    """
+    Returns a 304 response when the client's cached copy is still current
+
+    Only If-None-Match is honoured: deleting a row does not move the max
+    updated_at, so If-Modified-Since alone could serve a stale list.
+
+    Args:
+        etag: The current ETag of the resource
+        last_modified: The current modification time (naive UTC) (optional)
+
+    Returns:
+        A 304 Response, or None when the full response must be sent
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return add_validators(Response(status=304), etag, last_modified)
+
+
+def add_validators(response: Response, etag: str, last_modified=None) -> Response:
+    """
+    Adds the ETag and Last-Modified headers to a response and asks clients
+    to revalidate before reusing it
+
+    Args:
+        response: The response to update
+        etag: The current ETag of the resource
+        last_modified: The current modification time (naive UTC) (optional)
+
+    Returns:
+        The updated response
+    """
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,488 @@
+#!/usr/bin/python3
+"""
+Progress Ingestion Queue
+Optional asynchronous mode for progress updates: the API validates an
+update, appends it to a local SQLite (WAL) queue and answers 202 at once; a
+background writer drains the queue and applies the updates in batched
+transactions.
+
+A single writer at a time holds the queue, so the updates to a card are
+applied in the order they were accepted.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy.exc import DataError, IntegrityError
+from app.exceptions import ConflictError, ServiceUnavailableError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ingestion_cli = AppGroup('ingestion', help='Drain the progress ingestion queue.')
+
+# Errors an event causes by itself, so retrying it cannot help: bad field
+# values (rejected by the app or by the database) and constraint violations.
+# Any other error is treated as transient and the batch is retried.
+INVALID_EVENT_ERRORS = (ValidationError, ValueError, TypeError, DataError, IntegrityError)
+
+# Seconds the writer waits before retrying after a failed batch, doubling up
+# to MAX_RETRY_DELAY while the failures last
+RETRY_DELAY = 1
+MAX_RETRY_DELAY = 60
+
+# The queue depth is kept in a one-row table by triggers, so reading it
+# does not scan the events. The lease row names the process allowed to
+# apply events until expires_at.
+SCHEMA = """
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        flashcard_id TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        version INTEGER,
+        enqueued_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        depth INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO stats (id, depth) SELECT 1, COUNT(*) FROM events;
+    CREATE TRIGGER IF NOT EXISTS events_inserted AFTER INSERT ON events
+    BEGIN
+        UPDATE stats SET depth = depth + 1 WHERE id = 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS events_deleted AFTER DELETE ON events
+    BEGIN
+        UPDATE stats SET depth = depth - 1 WHERE id = 1;
+    END;
+    CREATE TABLE IF NOT EXISTS lease (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        writer TEXT,
+        expires_at REAL NOT NULL
+    );
+    INSERT OR IGNORE INTO lease (id, writer, expires_at) VALUES (1, NULL, 0);
+    COMMIT;
+"""
+
+
+class ProgressQueue:
+    """
+    A durable FIFO of progress updates in a SQLite database in WAL mode,
+    safe to share between the worker processes of one host.
+
+    Only the process holding the queue's lease reads events, always from
+    the head, and deletes them once applied, so they are applied in the
+    order they were accepted even with a writer in every worker. The lease
+    is renewed with each claim; when its holder stops renewing it (the
+    writer died) it expires after claim_timeout seconds and the next writer
+    delivers the unacknowledged events again. Delivery is therefore at
+    least once, which is harmless for progress updates since they carry
+    absolute values. A writer stalled for longer than claim_timeout in the
+    middle of a batch could still commit it after its successor, so the
+    timeout must stay well above the time a batch takes.
+
+    Attributes:
+        path (str): The queue database file.
+        max_depth (int): Events held before enqueueing is refused.
+        claim_timeout (float): Seconds before the lease of a silent writer expires.
+        dropped (int): Events this process discarded as unappliable.
+    """
+
+    def __init__(self, path, max_depth=10000, claim_timeout=60):
+        """
+        Initializes the queue, creating its database if needed.
+
+        Args:
+            path (str): The queue database file.
+            max_depth (int): Events held before enqueueing is refused.
+            claim_timeout (float): Seconds before the lease of a silent writer expires.
+        """
+        self.path = path
+        self.max_depth = max_depth
+        self.claim_timeout = claim_timeout
+        self.dropped = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """Returns this thread's connection, in autocommit mode"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # Survives process crashes; an OS crash may lose the last commits
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def depth(self):
+        """
+        Returns:
+            int: The number of events waiting or being applied.
+        """
+        return self._connection().execute('SELECT depth FROM stats WHERE id = 1').fetchone()[0]
+
+    def lag(self):
+        """
+        Returns:
+            float: Seconds the oldest event has been waiting, 0 when empty.
+        """
+        oldest = self._connection().execute(
+            'SELECT enqueued_at FROM events ORDER BY id LIMIT 1').fetchone()
+        return round(time.time() - oldest[0], 3) if oldest is not None else 0.0
+
+    def put(self, flashcard_id, payload, version=None):
+        """
+        Appends an event.
+
+        Args:
+            flashcard_id (str): The flashcard whose progress is updated.
+            payload (dict): The validated progress fields.
+            version (int): The expected progress version, if any.
+
+        Returns:
+            int: The event ID.
+
+        Raises:
+            ServiceUnavailableError: If the queue holds max_depth events.
+        """
+        if self.depth() >= self.max_depth:
+            raise ServiceUnavailableError('Too many pending progress updates, please retry')
+        cursor = self._connection().execute(
+            'INSERT INTO events (flashcard_id, payload, version, enqueued_at) VALUES (?, ?, ?, ?)',
+            (flashcard_id, json.dumps(payload), version, time.time()))
+        return cursor.lastrowid
+
+    def claim(self, limit):
+        """
+        Returns the oldest events if this process holds (or can take) the
+        lease, renewing it.
+
+        Args:
+            limit (int): The maximum number of events.
+
+        Returns:
+            list: (event ID, flashcard ID, payload dict, version) tuples,
+                oldest first; empty when another writer holds the lease.
+        """
+        if not self._hold_lease():
+            return []
+        rows = self._connection().execute(
+            'SELECT id, flashcard_id, payload, version FROM events ORDER BY id LIMIT ?',
+            (limit,)).fetchall()
+        return [(event_id, flashcard_id, json.loads(payload), version)
+                for event_id, flashcard_id, payload, version in rows]
+
+    def _hold_lease(self):
+        """Takes or renews the lease unless a live writer holds it"""
+        connection = self._connection()
+        owner = str(os.getpid())
+        now = time.time()
+        writer, expires_at = connection.execute(
+            'SELECT writer, expires_at FROM lease WHERE id = 1').fetchone()
+        if writer == owner and expires_at - now > self.claim_timeout / 2:
+            return True
+        if writer not in (None, owner) and expires_at > now:
+            return False
+        # Conditional, so only one of two writers racing for it wins
+        cursor = connection.execute(
+            'UPDATE lease SET writer = ?, expires_at = ? '
+            'WHERE id = 1 AND (writer IS NULL OR writer = ? OR expires_at <= ?)',
+            (owner, now + self.claim_timeout, owner, now))
+        if cursor.rowcount and writer != owner:
+            logger.info('Process %s took over the progress queue', owner)
+        return cursor.rowcount == 1
+
+    def lease_holder(self):
+        """
+        Returns:
+            str: The process ID of the writer holding the lease, or None.
+        """
+        writer, expires_at = self._connection().execute(
+            'SELECT writer, expires_at FROM lease WHERE id = 1').fetchone()
+        return writer if writer is not None and expires_at > time.time() else None
+
+    def release_lease(self):
+        """
+        Gives up the lease if this process holds it, so that another writer
+        can take over at once.
+        """
+        self._connection().execute(
+            'UPDATE lease SET writer = NULL, expires_at = 0 WHERE id = 1 AND writer = ?',
+            (str(os.getpid()),))
+
+    def ack(self, event_ids):
+        """
+        Deletes applied (or discarded) events.
+
+        Args:
+            event_ids (list): The event IDs.
+        """
+        if event_ids:
+            self._connection().execute(
+                'DELETE FROM events WHERE id IN ({})'.format(','.join('?' * len(event_ids))),
+                list(event_ids))
+
+def apply_events(queue, events):
+    """
+    Applies claimed events in one transaction, retrying once after a
+    conflict with a concurrent writer. If the batch holds an invalid event,
+    the events are applied one by one and the invalid ones are dropped.
+
+    Any other error (the database being unreachable or locked, a conflict
+    that persists...) is raised, after acknowledging the events applied so
+    far, so that the rest are delivered again.
+
+    Args:
+        queue (ProgressQueue): The queue the events were claimed from.
+        events (list): The claimed events.
+
+    Returns:
+        dict: Counts of 'applied', 'conflicts', 'missing' and 'dropped' events.
+    """
+    from app import db
+    from app.services.progress_service import ProgressService
+
+    updates = [(flashcard_id, payload, version) for _, flashcard_id, payload, version in events]
+    for attempt in range(2):
+        try:
+            counts = ProgressService.apply_progress_updates(updates)
+            counts['dropped'] = 0
+            return counts
+        except ConflictError:
+            if attempt:
+                raise
+        except INVALID_EVENT_ERRORS:
+            db.session.rollback()
+            logger.warning('Progress batch of %d events holds an invalid event, applying them one by one',
+                           len(events))
+            break
+        except Exception:
+            db.session.rollback()
+            raise
+
+    counts = {'applied': 0, 'conflicts': 0, 'missing': 0, 'dropped': 0}
+    for index, (event_id, flashcard_id, payload, version) in enumerate(events):
+        try:
+            for key, value in ProgressService.apply_progress_updates([(flashcard_id, payload, version)]).items():
+                counts[key] += value
+        except INVALID_EVENT_ERRORS:
+            db.session.rollback()
+            counts['dropped'] += 1
+            queue.dropped += 1
+            logger.exception('Dropped invalid progress event %s for flashcard %s: %s',
+                             event_id, flashcard_id, payload)
+        except Exception:
+            db.session.rollback()
+            # Keep the events already applied from being delivered again
+            queue.ack([event[0] for event in events[:index]])
+            raise
+    return counts
+
+
+def drain_once(app, queue):
+    """
+    Applies the oldest batch of events if this process holds the lease.
+
+    Args:
+        app: Flask application instance
+        queue (ProgressQueue): The queue to drain.
+
+    Returns:
+        int: The number of events processed (0 when the queue was empty
+            or another writer holds it).
+
+    Raises:
+        Exception: The error that failed the batch; its unapplied events
+            stay at the head of the queue to be delivered again.
+    """
+    from app import db
+
+    events = queue.claim(app.config.get('PROGRESS_QUEUE_BATCH_SIZE', 200))
+    if not events:
+        return 0
+    with app.app_context():
+        try:
+            counts = apply_events(queue, events)
+        finally:
+            db.session.remove()
+    queue.ack([event[0] for event in events])
+    if counts['conflicts'] or counts['missing']:
+        logger.warning('Skipped %d stale and %d unknown progress events',
+                       counts['conflicts'], counts['missing'])
+    return len(events)
+
+
+class ProgressWriter(threading.Thread):
+    """
+    Background thread applying the queued events in batches.
+
+    Attributes:
+        app: The Flask application.
+        queue (ProgressQueue): The queue drained.
+    """
+
+    def __init__(self, app, queue):
+        """
+        Initializes the writer.
+
+        Args:
+            app: Flask application instance
+            queue (ProgressQueue): The queue to drain.
+        """
+        super().__init__(name='progress-writer', daemon=True)
+        self.app = app
+        self.queue = queue
+        self.pid = os.getpid()
+        self._stopped = threading.Event()
+
+    def run(self):
+        """
+        Drain batches back to back, polling while the queue is empty (or
+        held by another writer) and backing off while batches fail
+        """
+        interval = self.app.config.get('PROGRESS_QUEUE_POLL_INTERVAL', 0.2)
+        retry_delay = RETRY_DELAY
+        while not self._stopped.is_set():
+            try:
+                processed = drain_once(self.app, self.queue)
+            except Exception:
+                logger.exception('Progress batch failed, retrying in %ss', retry_delay)
+                self._stopped.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+                continue
+            retry_delay = RETRY_DELAY
+            if not processed:
+                self._stopped.wait(interval)
+        self.queue.release_lease()
+
+    def stop(self, timeout=5):
+        """
+        Stops the writer after its current batch.
+
+        Args:
+            timeout (float): Seconds to wait for the batch to finish.
+        """
+        self._stopped.set()
+        self.join(timeout)
+
+
+def enqueue_progress(flashcard_id, payload, version=None):
+    """
+    Queues a validated progress update, starting this process's writer
+    thread if needed
+
+    Args:
+        flashcard_id (str): The flashcard whose progress is updated.
+        payload (dict): The progress fields.
+        version (int): The expected progress version, if any.
+
+    Returns:
+        int: The event ID.
+
+    Raises:
+        ServiceUnavailableError: If the queue is full.
+    """
+    app = current_app._get_current_object()
+    event_id = app.extensions['progress_queue'].put(flashcard_id, payload, version)
+    if app.config.get('PROGRESS_QUEUE_WRITER', 'thread') == 'thread':
+        _ensure_writer(app)
+    return event_id
+
+
+_writer_lock = threading.Lock()
+
+
+def _ensure_writer(app):
+    """Starts the writer thread of this process (again after a fork)"""
+    writer = app.extensions.get('progress_writer')
+    if writer is not None and writer.pid == os.getpid() and writer.is_alive():
+        return
+    with _writer_lock:
+        writer = app.extensions.get('progress_writer')
+        if writer is None or writer.pid != os.getpid() or not writer.is_alive():
+            writer = ProgressWriter(app, app.extensions['progress_queue'])
+            writer.start()
+            app.extensions['progress_writer'] = writer
+
+
+def register_ingestion(app):
+    """
+    Set up the progress ingestion queue when PROGRESS_INGESTION is enabled,
+    with its queue depth and lag gauges, and register its CLI
+
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(ingestion_cli)
+    if not app.config.get('PROGRESS_INGESTION', False):
+        return
+
+    from app.metrics import metrics
+
+    queue = ProgressQueue(app.config.get('PROGRESS_QUEUE_PATH', 'progress_queue.db'),
+                          app.config.get('PROGRESS_QUEUE_MAX_DEPTH', 10000),
+                          app.config.get('PROGRESS_QUEUE_CLAIM_TIMEOUT', 60))
+    app.extensions['progress_queue'] = queue
+    # Let the other writers take over at once rather than after the timeout
+    atexit.register(queue.release_lease)
+    metrics.register_gauge('flasheeta_progress_queue_depth', queue.depth,
+                           'Progress updates waiting in the ingestion queue')
+    metrics.register_gauge('flasheeta_progress_queue_lag_seconds', queue.lag,
+                           'Age of the oldest progress update in the ingestion queue')
+    metrics.register_gauge('flasheeta_progress_queue_dropped', lambda: queue.dropped,
+                           'Progress updates this process discarded as unappliable')
+
+
+@ingestion_cli.command('run')
+def run():
+    """
+    Drains the queue until interrupted, for PROGRESS_QUEUE_WRITER=process
+    deployments where a dedicated process, not the web workers, writes.
+    """
+    queue = current_app.extensions.get('progress_queue')
+    if queue is None:
+        raise click.ClickException('PROGRESS_INGESTION is not enabled.')
+    click.echo('Draining {} (Ctrl+C to stop)'.format(queue.path))
+    writer = ProgressWriter(current_app._get_current_object(), queue)
+    writer.start()
+    try:
+        while writer.is_alive():
+            writer.join(1)
+    except KeyboardInterrupt:
+        writer.stop()
+
+
+@ingestion_cli.command('drain')
+def drain():
+    """
+    Applies every queued event, then exits.
+    """
+    queue = current_app.extensions.get('progress_queue')
+    if queue is None:
+        raise click.ClickException('PROGRESS_INGESTION is not enabled.')
+    app = current_app._get_current_object()
+    holder = queue.lease_holder()
+    if holder is not None and holder != str(os.getpid()):
+        raise click.ClickException('The writer in process {} is draining the queue.'.format(holder))
+    total = 0
+    while True:
+        try:
+            processed = drain_once(app, queue)
+        except Exception as error:
+            raise click.ClickException('A batch failed after {} events ({}); {} left.'.format(
+                total, error, queue.depth()))
+        if not processed:
+            break
+        total += processed
+    queue.release_lease()
+    click.echo('Applied {} events; {} left.'.format(total, queue.depth()))
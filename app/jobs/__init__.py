@@ -0,0 +1,4 @@
+"""
+Batch job package for Flasheeta
+Runs heavy maintenance tasks outside the web workers
+"""
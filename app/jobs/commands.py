@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Batch Job CLI Commands
+Exposes the job runner as `flask jobs ...`
+"""
+
+import time
+import click
+from flask import current_app as app
+from flask.cli import AppGroup
+from app.jobs.runner import run_job
+from app.jobs.optimizer import run_optimizer
+from app.jobs.tasks import JOBS
+
+jobs_cli = AppGroup('jobs', help='Run batch maintenance jobs.')
+
+
+@jobs_cli.command('run')
+@click.argument('job_name', type=click.Choice(sorted(JOBS)))
+@click.option('--workers', type=int, default=None,
+              help='Number of worker processes (defaults to the CPU count).')
+@click.option('--partitions', type=int, default=None,
+              help='Number of user ID partitions (defaults to 4 per worker).')
+@click.option('--output-dir', type=click.Path(file_okay=False), default=None,
+              help='Directory to write per-user JSON lines to.')
+def run(job_name, workers, partitions, output_dir):
+    """
+    Runs JOB_NAME for all users across a process pool.
+    """
+    start = time.perf_counter()
+    totals = {}
+    users = 0
+    completed = 0
+
+    for result in run_job(job_name, app.config, workers, partitions, output_dir):
+        completed += 1
+        users += result['users']
+        for key, value in result['totals'].items():
+            totals[key] = totals.get(key, 0) + value
+        click.echo('[{}] partition {} ({} users) done in {:.3f}s'.format(
+            completed, result['partition'], result['users'], result['seconds']))
+
+    click.echo('{}: {} users in {} partitions, {:.3f}s total'.format(
+        job_name, users, completed, time.perf_counter() - start))
+    for key, value in sorted(totals.items()):
+        click.echo('  {}: {}'.format(key, value))
+
+
+@jobs_cli.command('optimize')
+@click.option('--workers', type=int, default=None,
+              help='Number of worker processes (defaults to the CPU count).')
+@click.option('--partitions', type=int, default=None,
+              help='Number of user ID partitions (defaults to 4 per worker).')
+@click.option('--min-reviews', type=int, default=50, show_default=True,
+              help='Usable reviews needed to fit a user (and each of its parameters).')
+@click.option('--dry-run', is_flag=True, help='Fit without storing the parameters.')
+def optimize(workers, partitions, min_reviews, dry_run):
+    """
+    Fits every user's scheduler parameters from the review log.
+    """
+    start = time.perf_counter()
+    reviews = users = fitted = completed = 0
+    try:
+        for result in run_optimizer(app.config, workers, partitions, min_reviews, dry_run):
+            completed += 1
+            reviews += result['reviews']
+            users += result['users']
+            fitted += result['fitted']
+            click.echo('[{}] partition {}: {} reviews, {} users fitted, load {:.3f}s, fit {:.3f}s'.format(
+                completed, result['partition'], result['reviews'], result['fitted'],
+                result['load_seconds'], result['fit_seconds']))
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo('optimize: {} reviews, {} of {} users with reviews fitted{}, {:.3f}s total'.format(
+        reviews, fitted, users, ' (dry run)' if dry_run else '', time.perf_counter() - start))
@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+"""
+Scheduler Parameter Optimizer
+Fits per-user spaced repetition parameters from the review log with
+vectorized NumPy computations, one process per range of users
+
+Each repeat review is an observation of recall after `elapsed` days on a
+card whose previous review scheduled `interval` days. Recall is modelled
+as 0.9 ** (elapsed / (k * interval)): with k = 1 the scheduled intervals
+hit 90% recall exactly, k > 1 means the user remembers longer than
+scheduled. k is fitted by maximum a posteriori over a log-spaced grid,
+separately for a card's second review, its third review and later
+(mature) reviews, for every user of a partition at once. The fitted k of
+each stage then scales first_interval, second_interval and
+interval_modifier, aiming at SCHEDULER_TARGET_RETENTION.
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed by the optimizer
+    np = None
+
+from sqlalchemy import delete, insert
+from app import db
+from app.jobs.runner import WORKER_CONFIG_KEYS, _init_worker, plan_partitions
+from app.models.review_log import ReviewLog
+from app.models.scheduler_parameters import SchedulerParameters
+from app.services.progress_service import DEFAULT_PARAMETERS
+
+# Stages: the review after the first interval, after the second, and later
+STAGES = 3
+STAGE_PARAMETERS = ('first_interval', 'second_interval', 'interval_modifier')
+# Bounds of each fitted parameter
+PARAMETER_BOUNDS = {
+    'first_interval': (0.25, 5),
+    'second_interval': (1, 30),
+    'interval_modifier': (0.25, 4),
+}
+
+# Grid of k values searched, and the prior on log(k) shrinking sparse users to 1
+GRID = (0.2, 5.0, 121)
+PRIOR_SIGMA = 0.5
+BASE_RECALL = 0.9
+WRITE_BATCH = 500
+
+
+def require_numpy():
+    """
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError('The scheduler optimizer needs NumPy: pip install numpy')
+
+
+def prepare_observations(user_index, card_index, review_count, interval, elapsed_days, correct):
+    """
+    Turns review log columns into recall observations
+
+    The rows must be ordered by card, then review time, so that each row's
+    predecessor is the card's previous review. Reviews following a
+    relearning step (a scheduled interval under a day) are dropped.
+
+    Args:
+        user_index: Integer user of each review
+        card_index: Integer card of each review
+        review_count: The card's review count after each review
+        interval: The interval (days) scheduled by each review
+        elapsed_days: Days since the card's previous review (NaN if none)
+        correct: Whether each review was answered correctly
+
+    Returns:
+        Tuple of (group, x, y) arrays: group is user * STAGES + stage, x the
+        elapsed time relative to the scheduled interval and y the recall
+    """
+    same_card = np.zeros(len(card_index), dtype=bool)
+    same_card[1:] = card_index[1:] == card_index[:-1]
+    previous_interval = np.empty(len(interval))
+    previous_interval[0] = np.nan
+    previous_interval[1:] = interval[:-1]
+
+    valid = (same_card & (review_count >= 2) & (previous_interval >= 1)
+             & np.isfinite(elapsed_days) & (elapsed_days > 0))
+    stage = np.clip(review_count[valid] - 2, 0, STAGES - 1)
+    group = user_index[valid] * STAGES + stage
+    x = elapsed_days[valid] / previous_interval[valid]
+    return group, x, correct[valid].astype(np.float64)
+
+
+def fit_groups(group, x, y, groups):
+    """
+    Fits k for every group at once
+
+    For each k of the grid the log likelihood of all observations is
+    computed in one vectorized pass and summed per group with bincount.
+
+    Args:
+        group: Group of each observation
+        x: Elapsed time relative to the scheduled interval
+        y: Recall (1.0 or 0.0)
+        groups: The number of groups
+
+    Returns:
+        Tuple of (k, observations, mean log loss) arrays, one value per group
+    """
+    log_grid = np.linspace(math.log(GRID[0]), math.log(GRID[1]), GRID[2])
+    scores = np.empty((len(log_grid), groups))
+    decay = math.log(BASE_RECALL) * x
+    for index, log_k in enumerate(log_grid):
+        log_recall = decay / math.exp(log_k)
+        # log(1 - p) computed stably, and kept finite when p rounds to 1
+        log_forget = np.log(-np.expm1(np.minimum(log_recall, -1e-12)))
+        likelihood = y * log_recall + (1.0 - y) * log_forget
+        scores[index] = np.bincount(group, weights=likelihood, minlength=groups)
+
+    counts = np.bincount(group, minlength=groups)
+    prior = -(log_grid ** 2) / (2 * PRIOR_SIGMA ** 2)
+    best = np.argmax(scores + prior[:, None], axis=0)
+    log_loss = -scores[best, np.arange(groups)] / np.maximum(counts, 1)
+    return np.exp(log_grid[best]), counts, log_loss
+
+
+def fit_parameters(user_index, card_index, review_count, interval, elapsed_days, correct,
+                   users: int, current: Optional[list] = None, target_retention: float = 0.9,
+                   min_reviews: int = 50) -> Dict[int, Dict]:
+    """
+    Fits the scheduler parameters of every user in the arrays
+
+    Args:
+        user_index, card_index, review_count, interval, elapsed_days, correct:
+            The review log columns, see prepare_observations
+        users: The number of users (user_index values are below it)
+        current: Each user's parameters in effect while the reviews were
+            made (defaults to DEFAULT_PARAMETERS for all)
+        target_retention: The recall probability the intervals aim at
+        min_reviews: Fewer usable reviews leave a user (or a stage of a
+            user) on its current parameters
+
+    Returns:
+        Dictionary of user index -> fitted parameters with 'reviews' and
+        'log_loss', for the users with enough reviews
+    """
+    group, x, y = prepare_observations(user_index, card_index, review_count,
+                                       interval, elapsed_days, correct)
+    k, counts, log_loss = fit_groups(group, x, y, users * STAGES)
+    k = k.reshape(users, STAGES)
+    counts = counts.reshape(users, STAGES)
+    log_loss = log_loss.reshape(users, STAGES)
+    scale = math.log(target_retention) / math.log(BASE_RECALL)
+
+    fitted = {}
+    for user in np.nonzero(counts.sum(axis=1) >= min_reviews)[0]:
+        parameters = dict(current[user] if current else DEFAULT_PARAMETERS)
+        for stage, name in enumerate(STAGE_PARAMETERS):
+            if counts[user, stage] >= min_reviews:
+                low, high = PARAMETER_BOUNDS[name]
+                value = parameters[name] * k[user, stage] * scale
+                parameters[name] = round(min(max(value, low), high), 3)
+        reviews = int(counts[user].sum())
+        parameters['reviews'] = reviews
+        parameters['log_loss'] = round(float((log_loss[user] * counts[user]).sum() / reviews), 5)
+        fitted[int(user)] = parameters
+    return fitted
+
+
+def load_reviews(first_id: str, last_id: str):
+    """
+    Loads the review log of a range of users into NumPy arrays
+
+    Returns:
+        Tuple of (user IDs, columns dict) where the columns are the
+        arguments of prepare_observations
+    """
+    rows = db.session.query(
+        ReviewLog.user_id, ReviewLog.flashcard_id, ReviewLog.review_count,
+        ReviewLog.interval, ReviewLog.elapsed_days, ReviewLog.correct
+    ).filter(
+        ReviewLog.user_id >= first_id, ReviewLog.user_id <= last_id
+    ).order_by(ReviewLog.flashcard_id, ReviewLog.reviewed_at).yield_per(10000)
+
+    user_ids, card_ids, review_count, interval, elapsed_days, correct = [], [], [], [], [], []
+    for row in rows:
+        user_ids.append(row[0])
+        card_ids.append(row[1])
+        review_count.append(row[2])
+        interval.append(row[3] if row[3] is not None else np.nan)
+        elapsed_days.append(row[4] if row[4] is not None else np.nan)
+        correct.append(row[5])
+
+    users, user_index = np.unique(np.array(user_ids, dtype=object), return_inverse=True)
+    _, card_index = np.unique(np.array(card_ids, dtype=object), return_inverse=True)
+    return list(users), {
+        'user_index': user_index.astype(np.int64),
+        'card_index': card_index.astype(np.int64),
+        'review_count': np.array(review_count, dtype=np.int64),
+        'interval': np.array(interval, dtype=np.float64),
+        'elapsed_days': np.array(elapsed_days, dtype=np.float64),
+        'correct': np.array(correct, dtype=bool),
+    }
+
+
+def optimize_partition(index: int, first_id: str, last_id: str, target_retention: float,
+                       min_reviews: int, dry_run: bool = False) -> Dict:
+    """
+    Fits and stores the parameters of every user whose ID falls within a range
+
+    Args:
+        index: The partition index
+        first_id: The first user ID of the range (inclusive)
+        last_id: The last user ID of the range (inclusive)
+        target_retention: The recall probability the intervals aim at
+        min_reviews: The minimum number of usable reviews per fitted value
+        dry_run: Fit without storing the parameters
+
+    Returns:
+        Dictionary with the partition index, review and user counts and timing
+    """
+    require_numpy()
+    start = time.perf_counter()
+    user_ids, columns = load_reviews(first_id, last_id)
+    loaded = time.perf_counter()
+
+    fitted = {}
+    if user_ids:
+        stored = {row.user_id: {key: getattr(row, key) for key in DEFAULT_PARAMETERS}
+                  for row in db.session.query(SchedulerParameters).filter(
+                      SchedulerParameters.user_id >= first_id,
+                      SchedulerParameters.user_id <= last_id)}
+        current = [stored.get(user_id, DEFAULT_PARAMETERS) for user_id in user_ids]
+        fitted = fit_parameters(users=len(user_ids), current=current,
+                                target_retention=target_retention,
+                                min_reviews=min_reviews, **columns)
+    computed = time.perf_counter()
+
+    if fitted and not dry_run:
+        now = datetime.utcnow()
+        rows = [dict(parameters, user_id=user_ids[user], fitted_at=now)
+                for user, parameters in fitted.items()]
+        for offset in range(0, len(rows), WRITE_BATCH):
+            batch = rows[offset:offset + WRITE_BATCH]
+            db.session.execute(delete(SchedulerParameters).where(
+                SchedulerParameters.user_id.in_([row['user_id'] for row in batch])))
+            db.session.execute(insert(SchedulerParameters), batch)
+        db.session.commit()
+    db.session.remove()
+
+    return {
+        'partition': index,
+        'reviews': len(columns['user_index']),
+        'users': len(user_ids),
+        'fitted': len(fitted),
+        'load_seconds': round(loaded - start, 3),
+        'fit_seconds': round(computed - loaded, 3),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def run_optimizer(config: Dict, workers: Optional[int] = None, partitions: Optional[int] = None,
+                  min_reviews: int = 50, dry_run: bool = False) -> Iterator[Dict]:
+    """
+    Fits the parameters of all users in a process pool, yielding partition
+    results as they complete
+
+    Args:
+        config: The application config
+        workers: Number of worker processes (defaults to the CPU count)
+        partitions: Number of user ID partitions (defaults to 4 per worker)
+        min_reviews: The minimum number of usable reviews per fitted value
+        dry_run: Fit without storing the parameters
+
+    Yields:
+        The result dictionary of each partition as returned by optimize_partition
+    """
+    require_numpy()
+    workers = workers or os.cpu_count() or 1
+    ranges = plan_partitions(partitions or workers * 4)
+    if not ranges:
+        return
+
+    target_retention = config.get('SCHEDULER_TARGET_RETENTION', 0.9)
+    worker_config = {key: config[key] for key in WORKER_CONFIG_KEYS if key in config}
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context,
+                             initializer=_init_worker, initargs=(worker_config,)) as executor:
+        futures = [executor.submit(optimize_partition, index, first_id, last_id,
+                                   target_retention, min_reviews, dry_run)
+                   for index, (first_id, last_id) in enumerate(ranges)]
+        for future in as_completed(futures):
+            yield future.result()
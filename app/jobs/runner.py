@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Batch Job Runner
+Partitions users by ID range and fans the work out over a process pool
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from flask import Flask
+from app import db
+from app.models.engine.db_storage import DBStorage
+from app.models.user import User
+from app.jobs.tasks import JOBS
+
+# Config keys forwarded to the worker processes
+WORKER_CONFIG_KEYS = ('SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS',
+                      'SQLALCHEMY_TRACK_MODIFICATIONS')
+
+
+def plan_partitions(partitions: int) -> List[Tuple[str, str]]:
+    """
+    Splits the ordered user IDs into contiguous ID ranges
+
+    Args:
+        partitions: The maximum number of partitions
+
+    Returns:
+        List of inclusive (first_user_id, last_user_id) ranges
+    """
+    user_ids = [user_id for (user_id,) in
+                db.session.query(User.id).order_by(User.id).all()]
+    if not user_ids:
+        return []
+
+    partitions = max(1, min(partitions, len(user_ids)))
+    size, remainder = divmod(len(user_ids), partitions)
+    ranges = []
+    start = 0
+    for index in range(partitions):
+        end = start + size + (1 if index < remainder else 0)
+        ranges.append((user_ids[start], user_ids[end - 1]))
+        start = end
+    return ranges
+
+
+def _init_worker(config: Dict):
+    """
+    Initializes a worker process with its own application context and engine
+
+    Args:
+        config: The database configuration of the parent application
+    """
+    worker_app = Flask(__name__)
+    worker_app.config.update(config)
+    db.init_app(worker_app)
+    worker_app.storage = DBStorage(db)
+    worker_app.app_context().push()
+
+
+def run_partition(job_name: str, index: int, first_id: str, last_id: str,
+                  output_dir: Optional[str] = None) -> Dict:
+    """
+    Runs a job for every user whose ID falls within a range
+
+    Args:
+        job_name: The name of the job in JOBS
+        index: The partition index
+        first_id: The first user ID of the range (inclusive)
+        last_id: The last user ID of the range (inclusive)
+        output_dir: Directory to write the per-user records to (optional)
+
+    Returns:
+        Dictionary with the partition index, user count, timing and totals
+    """
+    task = JOBS[job_name]
+    start = time.perf_counter()
+
+    user_ids = [user_id for (user_id,) in
+                db.session.query(User.id)
+                .filter(User.id >= first_id, User.id <= last_id)
+                .order_by(User.id).all()]
+
+    totals = {}
+    records = []
+    for user_id in user_ids:
+        record = task(user_id)
+        # Only counts are summed; ratios such as accuracy are per user
+        for key, value in record.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+        if output_dir:
+            records.append(record)
+        # Release the identity map so memory stays flat across users
+        db.session.remove()
+
+    if output_dir:
+        path = os.path.join(output_dir, '{}-{:04d}.jsonl'.format(job_name, index))
+        with open(path, 'w') as output_file:
+            for record in records:
+                output_file.write(json.dumps(record, default=str) + '\n')
+
+    return {
+        'partition': index,
+        'first_id': first_id,
+        'last_id': last_id,
+        'users': len(user_ids),
+        'seconds': round(time.perf_counter() - start, 3),
+        'totals': totals
+    }
+
+
+def run_job(job_name: str, config: Dict, workers: Optional[int] = None,
+            partitions: Optional[int] = None, output_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Runs a job over all users in a process pool, yielding partition results
+    as they complete
+
+    Args:
+        job_name: The name of the job in JOBS
+        config: The application config to build the worker engines from
+        workers: Number of worker processes (defaults to the CPU count)
+        partitions: Number of user ID partitions (defaults to 4 per worker)
+        output_dir: Directory to write the per-user records to (optional)
+
+    Yields:
+        The result dictionary of each partition as returned by run_partition
+    """
+    if job_name not in JOBS:
+        raise ValueError(f"Unknown job '{job_name}'")
+
+    workers = workers or os.cpu_count() or 1
+    ranges = plan_partitions(partitions or workers * 4)
+    if not ranges:
+        return
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    worker_config = {key: config[key] for key in WORKER_CONFIG_KEYS if key in config}
+    # Spawned workers never inherit the parent's pooled connections
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context,
+                             initializer=_init_worker, initargs=(worker_config,)) as executor:
+        futures = [executor.submit(run_partition, job_name, index, first_id, last_id, output_dir)
+                   for index, (first_id, last_id) in enumerate(ranges)]
+        for future in as_completed(futures):
+            yield future.result()
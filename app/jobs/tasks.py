@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Batch Job Tasks
+Per-user units of work executed by the job runner
+"""
+
+from typing import Dict
+from app.services.deck_service import DeckService
+from app.services.flashcard_service import FlashcardService
+from app.services.progress_service import ProgressService
+
+
+def recompute_statistics(user_id: str) -> Dict:
+    """
+    Recomputes the overall statistics of a user
+
+    Args:
+        user_id: The user ID
+
+    Returns:
+        Dictionary with the user ID and its statistics
+    """
+    stats = ProgressService.get_user_statistics(user_id)
+    return {'user_id': user_id, **stats}
+
+
+def reschedule_progress(user_id: str) -> Dict:
+    """
+    Realigns the next review dates of a user's flashcards with their intervals
+
+    Args:
+        user_id: The user ID
+
+    Returns:
+        Dictionary with the user ID and the number of rescheduled flashcards
+    """
+    rescheduled = ProgressService.reschedule_user_progress(user_id)
+    return {'user_id': user_id, 'rescheduled': rescheduled}
+
+
+def export_user(user_id: str) -> Dict:
+    """
+    Exports a user's decks, flashcards and progress
+
+    Args:
+        user_id: The user ID
+
+    Returns:
+        Dictionary with the exported decks and deck/flashcard counts
+    """
+    decks = []
+    flashcard_count = 0
+    for deck in DeckService.get_decks_by_user(user_id):
+        deck_dict = deck.to_dict()
+        deck_dict['flashcards'] = []
+        for flashcard in FlashcardService.get_flashcards_by_deck(deck.id):
+            flashcard_dict = flashcard.to_dict()
+            if flashcard.progress:
+                flashcard_dict['progress'] = flashcard.progress.to_dict()
+            deck_dict['flashcards'].append(flashcard_dict)
+        flashcard_count += len(deck_dict['flashcards'])
+        decks.append(deck_dict)
+
+    return {
+        'user_id': user_id,
+        'decks': len(decks),
+        'flashcards': flashcard_count,
+        'data': decks
+    }
+
+
+# Registry of the jobs available to the runner, keyed by CLI name
+JOBS = {
+    'stats': recompute_statistics,
+    'reschedule': reschedule_progress,
+    'export': export_user,
+}
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Logging Configuration
+Routes log records through a queue so disk and console writes happen on a
+background thread instead of the request path
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Queue listeners started by this module, stopped at interpreter exit
+_listeners = {}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through at most `limit` records per `window` seconds for each
+    `sample_key` passed in a record's extra; records without a key always pass.
+
+    The first record let through after a window closes reports how many
+    records were dropped during it.
+    """
+
+    def __init__(self, window=60, limit=10):
+        """
+        Initializes the filter.
+
+        Args:
+            window (float): Length of a sampling window in seconds.
+            limit (int): Number of records let through per key and window.
+        """
+        super().__init__()
+        self.window = window
+        self.limit = limit
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """ Returns False for records over their key's limit """
+        key = getattr(record, 'sample_key', None)
+        if key is None:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            start, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                if suppressed:
+                    record.msg = '{} ({} similar messages suppressed)'.format(record.msg, suppressed)
+                start, count, suppressed = now, 0, 0
+
+            if count >= self.limit:
+                self._windows[key] = (start, count, suppressed + 1)
+                return False
+
+            self._windows[key] = (start, count + 1, suppressed)
+            return True
+
+
+def _file_handler(filename, config):
+    """ Builds a size- or time-rotating file handler from the config """
+    if config.get('LOG_ROTATION', 'size') == 'time':
+        return TimedRotatingFileHandler(filename, when=config.get('LOG_ROTATE_WHEN', 'midnight'),
+                                        backupCount=config.get('LOG_BACKUP_COUNT', 5))
+    return RotatingFileHandler(filename, maxBytes=config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+                               backupCount=config.get('LOG_BACKUP_COUNT', 5))
+
+
+def _attach_queue(logger, handlers, config):
+    """
+    Replaces the queue handler this module previously attached to a logger
+    with a new one feeding `handlers` from a background listener thread.
+    """
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    previous = _listeners.pop(logger.name, None)
+    if previous is not None:
+        previous_handler, previous_listener = previous
+        logger.removeHandler(previous_handler)
+        previous_listener.stop()
+
+    record_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(record_queue)
+    queue_handler.addFilter(SamplingFilter(config.get('LOG_SAMPLE_WINDOW', 60),
+                                           config.get('LOG_SAMPLE_LIMIT', 10)))
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(record_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[logger.name] = (queue_handler, listener)
+
+
+def configure_logging(config):
+    """
+    Configures the root logger to log to the console and a rotating file
+    through a background writer thread
+
+    Args:
+        config: The application config
+    """
+    handlers = [logging.StreamHandler()]
+    if config.get('LOG_FILE'):
+        handlers.append(_file_handler(config['LOG_FILE'], config))
+
+    root = logging.getLogger()
+    root.setLevel(config.get('LOG_LEVEL', 'INFO').upper())
+    _attach_queue(root, handlers, config)
+
+
+def add_file_log(logger, filename, config):
+    """
+    Sends a logger's records to their own rotating file through a
+    background writer thread, instead of the root logger's handlers
+
+    Args:
+        logger: The logger to attach the file to
+        filename: The log file path
+        config: The application config
+    """
+    _attach_queue(logger, [_file_handler(filename, config)], config)
+    # Otherwise each record is also written to the main log (twice when
+    # both files are the same)
+    logger.propagate = False
+
+
+@atexit.register
+def _stop_listeners():
+    """ Flushes the queued records before the interpreter exits """
+    for _, listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+"""
+Request Metrics
+Lightweight in-process counters, gauges and histograms rendered in the
+Prometheus text exposition format
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsRegistry:
+    """
+    Collects request metrics for one process.
+
+    Attributes:
+        requests (dict): Request counts keyed by (blueprint, endpoint, method, status).
+        latencies (dict): Histogram state keyed by (blueprint, endpoint).
+        in_flight (dict): Requests currently being served keyed by blueprint.
+        caches (dict): Caches exposing hits/misses keyed by name.
+        gauges (dict): Callables returning extra gauge values keyed by metric name.
+    """
+
+    def __init__(self):
+        """ Initializes an empty registry """
+        self.requests = {}
+        self.latencies = {}
+        self.in_flight = {}
+        self.caches = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """ Clears every collected value, keeping registered caches and gauges """
+        with self._lock:
+            self.requests.clear()
+            self.latencies.clear()
+            self.in_flight.clear()
+
+    def register_cache(self, name, cache):
+        """
+        Exposes the hit ratio of a cache.
+
+        Args:
+            name (str): The cache label.
+            cache: An object with `hits` and `misses` counters.
+        """
+        self.caches[name] = cache
+
+    def register_gauge(self, name, func, help_text=''):
+        """
+        Exposes a value computed at scrape time.
+
+        Args:
+            name (str): The metric name.
+            func (callable): Returns the current value.
+            help_text (str): The metric description.
+        """
+        self.gauges[name] = (func, help_text)
+
+    def request_started(self, blueprint):
+        """ Counts a request as in flight """
+        with self._lock:
+            self.in_flight[blueprint] = self.in_flight.get(blueprint, 0) + 1
+
+    def request_finished(self, blueprint):
+        """ Removes a request from the in-flight gauge """
+        with self._lock:
+            self.in_flight[blueprint] = self.in_flight.get(blueprint, 1) - 1
+
+    def observe(self, blueprint, endpoint, method, status, duration):
+        """
+        Records a served request.
+
+        Args:
+            blueprint (str): The blueprint name.
+            endpoint (str): The endpoint name.
+            method (str): The HTTP method.
+            status (int): The response status code.
+            duration (float): The request latency in seconds.
+        """
+        bucket = bisect_left(LATENCY_BUCKETS, duration)
+        with self._lock:
+            key = (blueprint, endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            histogram = self.latencies.get((blueprint, endpoint))
+            if histogram is None:
+                histogram = self.latencies[(blueprint, endpoint)] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            histogram[0][bucket] += 1
+            histogram[1] += duration
+
+    def render(self, engine=None):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Args:
+            engine: SQLAlchemy engine whose connection pool is reported (optional).
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            requests = dict(self.requests)
+            latencies = {key: (list(buckets), total) for key, (buckets, total) in self.latencies.items()}
+            in_flight = dict(self.in_flight)
+
+        lines.append('# HELP flasheeta_requests_total Total HTTP requests served.')
+        lines.append('# TYPE flasheeta_requests_total counter')
+        for (blueprint, endpoint, method, status), count in sorted(requests.items()):
+            lines.append('flasheeta_requests_total{{blueprint="{}",endpoint="{}",method="{}",status="{}"}} {}'
+                         .format(blueprint, endpoint, method, status, count))
+
+        lines.append('# HELP flasheeta_request_duration_seconds HTTP request latency.')
+        lines.append('# TYPE flasheeta_request_duration_seconds histogram')
+        for (blueprint, endpoint), (buckets, total) in sorted(latencies.items()):
+            labels = 'blueprint="{}",endpoint="{}"'.format(blueprint, endpoint)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+                cumulative += count
+                lines.append('flasheeta_request_duration_seconds_bucket{{{},le="{}"}} {}'
+                             .format(labels, bound, cumulative))
+            lines.append('flasheeta_request_duration_seconds_sum{{{}}} {:.6f}'.format(labels, total))
+            lines.append('flasheeta_request_duration_seconds_count{{{}}} {}'.format(labels, cumulative))
+
+        lines.append('# HELP flasheeta_requests_in_flight HTTP requests currently being served.')
+        lines.append('# TYPE flasheeta_requests_in_flight gauge')
+        for blueprint, count in sorted(in_flight.items()):
+            lines.append('flasheeta_requests_in_flight{{blueprint="{}"}} {}'.format(blueprint, count))
+
+        if engine is not None:
+            pool = engine.pool
+            lines.append('# HELP flasheeta_db_pool_connections Database connection pool usage.')
+            lines.append('# TYPE flasheeta_db_pool_connections gauge')
+            for state in ('size', 'checkedin', 'checkedout', 'overflow'):
+                stat = getattr(pool, state, None)
+                if callable(stat):
+                    lines.append('flasheeta_db_pool_connections{{state="{}"}} {}'.format(state, stat()))
+
+        if self.caches:
+            lines.append('# HELP flasheeta_cache_requests_total Cache lookups by result.')
+            lines.append('# TYPE flasheeta_cache_requests_total counter')
+            for name, cache in sorted(self.caches.items()):
+                lines.append('flasheeta_cache_requests_total{{cache="{}",result="hit"}} {}'.format(name, cache.hits))
+                lines.append('flasheeta_cache_requests_total{{cache="{}",result="miss"}} {}'.format(name, cache.misses))
+            lines.append('# HELP flasheeta_cache_hit_ratio Share of cache lookups answered from the cache.')
+            lines.append('# TYPE flasheeta_cache_hit_ratio gauge')
+            for name, cache in sorted(self.caches.items()):
+                lookups = cache.hits + cache.misses
+                ratio = cache.hits / lookups if lookups else 0.0
+                lines.append('flasheeta_cache_hit_ratio{{cache="{}"}} {:.4f}'.format(name, ratio))
+
+        for name, (func, help_text) in sorted(self.gauges.items()):
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} gauge'.format(name))
+            lines.append('{} {}'.format(name, func()))
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def register_metrics(app):
+    """
+    Register the request metrics hooks with the Flask application when
+    METRICS_ENABLED is set
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        """Mark the request as in flight and start its timer"""
+        g.metrics_blueprint = request.blueprint or 'app'
+        g.metrics_start = time.perf_counter()
+        metrics.request_started(g.metrics_blueprint)
+
+    @app.after_request
+    def record_request_metrics(response):
+        """Record the request's latency and status"""
+        start = g.get('metrics_start')
+        if start is not None:
+            metrics.observe(g.metrics_blueprint, request.endpoint or 'unknown', request.method,
+                            response.status_code, time.perf_counter() - start)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        """Remove the request from the in-flight gauge, even on errors"""
+        blueprint = g.pop('metrics_blueprint', None)
+        if blueprint is not None:
+            metrics.request_finished(blueprint)
@@ -6,6 +6,12 @@ This module defines a base class for all models in the Flasheeta project.
 import uuid
 from datetime import datetime
 from flask import current_app as app
+from sqlalchemy.dialects import mysql
+from app import db
+
+# MySQL DATETIME is second-precision by default; the ETags of the list
+# endpoints need updates made within the same second to differ
+Timestamp = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql', 'mariadb')
 
 class BaseModel():
     """ 
@@ -16,11 +22,9 @@ class BaseModel():
         created_at (datetime): The timestamp when the model instance was created.
         updated_at (datetime): The timestamp when the model instance was last updated.
     """
-    db = app.storage.db
-
     id = db.Column(db.String(60), nullable=False, primary_key=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(Timestamp, nullable=False, default=datetime.utcnow)
 
     def __init__(self, *args, **kwargs):
         """ 
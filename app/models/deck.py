@@ -2,9 +2,7 @@
 """ This module defines the Deck class """
 
 from app.models.base_model import BaseModel
-from flask import current_app as app
-
-db = app.storage.db
+from app import db
 
 class Deck(BaseModel, db.Model):
     """
@@ -14,12 +12,15 @@ class Deck(BaseModel, db.Model):
         name (str): The name of the deck.
         description (str): A brief description of the deck.
         user_id (str): The ID of the user who owns the deck.
+        scheduler (str): The name of the spaced repetition algorithm scheduling
+            the deck's reviews (see app.schedulers).
         flashcards (relationship): A relationship to the Flashcard model.
     """
     __tablename__ = 'decks'
     name = db.Column(db.String(128), nullable=False)
     description = db.Column(db.String(256))
     user_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    scheduler = db.Column(db.String(20), nullable=False, default='sm2', server_default='sm2')
     from app.models.flashcard import Flashcard
     flashcards = db.relationship('Flashcard', backref='deck',
                                  cascade='all, delete-orphan')
@@ -3,10 +3,11 @@
 This module defines the Flashcard class.
 """
 
+import hashlib
+import unicodedata
+from sqlalchemy import event
 from app.models.base_model import BaseModel
-from flask import current_app as app
-
-db = app.storage.db
+from app import db
 
 class Flashcard(BaseModel, db.Model):
     """
@@ -16,12 +17,50 @@ class Flashcard(BaseModel, db.Model):
         question (str): The question or prompt on the flashcard.
         answer (str): The answer to the question on the flashcard.
         deck_id (str): The ID of the deck to which the flashcard belongs.
+        content_hash (str): The SHA-256 of the normalized question and answer,
+            used to find duplicates within a deck.
         progress (relationship): A relationship to the Progress model.
     """
     __tablename__ = 'flashcards'
+    __table_args__ = (
+        # Search index on MySQL; SQLite uses the FTS5 table set up in app/search.py
+        db.Index('ix_flashcards_fulltext', 'question', 'answer',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        db.Index('ix_flashcards_deck_content_hash', 'deck_id', 'content_hash'),
+    )
     question = db.Column(db.String(1024), nullable=False)
     answer = db.Column(db.String(1024), nullable=False)
     deck_id = db.Column(db.String(60), db.ForeignKey('decks.id'), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True)
 
     from app.models.progress import Progress
-    progress = db.relationship('Progress', backref='flashcard', cascade='all, delete-orphan')
+    progress = db.relationship('Progress', backref='flashcard', uselist=False,
+                               cascade='all, delete-orphan')
+
+    @staticmethod
+    def compute_content_hash(question, answer):
+        """
+        Computes the content hash of a question and answer.
+
+        The texts are NFKC-normalized, case-folded and whitespace-collapsed
+        first, so cards differing only in case or spacing hash the same.
+
+        Args:
+            question (str): The question text.
+            answer (str): The answer text.
+
+        Returns:
+            str: The hex SHA-256 digest.
+        """
+        def normalize(text):
+            return ' '.join(unicodedata.normalize('NFKC', text or '').casefold().split())
+
+        content = normalize(question) + '\x1f' + normalize(answer)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@event.listens_for(Flashcard, 'before_insert')
+@event.listens_for(Flashcard, 'before_update')
+def _set_content_hash(mapper, connection, target):
+    """ Keeps the content hash in sync with the question and answer """
+    target.content_hash = Flashcard.compute_content_hash(target.question, target.answer)
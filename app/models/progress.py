@@ -5,9 +5,7 @@ This module defines the Progress class.
 
 from app.models.base_model import BaseModel
 from datetime import datetime
-from flask import current_app as app
-
-db = app.storage.db
+from app import db
 
 class Progress(BaseModel, db.Model):
     """
@@ -21,13 +19,26 @@ class Progress(BaseModel, db.Model):
         difficulty_rating (str): The current difficulty rating of the flashcard.
         ease_factor (float): The ease factor used in spaced repetition algorithms.
         interval (int): The interval (in days) until the next review.
+        stability (float): The FSRS memory stability in days, None until the card
+            is reviewed with the FSRS scheduler.
+        difficulty (float): The FSRS difficulty (1-10), None until then.
+        version (int): Incremented by every update. Updates only apply while the
+            row still has the version they read (optimistic locking), so
+            concurrent updates cannot silently overwrite each other.
         flashcard_id (str): The ID of the flashcard associated with this progress record.
     """
     review_count = db.Column(db.Integer, nullable=False, default=0)
     correct_count = db.Column(db.Integer, nullable=False, default=0)
     last_review_date = db.Column(db.DateTime, default=datetime.utcnow())
-    next_review_date = db.Column(db.DateTime, default=datetime.utcnow())
+    next_review_date = db.Column(db.DateTime, default=datetime.utcnow(), index=True)
     difficulty_rating = db.Column(db.String(60), nullable=False, default='Again')
     ease_factor = db.Column(db.Float, nullable=False, default=2.5)
     interval = db.Column(db.Integer, nullable=False, default=1)
+    stability = db.Column(db.Float, nullable=True)
+    difficulty = db.Column(db.Float, nullable=True)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     flashcard_id = db.Column(db.String(60), db.ForeignKey('flashcards.id'), nullable=False)
+
+    # UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?;
+    # no matched row raises StaleDataError
+    __mapper_args__ = {'version_id_col': version}
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+This module defines the ReviewLog class.
+"""
+
+import uuid
+from datetime import datetime
+from app import db
+
+class ReviewLog(db.Model):
+    """
+    This class represents one review of a flashcard in Flasheeta.
+
+    Rows are only ever inserted (and purged by age), never updated, so the
+    history can be aggregated without touching the progress rows. The user
+    and deck IDs are copied in, and there are no foreign keys: inserts take
+    no locks on the parent rows, and the table can be range-partitioned on
+    reviewed_at, which is part of the primary key for that reason.
+
+    Attributes:
+        id (str): The unique identifier of the review.
+        reviewed_at (datetime): When the review happened.
+        user_id (str): The ID of the reviewing user.
+        deck_id (str): The ID of the flashcard's deck.
+        flashcard_id (str): The ID of the reviewed flashcard.
+        rating (str): The rating given, e.g. 'again' or 'good'.
+        correct (bool): Whether the card was answered correctly.
+        review_count (int): The card's review count after this review.
+        interval (float): The interval (in days) scheduled by this review.
+        ease_factor (float): The ease factor after this review.
+        elapsed_days (float): Days since the card's previous review, or None
+            for its first review.
+    """
+    __tablename__ = 'review_log'
+    __table_args__ = (
+        db.Index('ix_review_log_user_reviewed_at', 'user_id', 'reviewed_at'),
+    )
+    id = db.Column(db.String(60), primary_key=True, default=lambda: str(uuid.uuid4()))
+    reviewed_at = db.Column(db.DateTime, primary_key=True, default=datetime.utcnow, index=True)
+    user_id = db.Column(db.String(60), nullable=False)
+    deck_id = db.Column(db.String(60), nullable=False)
+    flashcard_id = db.Column(db.String(60), nullable=False)
+    rating = db.Column(db.String(60), nullable=True)
+    correct = db.Column(db.Boolean, nullable=False, default=False)
+    review_count = db.Column(db.Integer, nullable=False)
+    interval = db.Column(db.Float, nullable=True)
+    ease_factor = db.Column(db.Float, nullable=True)
+    elapsed_days = db.Column(db.Float, nullable=True)
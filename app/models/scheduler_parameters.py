@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+This module defines the SchedulerParameters class.
+"""
+
+from datetime import datetime
+from app import db
+
+class SchedulerParameters(db.Model):
+    """
+    This class represents the spaced repetition parameters fitted for one
+    user from their review history by `flask jobs optimize`. Users without
+    a row are scheduled with the defaults.
+
+    Attributes:
+        user_id (str): The ID of the user the parameters belong to.
+        first_interval (float): Days until the review after a card's first success.
+        second_interval (float): Days until the review after its second success.
+        interval_modifier (float): Multiplier applied to later SM-2 intervals.
+        min_ease (float): The lowest ease factor.
+        max_ease (float): The highest ease factor.
+        again_minutes (float): Relearning delay after an 'again' rating.
+        hard_minutes (float): Relearning delay after a 'hard' rating.
+        reviews (int): The number of reviews the fit used.
+        log_loss (float): The mean log loss of the fitted recall model.
+        fitted_at (datetime): When the parameters were fitted.
+    """
+    __tablename__ = 'scheduler_parameters'
+    user_id = db.Column(db.String(60), db.ForeignKey('users.id', ondelete='CASCADE'),
+                        primary_key=True)
+    first_interval = db.Column(db.Float, nullable=False, default=1)
+    second_interval = db.Column(db.Float, nullable=False, default=6)
+    interval_modifier = db.Column(db.Float, nullable=False, default=1)
+    min_ease = db.Column(db.Float, nullable=False, default=1.3)
+    max_ease = db.Column(db.Float, nullable=False, default=2.5)
+    again_minutes = db.Column(db.Float, nullable=False, default=10)
+    hard_minutes = db.Column(db.Float, nullable=False, default=15)
+    reviews = db.Column(db.Integer, nullable=False, default=0)
+    log_loss = db.Column(db.Float, nullable=True)
+    fitted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
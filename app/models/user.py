@@ -5,10 +5,8 @@ This module defines the User class.
 
 from app.models.base_model import BaseModel
 from flask_login import UserMixin
-from flask import current_app as app
-from werkzeug.security import generate_password_hash, check_password_hash
-
-db = app.storage.db
+from app import db
+from app.passwords import hash_password, verify_password
 
 class User(BaseModel, UserMixin, db.Model):
     """
@@ -40,8 +38,8 @@ class User(BaseModel, UserMixin, db.Model):
 
     def set_password(self, password):
         """Hash and set the user's password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         """Check if the provided password matches the stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
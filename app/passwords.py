@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Password Hashing
+Configurable password hashing that runs on a bounded thread pool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.exceptions import ServiceUnavailableError
+from app.request_profiler import profile_offloaded
+
+# Used when no application context is available (scripts, benchmarks)
+DEFAULTS = {
+    'PASSWORD_HASH_METHOD': 'scrypt:32768:8:1',
+    'PASSWORD_SALT_LENGTH': 16,
+    'PASSWORD_HASH_WORKERS': 2,
+    'PASSWORD_HASH_QUEUE_SIZE': 32,
+}
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _config(key):
+    """Returns a password hashing setting from the app config or the defaults"""
+    if has_app_context():
+        return current_app.config.get(key, DEFAULTS[key])
+    return DEFAULTS[key]
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method: str) -> str:
+    """
+    Returns the canonical parameter prefix werkzeug stores for a method,
+    e.g. 'pbkdf2' -> 'pbkdf2:sha256:600000'
+    """
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+def _run(func, *args):
+    """
+    Runs a hashing function on the shared thread pool
+
+    The number of hashes running or waiting is capped so a login burst
+    cannot tie up every request thread behind the CPU-bound hash.
+
+    Raises:
+        ServiceUnavailableError: If the hashing queue is full
+    """
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = _config('PASSWORD_HASH_WORKERS')
+                _slots = threading.BoundedSemaphore(workers + _config('PASSWORD_HASH_QUEUE_SIZE'))
+                _executor = ThreadPoolExecutor(max_workers=workers,
+                                               thread_name_prefix='password-hash')
+
+    if not _slots.acquire(blocking=False):
+        raise ServiceUnavailableError("Too many concurrent logins, please retry")
+    try:
+        return _executor.submit(profile_offloaded(func), *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a password with the configured method and salt length
+
+    Args:
+        password: The plain text password
+
+    Returns:
+        The password hash
+    """
+    return _run(generate_password_hash, password,
+                _config('PASSWORD_HASH_METHOD'), _config('PASSWORD_SALT_LENGTH'))
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Checks a password against a stored hash
+
+    Args:
+        password_hash: The stored password hash
+        password: The plain text password
+
+    Returns:
+        True if the password matches, False otherwise
+    """
+    if not password_hash or password is None:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Checks whether a stored hash was made with other parameters than the
+    configured ones
+
+    Args:
+        password_hash: The stored password hash
+
+    Returns:
+        True if the hash should be regenerated, False otherwise
+    """
+    stored_prefix, _, rest = password_hash.partition('$')
+    salt = rest.split('$', 1)[0]
+    return (stored_prefix != _method_prefix(_config('PASSWORD_HASH_METHOD'))
+            or len(salt) != _config('PASSWORD_SALT_LENGTH'))
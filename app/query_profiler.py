@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+SQL Query Profiler
+Records per-request query counts and timings from SQLAlchemy engine events
+"""
+
+import json
+import logging
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from app.logging_config import add_file_log
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('app.slow_queries')
+
+
+def register_query_profiler(app, db):
+    """
+    Register the query profiler with the Flask application when
+    SQL_PROFILING is enabled
+
+    Args:
+        app: Flask application instance
+        db: The SQLAlchemy instance whose engine is instrumented
+    """
+    if not app.config.get('SQL_PROFILING'):
+        return
+
+    threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100)
+    top_n = app.config.get('SQL_PROFILING_TOP_N', 3)
+
+    if app.config.get('SLOW_QUERY_LOG'):
+        add_file_log(slow_query_logger, app.config['SLOW_QUERY_LOG'], app.config)
+
+    engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """
+        Remember when the statement started, on its execution context so
+        that a statement that fails (and never reaches after_cursor_execute)
+        leaves nothing behind on the pooled connection
+        """
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Account the statement to the current request"""
+        duration_ms = (time.perf_counter() - context._query_start_time) * 1000
+        endpoint = None
+
+        if has_request_context():
+            endpoint = request.endpoint
+            stats = g.get('query_stats')
+            if stats is not None:
+                stats['count'] += 1
+                stats['duration_ms'] += duration_ms
+                stats['slowest'].append((duration_ms, statement))
+                stats['slowest'].sort(key=lambda item: item[0], reverse=True)
+                del stats['slowest'][top_n:]
+
+        if duration_ms >= threshold_ms:
+            slow_query_logger.warning(json.dumps({
+                'endpoint': endpoint,
+                'duration_ms': round(duration_ms, 2),
+                'statement': ' '.join(statement.split())
+            }))
+
+    @app.before_request
+    def start_query_stats():
+        """Start counting queries for this request"""
+        g.query_stats = {'count': 0, 'duration_ms': 0.0, 'slowest': []}
+
+    @app.after_request
+    def report_query_stats(response):
+        """Expose the request's query stats as a header and a log line"""
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+
+        response.headers.add('Server-Timing', 'db;dur={:.2f};desc="{} queries"'.format(
+            stats['duration_ms'], stats['count']))
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'query_count': stats['count'],
+            'query_ms': round(stats['duration_ms'], 2),
+            'slowest': [{'duration_ms': round(duration, 2), 'statement': ' '.join(statement.split())}
+                        for duration, statement in stats['slowest']]
+        }))
+        return response
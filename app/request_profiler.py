@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""
+Request Profiler
+Runs selected requests under cProfile and aggregates the results per endpoint
+into pstats files (viewable with snakeviz, gprof2dot or flameprof)
+"""
+
+import atexit
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import click
+from flask import g, request, has_request_context, current_app as app
+from flask.cli import AppGroup
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+PROFILE_HEADER = 'X-Flasheeta-Profile'
+TOKEN_SALT = 'request-profiling'
+
+profiling_cli = AppGroup('profiling', help='Profile requests in a running server.')
+
+
+class ProfileAggregator:
+    """
+    Accumulates profiles per endpoint and periodically writes them to disk.
+
+    Attributes:
+        directory (str): Where the .pstats files are written.
+        flush_every (int): Number of profiled requests between writes of an endpoint's file.
+    """
+
+    def __init__(self, directory, flush_every):
+        """
+        Initializes an empty aggregator.
+
+        Args:
+            directory (str): Where the .pstats files are written.
+            flush_every (int): Number of profiled requests between writes.
+        """
+        self.directory = directory
+        self.flush_every = max(1, flush_every)
+        self._stats = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, profile):
+        """
+        Adds a finished profile to its endpoint's aggregate.
+
+        Args:
+            endpoint (str): The Flask endpoint name.
+            profile (cProfile.Profile): The disabled profiler of one request.
+        """
+        with self._lock:
+            try:
+                stats = self._stats.get(endpoint)
+                if stats is None:
+                    self._stats[endpoint] = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # The profiler never ran, so there is nothing to add
+                return
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if self._counts[endpoint] % self.flush_every == 0:
+                self._dump(endpoint)
+
+    def flush(self):
+        """ Writes every endpoint's aggregate to disk """
+        with self._lock:
+            for endpoint in self._stats:
+                self._dump(endpoint)
+
+    def _dump(self, endpoint):
+        """ Writes one endpoint's aggregate; the caller holds the lock """
+        os.makedirs(self.directory, exist_ok=True)
+        filename = '{}.pstats'.format(endpoint.replace('/', '_'))
+        self._stats[endpoint].dump_stats(os.path.join(self.directory, filename))
+
+
+def _serializer(secret_key):
+    """ Returns the serializer signing profiling tokens """
+    return URLSafeTimedSerializer(secret_key, salt=TOKEN_SALT)
+
+
+def _should_profile():
+    """ Checks whether the current request was selected for profiling """
+    if app.config.get('PROFILING_ENABLED'):
+        return True
+
+    token = request.headers.get(PROFILE_HEADER)
+    if not token or not app.config.get('SECRET_KEY'):
+        return False
+    try:
+        _serializer(app.config['SECRET_KEY']).loads(
+            token, max_age=app.config.get('PROFILING_TOKEN_MAX_AGE', 3600))
+    except BadSignature:
+        return False
+    return True
+
+
+def register_request_profiler(app):
+    """
+    Register the request profiling hooks with the Flask application
+
+    Requests are profiled when PROFILING_ENABLED is set, or when they carry
+    a token from `flask profiling token` in the X-Flasheeta-Profile header.
+
+    Args:
+        app: Flask application instance
+    """
+    aggregator = ProfileAggregator(app.config.get('PROFILING_DIR', 'profiles'),
+                                   app.config.get('PROFILING_FLUSH_EVERY', 20))
+    atexit.register(aggregator.flush)
+
+    @app.before_request
+    def start_profiling():
+        """Start the profiler for selected requests"""
+        if _should_profile():
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows a single active profiler per process,
+                # so concurrent requests are left unprofiled
+                return
+            g.profiler = profiler
+
+    @app.teardown_request
+    def stop_profiling(exc):
+        """Stop the profiler and add the request to its endpoint's aggregate"""
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            endpoint = request.endpoint or 'unknown'
+            aggregator.add(endpoint, profiler)
+            # Work the request handed to thread pools (e.g. password hashing)
+            for worker_profiler in g.pop('worker_profilers', []):
+                aggregator.add(endpoint, worker_profiler)
+
+
+def profile_offloaded(func):
+    """
+    Wraps a function about to run on another thread so that, when the
+    current request is being profiled, the call is profiled too and added
+    to the request's endpoint aggregate
+
+    Args:
+        func: The function to run on the worker thread
+
+    Returns:
+        The function to submit in place of func
+    """
+    if not has_request_context() or g.get('profiler') is None:
+        return func
+
+    worker_profiler = cProfile.Profile()
+    g.setdefault('worker_profilers', []).append(worker_profiler)
+
+    @functools.wraps(func)
+    def run_profiled(*args, **kwargs):
+        """Runs func under the worker profiler when it can be enabled"""
+        try:
+            worker_profiler.enable()
+        except ValueError:
+            # On Python 3.12+ the request's profiler already sees this thread
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            worker_profiler.disable()
+
+    return run_profiled
+
+
+@profiling_cli.command('token')
+def token():
+    """
+    Prints a signed token enabling profiling through the X-Flasheeta-Profile header.
+    """
+    click.echo(_serializer(app.config['SECRET_KEY']).dumps('profile'))
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+Review Log Maintenance
+Purges reviews past the retention period
+"""
+
+from datetime import datetime, timedelta
+import click
+from flask import current_app as app
+from flask.cli import AppGroup
+from app.services.review_log_service import ReviewLogService
+
+review_log_cli = AppGroup('review-log', help='Maintain the review history.')
+
+
+def register_review_log(app):
+    """
+    Register the review log CLI with the Flask application
+
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(review_log_cli)
+
+
+@review_log_cli.command('purge')
+@click.option('--days', type=int, default=None,
+              help='Keep this many days of reviews (defaults to REVIEW_LOG_RETENTION_DAYS).')
+def purge(days):
+    """
+    Deletes the reviews older than the retention period, in batches. On a
+    MySQL table range-partitioned by reviewed_at, dropping old partitions
+    does the same without deleting rows.
+    """
+    days = days if days is not None else app.config.get('REVIEW_LOG_RETENTION_DAYS', 730)
+    if days < 1:
+        click.echo('Retention is disabled; nothing to purge.')
+        return
+    deleted = ReviewLogService.purge(datetime.utcnow() - timedelta(days=days))
+    click.echo('Deleted {} reviews older than {} days.'.format(deleted, days))
@@ -0,0 +1,46 @@
+"""
+Scheduler package for Flasheeta
+Registry of the spaced repetition algorithms a deck can be scheduled with
+"""
+
+from app.schedulers.base import RATINGS, Scheduler
+from app.schedulers.fsrs import FSRSScheduler
+from app.schedulers.sm2 import SM2Scheduler
+
+DEFAULT_SCHEDULER = 'sm2'
+
+SCHEDULERS = {}
+
+
+def register_scheduler(scheduler: Scheduler) -> Scheduler:
+    """
+    Makes an algorithm selectable for decks under its name
+
+    Args:
+        scheduler: The scheduler instance
+
+    Returns:
+        The scheduler
+    """
+    SCHEDULERS[scheduler.name] = scheduler
+    return scheduler
+
+
+def get_scheduler(name=None) -> Scheduler:
+    """
+    Looks an algorithm up by name
+
+    Args:
+        name: The registry name (defaults to DEFAULT_SCHEDULER)
+
+    Returns:
+        The scheduler
+
+    Raises:
+        KeyError: If no scheduler is registered under the name
+    """
+    return SCHEDULERS[name or DEFAULT_SCHEDULER]
+
+
+register_scheduler(SM2Scheduler())
+register_scheduler(FSRSScheduler())
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Scheduler Interface
+The contract every spaced repetition algorithm implements
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+RATINGS = ('again', 'hard', 'good', 'easy')
+
+
+class Scheduler(ABC):
+    """
+    Base class of the spaced repetition algorithms.
+
+    A card is any object with the Progress attributes (review_count,
+    correct_count, ease_factor, interval, last_review_date, stability,
+    difficulty), so Progress rows and lightweight tuples can both be
+    scheduled. Results are dictionaries of the Progress fields to update.
+
+    Attributes:
+        name (str): The registry name, stored in Deck.scheduler.
+        description (str): A one-line description of the algorithm.
+    """
+    name = None
+    description = ''
+
+    def schedule(self, card, rating: str, now: Optional[datetime] = None,
+                 parameters: Optional[Dict] = None) -> Dict:
+        """
+        Schedules the next review of one card
+
+        Args:
+            card: The card's current progress
+            rating: User rating ('again', 'hard', 'good', 'easy')
+            now: The review time (defaults to utcnow)
+            parameters: The user's scheduler parameters (optional)
+
+        Returns:
+            Dictionary with the updated progress values
+        """
+        return self.schedule_many([card], [rating], now, parameters)[0]
+
+    @abstractmethod
+    def schedule_many(self, cards: Sequence, ratings: Sequence[str],
+                      now: Optional[datetime] = None,
+                      parameters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Schedules the next review of many cards reviewed at the same time,
+        e.g. an offline session being synced or a bulk reschedule
+
+        Args:
+            cards: The cards' current progress
+            ratings: The rating of each card
+            now: The review time (defaults to utcnow)
+            parameters: The user's scheduler parameters (optional)
+
+        Returns:
+            List with the updated progress values of each card, in order
+        """
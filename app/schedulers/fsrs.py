@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+FSRS Scheduler
+The Free Spaced Repetition Scheduler (FSRS-4.5): each card has a memory
+stability (days until recall drops to 90%) and a difficulty (1-10), updated
+from the rating and the recall probability at review time
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from app.schedulers.base import Scheduler
+
+# The published FSRS-4.5 default weights
+DEFAULT_WEIGHTS = (0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031,
+                   1.6474, 0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755)
+DECAY = -0.5
+FACTOR = 19 / 81  # makes recall 90% after `stability` days
+
+GRADES = {'again': 1, 'hard': 2, 'good': 3, 'easy': 4}
+DEFAULT_RETENTION = 0.9
+MINUTES_PER_DAY = 24 * 60
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS-4.5 with the default weights.
+
+    Cards first reviewed under SM-2 have no stability yet; their current
+    interval and ease factor seed the stability and difficulty. 'again'
+    sends a card back after the relearning delay, like SM-2.
+    """
+    name = 'fsrs'
+    description = 'FSRS-4.5: memory stability and difficulty, intervals aimed at a target retention'
+
+    def __init__(self, weights: Sequence[float] = DEFAULT_WEIGHTS):
+        """
+        Initializes the scheduler
+
+        Args:
+            weights: The 17 FSRS-4.5 weights
+        """
+        self.weights = tuple(weights)
+
+    def schedule_many(self, cards: Sequence, ratings: Sequence[str],
+                      now: Optional[datetime] = None,
+                      parameters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Schedules many cards in one pass, with the weights and the interval
+        scale derived from the target retention computed once
+
+        See Scheduler.schedule_many. The parameters may set
+        'request_retention' (default 0.9) and 'again_minutes' (default 10).
+        """
+        parameters = parameters or {}
+        now = now or datetime.utcnow()
+        w = self.weights
+        exp, log = math.exp, math.log
+        retention = parameters.get('request_retention', DEFAULT_RETENTION)
+        interval_scale = (retention ** (1 / DECAY) - 1) / FACTOR
+        again_interval = parameters.get('again_minutes', 10) / MINUTES_PER_DAY
+        recall_gain = exp(w[8])
+        initial_difficulty = w[4]
+
+        results = []
+        for card, rating in zip(cards, ratings):
+            grade = GRADES.get(rating, 3)
+            stability = card.stability
+            difficulty = card.difficulty
+
+            if card.review_count == 0:
+                stability = w[grade - 1]
+                difficulty = initial_difficulty - (grade - 3) * w[5]
+            else:
+                if not stability:
+                    # Seed from the SM-2 state: the interval aimed at ~90% recall
+                    stability = max(card.interval or 1, 0.1)
+                    difficulty = 1 + (2.5 - (card.ease_factor or 2.5)) / 1.2 * 9
+                difficulty = min(max(difficulty, 1), 10)
+
+                elapsed = 0.0
+                if card.last_review_date is not None:
+                    elapsed = max(0.0, (now - card.last_review_date).total_seconds() / SECONDS_PER_DAY)
+                recall = (1 + FACTOR * elapsed / stability) ** DECAY
+
+                if grade == 1:
+                    forgotten = (w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1)
+                                 * exp(w[14] * (1 - recall)))
+                    next_stability = min(forgotten, stability)
+                else:
+                    bonus = w[15] if grade == 2 else w[16] if grade == 4 else 1
+                    next_stability = stability * (1 + recall_gain * (11 - difficulty)
+                                                  * stability ** -w[9]
+                                                  * (exp(w[10] * (1 - recall)) - 1) * bonus)
+
+                # Difficulty moves with the grade, then reverts toward the initial one
+                difficulty = difficulty - w[6] * (grade - 3)
+                difficulty = w[7] * initial_difficulty + (1 - w[7]) * difficulty
+                stability = next_stability
+
+            difficulty = min(max(difficulty, 1), 10)
+            stability = max(stability, 0.01)
+            if grade == 1:
+                interval = again_interval
+            else:
+                interval = min(max(round(stability * interval_scale), 1), 365)
+
+            results.append({
+                'review_count': card.review_count + 1,
+                'correct_count': card.correct_count + (1 if grade >= 3 else 0),
+                'stability': round(stability, 4),
+                'difficulty': round(difficulty, 4),
+                'interval': interval,
+                'last_review_date': now,
+                'next_review_date': now + timedelta(days=interval),
+                'difficulty_rating': rating
+            })
+        return results
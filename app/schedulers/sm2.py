@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Hybrid SM-2 Scheduler
+Fixed short relearning delays for failed cards, SM-2 intervals and ease
+factors for successful ones
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from app.schedulers.base import Scheduler
+
+# The hybrid SM-2 constants, used for users without fitted parameters
+DEFAULT_PARAMETERS = {
+    'first_interval': 1,      # days
+    'second_interval': 6,     # days
+    'interval_modifier': 1.0,
+    'min_ease': 1.3,
+    'max_ease': 2.5,
+    'again_minutes': 10,
+    'hard_minutes': 15,
+}
+
+# Rating to quality mapping
+QUALITIES = {
+    'again': 0,  # Complete blackout
+    'hard': 2,   # Incorrect response
+    'good': 3,   # Correct with difficulty
+    'easy': 5    # Perfect response
+}
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class SM2Scheduler(Scheduler):
+    """The hybrid SM-2 algorithm, with per-user fitted parameters"""
+    name = 'sm2'
+    description = 'Hybrid SM-2: fixed relearning delays, SM-2 intervals for successful reviews'
+
+    def schedule_many(self, cards: Sequence, ratings: Sequence[str],
+                      now: Optional[datetime] = None,
+                      parameters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Schedules many cards in one pass, with the parameters and bounds
+        looked up once rather than per card
+
+        See Scheduler.schedule_many.
+        """
+        parameters = parameters or DEFAULT_PARAMETERS
+        now = now or datetime.utcnow()
+        first_interval = parameters['first_interval']
+        second_interval = parameters['second_interval']
+        interval_modifier = parameters['interval_modifier']
+        min_ease = parameters['min_ease']
+        max_ease = parameters['max_ease']
+        again_interval = parameters['again_minutes'] / MINUTES_PER_DAY
+        hard_interval = parameters['hard_minutes'] / MINUTES_PER_DAY
+
+        results = []
+        for card, rating in zip(cards, ratings):
+            quality = QUALITIES.get(rating, 3)
+
+            review_count = card.review_count + 1
+            correct_count = card.correct_count + (1 if quality >= 3 else 0)
+            ease_factor = card.ease_factor or 2.5
+            interval = card.interval or 1
+
+            # Hybrid approach: Fixed intervals for failed, SM2 for successful
+            if quality < 3:
+                interval = again_interval if quality == 0 else hard_interval
+                ease_factor = max(min_ease, ease_factor - 0.2)
+            else:
+                if review_count == 1:
+                    interval = first_interval
+                elif review_count == 2:
+                    interval = second_interval
+                else:
+                    multiplier = 1.3 if quality == 5 else 1.0
+                    interval = round(interval * ease_factor * multiplier * interval_modifier)
+
+                ease_factor = ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+            # Apply bounds
+            ease_factor = max(min_ease, min(ease_factor, max_ease))
+            interval = max(again_interval, min(interval, 365))
+
+            results.append({
+                'review_count': review_count,
+                'correct_count': correct_count,
+                'ease_factor': round(ease_factor, 2),
+                'interval': interval,
+                'last_review_date': now,
+                'next_review_date': now + timedelta(days=interval),
+                'difficulty_rating': rating
+            })
+        return results
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Flashcard Search Index
+Sets up the inverted index over flashcard questions and answers for the
+database in use: the FULLTEXT index on MySQL, an FTS5 table kept in sync by
+triggers on SQLite, or none (LIKE scans) elsewhere
+"""
+
+import click
+from flask import current_app as app
+from flask.cli import AppGroup
+from sqlalchemy import text
+
+SQLITE_TRIGGERS = {
+    'flashcards_fts_insert': """
+        CREATE TRIGGER flashcards_fts_insert AFTER INSERT ON flashcards BEGIN
+            INSERT INTO flashcards_fts(rowid, question, answer)
+            VALUES (new.rowid, new.question, new.answer);
+        END""",
+    'flashcards_fts_delete': """
+        CREATE TRIGGER flashcards_fts_delete AFTER DELETE ON flashcards BEGIN
+            INSERT INTO flashcards_fts(flashcards_fts, rowid, question, answer)
+            VALUES ('delete', old.rowid, old.question, old.answer);
+        END""",
+    'flashcards_fts_update': """
+        CREATE TRIGGER flashcards_fts_update AFTER UPDATE OF question, answer ON flashcards BEGIN
+            INSERT INTO flashcards_fts(flashcards_fts, rowid, question, answer)
+            VALUES ('delete', old.rowid, old.question, old.answer);
+            INSERT INTO flashcards_fts(rowid, question, answer)
+            VALUES (new.rowid, new.question, new.answer);
+        END""",
+}
+
+search_cli = AppGroup('search', help='Manage the flashcard search index.')
+
+
+def _setup_sqlite(connection):
+    """
+    Creates the FTS5 table and its triggers, rebuilding the index when the
+    triggers were missing (new database, or flashcards table recreated)
+
+    Returns:
+        bool: False when this SQLite build lacks FTS5
+    """
+    try:
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS flashcards_fts USING fts5("
+            "question, answer, content='flashcards', content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2')"))
+    except Exception:
+        return False
+
+    existing = set(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'flashcards'")).scalars())
+    missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+    for name in missing:
+        connection.execute(text(SQLITE_TRIGGERS[name]))
+    if missing:
+        connection.execute(text("INSERT INTO flashcards_fts(flashcards_fts) VALUES ('rebuild')"))
+    return True
+
+
+def setup_search_index(engine):
+    """
+    Prepares the search index for an engine
+
+    Args:
+        engine: The SQLAlchemy engine
+
+    Returns:
+        str: The search backend: 'mysql', 'sqlite' or 'like'
+    """
+    dialect = engine.dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        # ix_flashcards_fulltext is declared on the model and in the migrations
+        return 'mysql'
+    if dialect == 'sqlite':
+        with engine.begin() as connection:
+            if _setup_sqlite(connection):
+                return 'sqlite'
+    return 'like'
+
+
+def register_search(app, db):
+    """
+    Set up the flashcard search index and register the search CLI with the
+    Flask application
+
+    Args:
+        app: Flask application instance
+        db: The SQLAlchemy instance
+    """
+    app.extensions['search_backend'] = setup_search_index(db.engine)
+    app.cli.add_command(search_cli)
+
+
+@search_cli.command('rebuild')
+def rebuild():
+    """
+    Rebuilds the search index from the flashcards table (SQLite only; the
+    MySQL FULLTEXT index is maintained by InnoDB). Run it after a VACUUM,
+    which may renumber the rowids the FTS5 table refers to.
+    """
+    from app import db
+
+    backend = app.extensions.get('search_backend')
+    if backend != 'sqlite':
+        click.echo('The {} search backend needs no rebuild.'.format(backend))
+        return
+    with db.engine.begin() as connection:
+        connection.execute(text("INSERT INTO flashcards_fts(flashcards_fts) VALUES ('rebuild')"))
+    click.echo('Search index rebuilt.')
@@ -4,10 +4,13 @@ Deck Service Layer
 Handles business logic for deck operations
 """
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime
+from sqlalchemy import func
 from app.models.deck import Deck
 from app.models.user import User
 from app.exceptions import ValidationError, NotFoundError, ConflictError
+from app.schedulers import SCHEDULERS
 from flask import current_app as app
 
 
@@ -85,19 +88,57 @@ class DeckService:
         return query.all()
 
     @staticmethod
-    def update_deck(deck_id: str, name: Optional[str] = None) -> Optional[Deck]:
+    def get_deck_choices(user_id: str) -> List[Tuple[str, str]]:
         """
-        Updates a deck's name
+        Gets the (id, name) pairs of a user's decks, ordered by name, for deck
+        <select> fields
+
+        The choices are read on every request rather than cached: WTForms
+        rejects a submitted deck missing from them, and a per-process cache
+        would miss decks created through another worker.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            List of (deck ID, deck name) tuples
+        """
+        from app import db
+        return [tuple(row) for row in db.session.query(Deck.id, Deck.name).filter(
+            Deck.user_id == user_id).order_by(Deck.name)]
+
+    @staticmethod
+    def get_decks_version(user_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Gets the number of decks a user has and their latest update time,
+        which together change whenever the user's deck list does
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            Tuple of (deck count, max updated_at or None)
+        """
+        from app import db
+        return db.session.query(func.count(Deck.id), func.max(Deck.updated_at)).filter(
+            Deck.user_id == user_id).one()
+
+    @staticmethod
+    def update_deck(deck_id: str, name: Optional[str] = None,
+                    scheduler: Optional[str] = None) -> Optional[Deck]:
+        """
+        Updates a deck's name and/or scheduling algorithm
         
         Args:
             deck_id: The deck ID
             name: New deck name
+            scheduler: Name of a registered scheduler, e.g. 'sm2' or 'fsrs'
             
         Returns:
             Updated Deck object or None if not found
             
         Raises:
-            ValueError: If name is empty or already exists
+            ValueError: If name is empty or already exists, or the scheduler is unknown
         """
         deck = app.storage.get(Deck, deck_id)
         if not deck:
@@ -117,6 +158,12 @@ class DeckService:
                 raise ValueError(f"Deck with name '{name}' already exists")
             
             deck.name = name.strip()
+
+        if scheduler is not None:
+            if scheduler not in SCHEDULERS:
+                raise ValueError("Unknown scheduler '{}', expected one of: {}".format(
+                    scheduler, ', '.join(sorted(SCHEDULERS))))
+            deck.scheduler = scheduler
         
         deck.save()
         return deck
@@ -5,11 +5,13 @@ Handles business logic for flashcard operations
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
 from app.models.flashcard import Flashcard
 from app.models.progress import Progress
 from app.models.deck import Deck
-from app.exceptions import ValidationError, NotFoundError
+from app.exceptions import ValidationError, NotFoundError, ConflictError
 from flask import current_app as app
 
 
@@ -17,7 +19,8 @@ class FlashcardService:
     """Service class for flashcard-related operations"""
 
     @staticmethod
-    def create_flashcard(question: str, answer: str, deck_id: str) -> Flashcard:
+    def create_flashcard(question: str, answer: str, deck_id: str,
+                         allow_duplicate: bool = False) -> Flashcard:
         """
         Creates a new flashcard with initial progress tracking
         
@@ -25,18 +28,24 @@ class FlashcardService:
             question: The flashcard question text
             answer: The flashcard answer text
             deck_id: The ID of the deck to add the flashcard to
+            allow_duplicate: Create the flashcard even if the deck already
+                has one with the same normalized content
             
         Returns:
             The created Flashcard object
             
         Raises:
             ValueError: If question or answer is empty
+            ConflictError: If the deck already has an identical flashcard
         """
         # Validate inputs
         if not question or not question.strip():
             raise ValidationError("Question cannot be empty")
         if not answer or not answer.strip():
             raise ValidationError("Answer cannot be empty")
+
+        if not allow_duplicate and FlashcardService.find_duplicate(deck_id, question, answer):
+            raise ConflictError("An identical flashcard already exists in this deck")
         
         # Create flashcard
         flashcard = Flashcard(
@@ -58,6 +67,121 @@ class FlashcardService:
         
         return flashcard
 
+    @staticmethod
+    def find_duplicate(deck_id: str, question: str, answer: str,
+                       exclude_id: Optional[str] = None) -> Optional[Flashcard]:
+        """
+        Finds a flashcard of a deck with the same normalized content, using
+        the (deck_id, content_hash) index
+
+        Args:
+            deck_id: The deck ID
+            question: The question text
+            answer: The answer text
+            exclude_id: A flashcard ID to ignore, e.g. the one being edited
+
+        Returns:
+            The duplicate Flashcard object or None
+        """
+        query = Flashcard.query.filter_by(
+            deck_id=deck_id,
+            content_hash=Flashcard.compute_content_hash(question, answer)
+        )
+        if exclude_id:
+            query = query.filter(Flashcard.id != exclude_id)
+        return query.first()
+
+    @staticmethod
+    def import_flashcards(deck_id: str, cards: List[Dict]) -> Dict:
+        """
+        Adds many flashcards to a deck in one transaction, skipping those
+        identical to a flashcard already in the deck or earlier in the import
+
+        Args:
+            deck_id: The deck ID
+            cards: List of dictionaries with 'question' and 'answer'
+
+        Returns:
+            Dictionary with the number of flashcards 'created' and the
+            number of 'duplicates' skipped
+
+        Raises:
+            ValidationError: If any card lacks a question or an answer
+        """
+        from app import db
+
+        entries = []
+        for index, card in enumerate(cards):
+            question = (card.get('question') or '').strip() if isinstance(card, dict) else ''
+            answer = (card.get('answer') or '').strip() if isinstance(card, dict) else ''
+            if not question or not answer:
+                raise ValidationError("Card {} needs a question and an answer".format(index))
+            entries.append((question, answer, Flashcard.compute_content_hash(question, answer)))
+
+        # Look the hashes up in chunks to stay under bind parameter limits
+        hashes = list({content_hash for _, _, content_hash in entries})
+        seen = set()
+        for start in range(0, len(hashes), 500):
+            seen.update(content_hash for (content_hash,) in db.session.query(
+                Flashcard.content_hash).filter(
+                Flashcard.deck_id == deck_id,
+                Flashcard.content_hash.in_(hashes[start:start + 500])))
+
+        now = datetime.utcnow()
+        created = 0
+        for question, answer, content_hash in entries:
+            if content_hash in seen:
+                continue
+            seen.add(content_hash)
+            flashcard = Flashcard(question=question, answer=answer, deck_id=deck_id,
+                                  content_hash=content_hash)
+            progress = Progress(review_count=0, correct_count=0, flashcard_id=flashcard.id,
+                                last_review_date=now, next_review_date=now)
+            db.session.add_all([flashcard, progress])
+            created += 1
+        db.session.commit()
+
+        return {'created': created, 'duplicates': len(entries) - created}
+
+    @staticmethod
+    def dedupe_deck(deck_id: str) -> int:
+        """
+        Deletes the duplicate flashcards of a deck, keeping from each group
+        of identical flashcards the most reviewed one (the oldest on ties)
+
+        Args:
+            deck_id: The deck ID
+
+        Returns:
+            Number of flashcards deleted
+        """
+        from app import db
+
+        duplicated = db.session.query(Flashcard.content_hash).filter(
+            Flashcard.deck_id == deck_id).group_by(Flashcard.content_hash).having(
+            func.count(Flashcard.id) > 1)
+        rows = db.session.query(Flashcard.id, Flashcard.content_hash).outerjoin(
+            Progress, Progress.flashcard_id == Flashcard.id).filter(
+            Flashcard.deck_id == deck_id, Flashcard.content_hash.in_(duplicated)).order_by(
+            Flashcard.content_hash, Progress.review_count.desc(), Flashcard.created_at).all()
+
+        kept = set()
+        removed = []
+        for flashcard_id, content_hash in rows:
+            if content_hash in kept:
+                removed.append(flashcard_id)
+            else:
+                kept.add(content_hash)
+
+        for start in range(0, len(removed), 500):
+            chunk = removed[start:start + 500]
+            db.session.query(Progress).filter(Progress.flashcard_id.in_(chunk)).delete(
+                synchronize_session=False)
+            db.session.query(Flashcard).filter(Flashcard.id.in_(chunk)).delete(
+                synchronize_session=False)
+        db.session.commit()
+        return len(removed)
+
     @staticmethod
     def get_flashcard_by_id(flashcard_id: str) -> Optional[Flashcard]:
         """
@@ -71,6 +195,23 @@ class FlashcardService:
         """
         return app.storage.get(Flashcard, flashcard_id)
 
+    @staticmethod
+    def verify_flashcard_ownership(flashcard_id: str, user_id: str) -> bool:
+        """
+        Verifies that a flashcard belongs to one of a user's decks, with a
+        single query
+        
+        Args:
+            flashcard_id: The flashcard ID
+            user_id: The user ID
+            
+        Returns:
+            True if user owns the flashcard, False otherwise
+        """
+        from app import db
+        return db.session.query(Flashcard.id).join(Deck, Flashcard.deck_id == Deck.id).filter(
+            Flashcard.id == flashcard_id, Deck.user_id == user_id).first() is not None
+
     @staticmethod
     def get_flashcards_by_deck(deck_id: str) -> List[Flashcard]:
         """
@@ -85,6 +226,22 @@ class FlashcardService:
         from app import db
         return db.session.query(Flashcard).filter_by(deck_id=deck_id).all()
 
+    @staticmethod
+    def get_deck_flashcards_version(deck_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Gets the number of flashcards in a deck and their latest update time,
+        which together change whenever the deck's flashcard list does
+
+        Args:
+            deck_id: The deck ID
+
+        Returns:
+            Tuple of (flashcard count, max updated_at or None)
+        """
+        from app import db
+        return db.session.query(func.count(Flashcard.id), func.max(Flashcard.updated_at)).filter(
+            Flashcard.deck_id == deck_id).one()
+
     @staticmethod
     def update_flashcard(flashcard_id: str, question: Optional[str] = None, 
                         answer: Optional[str] = None, deck_id: Optional[str] = None) -> Optional[Flashcard]:
@@ -102,6 +259,7 @@ class FlashcardService:
             
         Raises:
             ValueError: If trying to set empty question or answer
+            ConflictError: If the target deck already has an identical flashcard
         """
         flashcard = app.storage.get(Flashcard, flashcard_id)
         if not flashcard:
@@ -110,16 +268,22 @@ class FlashcardService:
         if question is not None:
             if not question.strip():
                 raise ValueError("Question cannot be empty")
-            flashcard.question = question.strip()
+            question = question.strip()
         
         if answer is not None:
             if not answer.strip():
                 raise ValueError("Answer cannot be empty")
-            flashcard.answer = answer.strip()
-        
-        if deck_id is not None:
-            flashcard.deck_id = deck_id
-        
+            answer = answer.strip()
+
+        question = flashcard.question if question is None else question
+        answer = flashcard.answer if answer is None else answer
+        deck_id = flashcard.deck_id if deck_id is None else deck_id
+        if FlashcardService.find_duplicate(deck_id, question, answer, exclude_id=flashcard.id):
+            raise ConflictError("An identical flashcard already exists in this deck")
+
+        flashcard.question = question
+        flashcard.answer = answer
+        flashcard.deck_id = deck_id
         flashcard.save()
         return flashcard
 
@@ -144,12 +308,13 @@ class FlashcardService:
         return True
 
     @staticmethod
-    def get_due_flashcards(deck_id: str) -> List[Flashcard]:
+    def get_due_flashcards(deck_id: str, limit: Optional[int] = None) -> List[Flashcard]:
         """
-        Gets flashcards that are due for review in a deck
+        Gets flashcards that are due for review in a deck, most overdue first
         
         Args:
             deck_id: The deck ID
+            limit: Maximum number of flashcards (optional)
             
         Returns:
             List of Flashcard objects that are due for review
@@ -157,13 +322,41 @@ class FlashcardService:
         from app import db
         now = datetime.utcnow()
         
-        flashcards = db.session.query(Flashcard)\
+        query = db.session.query(Flashcard)\
             .join(Progress)\
             .filter(Flashcard.deck_id == deck_id)\
             .filter(Progress.next_review_date <= now)\
-            .all()
+            .order_by(Progress.next_review_date)
         
-        return flashcards
+        return query.limit(limit).all() if limit else query.all()
+
+    @staticmethod
+    def get_due_flashcards_by_user(user_id: str, limit: int = 50,
+                                   now: Optional[datetime] = None) -> List[Flashcard]:
+        """
+        Gets the next flashcards due for review across all of a user's decks,
+        most overdue first, with their progress loaded by the same query
+
+        Args:
+            user_id: The user ID
+            limit: Maximum number of flashcards
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            List of Flashcard objects with .progress populated
+        """
+        from app import db
+        now = now or datetime.utcnow()
+
+        return db.session.query(Flashcard)\
+            .join(Flashcard.progress)\
+            .join(Deck, Flashcard.deck_id == Deck.id)\
+            .options(contains_eager(Flashcard.progress))\
+            .filter(Deck.user_id == user_id)\
+            .filter(Progress.next_review_date <= now)\
+            .order_by(Progress.next_review_date)\
+            .limit(limit)\
+            .all()
 
     @staticmethod
     def get_flashcard_with_progress(flashcard_id: str) -> Optional[Dict]:
@@ -5,11 +5,29 @@ Handles business logic for progress tracking and spaced repetition
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from types import SimpleNamespace
+from typing import Optional, Dict, List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm.exc import StaleDataError
+from app.cache import TTLCache
 from app.models.progress import Progress
 from app.models.flashcard import Flashcard
+from app.exceptions import ConflictError, NotFoundError, ValidationError
+from app.schedulers import RATINGS, SCHEDULERS, get_scheduler
+from app.schedulers.sm2 import DEFAULT_PARAMETERS
 from flask import current_app as app
 
+# (user ID, first day, days) -> forecast
+forecast_cache = TTLCache()
+
+# user ID -> fitted scheduler parameters (or the defaults)
+parameters_cache = TTLCache(maxsize=4096, ttl=300)
+
+# Dialects whose DATE() truncates a datetime column to its day
+SQL_DATE_DIALECTS = ('mysql', 'mariadb', 'sqlite', 'postgresql')
+MAX_FORECAST_DAYS = 365
+MAX_BATCH_REVIEWS = 500
+
 
 class ProgressService:
     """Service class for progress and spaced repetition operations"""
@@ -29,21 +47,79 @@ class ProgressService:
         return db.session.query(Progress).filter_by(flashcard_id=flashcard_id).first()
 
     @staticmethod
-    def update_progress(flashcard_id: str, progress_data: Dict) -> Optional[Progress]:
+    def get_deck_progress_version(deck_id: str) -> Tuple[int, Optional[datetime], int]:
+        """
+        Gets the number of progress records in a deck, their latest update
+        time and the sum of their versions, which together change whenever
+        the deck's progress does (even twice within the clock's resolution)
+
+        Args:
+            deck_id: The deck ID
+
+        Returns:
+            Tuple of (progress count, max updated_at or None, version sum)
+        """
+        from app import db
+        count, last_modified, versions = db.session.query(
+            func.count(Progress.id), func.max(Progress.updated_at),
+            func.coalesce(func.sum(Progress.version), 0)).join(
+            Flashcard, Progress.flashcard_id == Flashcard.id).filter(Flashcard.deck_id == deck_id).one()
+        return count, last_modified, int(versions)
+
+    @staticmethod
+    def update_progress(flashcard_id: str, progress_data: Dict,
+                        expected_version: Optional[int] = None) -> Optional[Progress]:
         """
         Updates progress for a flashcard
         
         Args:
             flashcard_id: The flashcard ID
             progress_data: Dictionary with progress fields to update
+            expected_version: The version the caller's changes are based on;
+                the update is refused if the progress has moved on since
             
         Returns:
             Updated Progress object or None if not found
+
+        Raises:
+            ConflictError: If the progress is no longer at expected_version,
+                or another update committed first
         """
         progress = ProgressService.get_progress(flashcard_id)
         if not progress:
             return None
-        
+
+        if expected_version is not None and progress.version != expected_version:
+            raise ConflictError('Progress was updated by another request',
+                                payload={'version': progress.version})
+
+        previous_review_count = progress.review_count
+        previous_correct_count = progress.correct_count
+        previous_review_date = progress.last_review_date
+        deck_id, user_id = ProgressService._get_owner(flashcard_id)
+
+        ProgressService._apply_fields(progress, progress_data)
+        if progress.review_count > previous_review_count and user_id is not None:
+            # A new review (not an edit): append it to the review history,
+            # committed together with the progress
+            from app.services.review_log_service import ReviewLogService
+            ReviewLogService.record_review(
+                user_id, deck_id, flashcard_id, progress, previous_review_date,
+                correct=progress.correct_count > previous_correct_count)
+        ProgressService._save_versioned(progress.save)
+        ProgressService.invalidate_forecast(user_id=user_id)
+        return progress
+
+    @staticmethod
+    def _apply_fields(progress: Progress, progress_data: Dict):
+        """
+        Copies the progress fields present in progress_data onto a Progress,
+        parsing ISO 8601 date strings
+
+        Args:
+            progress: The Progress object to modify
+            progress_data: Dictionary with progress fields to update
+        """
         # Update fields
         if 'review_count' in progress_data:
             progress.review_count = progress_data['review_count']
@@ -75,77 +151,245 @@ class ProgressService:
         
         if 'difficulty_rating' in progress_data:
             progress.difficulty_rating = progress_data['difficulty_rating']
-        
-        progress.save()
-        return progress
+
+        # Memory state of the FSRS scheduler
+        if 'stability' in progress_data:
+            progress.stability = progress_data['stability']
+
+        if 'difficulty' in progress_data:
+            progress.difficulty = progress_data['difficulty']
 
     @staticmethod
-    def calculate_next_review(progress: Progress, rating: str) -> Dict:
+    def apply_progress_updates(updates: List[Tuple[str, Dict, Optional[int]]]) -> Dict:
+        """
+        Applies many progress updates, in order, in one transaction: the
+        batched counterpart of update_progress used by the ingestion queue
+
+        Updates whose flashcard is gone, or whose expected version is no
+        longer current, are skipped rather than failing the batch. Several
+        updates of one card each get their own version increment.
+
+        Args:
+            updates: (flashcard ID, progress data, expected version or None)
+                tuples
+
+        Returns:
+            Dictionary with the numbers of updates 'applied', skipped as
+            'conflicts' and skipped as 'missing'
+
+        Raises:
+            ConflictError: If another request updated one of the rows before
+                the commit (nothing is applied; the batch can be retried)
+        """
+        from app import db
+        from app.models.deck import Deck
+        from app.services.review_log_service import ReviewLogService
+
+        flashcard_ids = list({flashcard_id for flashcard_id, _, _ in updates})
+        rows = db.session.query(Progress, Flashcard.deck_id, Deck.user_id).join(
+            Flashcard, Progress.flashcard_id == Flashcard.id).join(
+            Deck, Flashcard.deck_id == Deck.id).filter(
+            Progress.flashcard_id.in_(flashcard_ids)).all()
+        cards = {progress.flashcard_id: (progress, deck_id, user_id)
+                 for progress, deck_id, user_id in rows}
+
+        counts = {'applied': 0, 'conflicts': 0, 'missing': 0}
+        reviews = []
+        pending = set()
+        for flashcard_id, progress_data, expected_version in updates:
+            if flashcard_id not in cards:
+                counts['missing'] += 1
+                continue
+            progress = cards[flashcard_id][0]
+            if flashcard_id in pending:
+                # Write the card's previous update so that it bumps the version
+                ProgressService._save_versioned(db.session.flush)
+                pending.clear()
+            if expected_version is not None and progress.version != expected_version:
+                counts['conflicts'] += 1
+                continue
+
+            previous = (progress.review_count, progress.correct_count, progress.last_review_date)
+            ProgressService._apply_fields(progress, progress_data)
+            progress.updated_at = datetime.utcnow()
+            pending.add(flashcard_id)
+            counts['applied'] += 1
+            if progress.review_count > previous[0]:
+                reviews.append((flashcard_id, dict(
+                    review_count=progress.review_count, correct_count=progress.correct_count,
+                    ease_factor=progress.ease_factor, interval=progress.interval,
+                    last_review_date=progress.last_review_date,
+                    difficulty_rating=progress.difficulty_rating), previous))
+
+        # The reviews are committed (or rolled back) with the progress
+        for flashcard_id, state, (_, correct_count, last_review_date) in reviews:
+            _, deck_id, user_id = cards[flashcard_id]
+            ReviewLogService.record_review(
+                user_id, deck_id, flashcard_id, SimpleNamespace(**state), last_review_date,
+                correct=state['correct_count'] > correct_count)
+        ProgressService._save_versioned(db.session.commit)
+
+        for user_id in {user_id for _, _, user_id in cards.values()}:
+            ProgressService.invalidate_forecast(user_id=user_id)
+        return counts
+
+    @staticmethod
+    def _get_owner(flashcard_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Gets the deck and the user a flashcard belongs to
+
+        Returns:
+            Tuple of (deck ID, user ID), both None if the flashcard is gone
+        """
+        from app import db
+        from app.models.deck import Deck
+
+        owner = db.session.query(Flashcard.deck_id, Deck.user_id).join(
+            Deck, Flashcard.deck_id == Deck.id).filter(Flashcard.id == flashcard_id).first()
+        return tuple(owner) if owner else (None, None)
+
+    @staticmethod
+    def get_scheduler_parameters(user_id: Optional[str]) -> Dict:
+        """
+        Gets the user's fitted scheduler parameters, or the defaults
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            Dictionary with the keys of DEFAULT_PARAMETERS
+        """
+        from app import db
+        from app.models.scheduler_parameters import SchedulerParameters
+
+        if user_id is None:
+            return DEFAULT_PARAMETERS
+        parameters = parameters_cache.get(user_id)
+        if parameters is None:
+            row = db.session.get(SchedulerParameters, user_id)
+            parameters = DEFAULT_PARAMETERS if row is None else {
+                key: getattr(row, key) for key in DEFAULT_PARAMETERS}
+            parameters_cache.set(user_id, parameters)
+        return parameters
+
+    @staticmethod
+    def _save_versioned(commit):
+        """
+        Runs a commit (or flush) of versioned progress rows, turning a lost
+        race into a conflict
+
+        Args:
+            commit: The callable committing or flushing the session
+
+        Raises:
+            ConflictError: If another request updated one of the rows first
+        """
+        from app import db
+
+        try:
+            commit()
+        except StaleDataError:
+            db.session.rollback()
+            raise ConflictError('Progress was updated by another request')
+
+    @staticmethod
+    def calculate_next_review(progress: Progress, rating: str,
+                              parameters: Optional[Dict] = None) -> Dict:
         """
         Calculates next review date based on rating using hybrid SM2 algorithm
         
         Args:
             progress: Current Progress object
             rating: User rating ('again', 'hard', 'good', 'easy')
+            parameters: Scheduler parameters (defaults to DEFAULT_PARAMETERS)
             
         Returns:
             Dictionary with updated progress values
         """
-        # Rating to quality mapping
-        ratings = {
-            'again': 0,  # Complete blackout
-            'hard': 2,   # Incorrect response
-            'good': 3,   # Correct with difficulty
-            'easy': 5    # Perfect response
-        }
-        
-        quality = ratings.get(rating, 3)
-        
-        # Current values
-        review_count = progress.review_count + 1
-        correct_count = progress.correct_count + (1 if quality >= 3 else 0)
-        ease_factor = progress.ease_factor or 2.5
-        interval = progress.interval or 1
-        
-        # Hybrid approach: Fixed intervals for failed, SM2 for successful
-        if quality < 3:
-            # Failed cards - fixed short intervals
-            if quality == 0:  # again
-                interval = 10 / (24 * 60)  # 10 minutes
-            else:  # hard
-                interval = 15 / (24 * 60)  # 15 minutes
-            
-            ease_factor = max(1.3, ease_factor - 0.2)
-        else:
-            # Successful cards - adaptive SM2
-            if review_count == 1:
-                interval = 1  # 1 day
-            elif review_count == 2:
-                interval = 6  # 6 days
-            else:
-                multiplier = 1.3 if quality == 5 else 1.0
-                interval = round(interval * ease_factor * multiplier)
-            
-            # Update ease factor
-            ease_factor = ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
-        
-        # Apply bounds
-        ease_factor = max(1.3, min(ease_factor, 2.5))
-        interval = max(10 / (24 * 60), min(interval, 365))
-        
-        # Calculate next review date
-        interval_ms = interval * 24 * 60 * 60 * 1000
-        next_review_date = datetime.utcnow() + timedelta(milliseconds=interval_ms)
-        
-        return {
-            'review_count': review_count,
-            'correct_count': correct_count,
-            'ease_factor': round(ease_factor, 2),
-            'interval': interval,
-            'last_review_date': datetime.utcnow(),
-            'next_review_date': next_review_date,
-            'difficulty_rating': rating
-        }
+        return get_scheduler('sm2').schedule(progress, rating, parameters=parameters)
+
+    @staticmethod
+    def review_flashcard(flashcard_id: str, rating: str, user_id: str) -> Progress:
+        """
+        Records a review of one of the user's flashcards, see review_flashcards
+
+        Returns:
+            Updated Progress object
+        """
+        return ProgressService.review_flashcards(user_id, [(flashcard_id, rating)])[0]
+
+    @staticmethod
+    def review_flashcards(user_id: str, reviews: List[Tuple[str, str]],
+                          now: Optional[datetime] = None) -> List[Progress]:
+        """
+        Records reviews of the user's flashcards made at the same time,
+        scheduling the next ones on the server: each deck's scheduler
+        handles its cards in one schedule_many call, with the user's fitted
+        parameters, and everything is committed at once
+
+        Args:
+            user_id: The reviewing user's ID
+            reviews: (flashcard ID, rating) pairs, one per flashcard
+            now: The review time (defaults to utcnow)
+
+        Returns:
+            The updated Progress objects, in the order of the reviews
+
+        Raises:
+            ValidationError: If a rating is unknown, a flashcard is repeated
+                or there are more than MAX_BATCH_REVIEWS reviews
+            NotFoundError: If a flashcard has no progress or is not the user's
+        """
+        from app import db
+        from app.models.deck import Deck
+        from app.services.review_log_service import ReviewLogService
+
+        if not 1 <= len(reviews) <= MAX_BATCH_REVIEWS:
+            raise ValidationError('Between 1 and {} reviews are accepted at once'.format(MAX_BATCH_REVIEWS))
+        flashcard_ids = [flashcard_id for flashcard_id, _ in reviews]
+        if len(set(flashcard_ids)) != len(flashcard_ids):
+            raise ValidationError('Each flashcard can only be reviewed once per request')
+        for _, rating in reviews:
+            if rating not in RATINGS:
+                raise ValidationError('rating must be one of: {}'.format(', '.join(RATINGS)))
+
+        rows = db.session.query(Progress, Flashcard.deck_id, Deck.scheduler).join(
+            Flashcard, Progress.flashcard_id == Flashcard.id).join(
+            Deck, Flashcard.deck_id == Deck.id).filter(
+            Deck.user_id == user_id, Progress.flashcard_id.in_(flashcard_ids)).all()
+        cards = {progress.flashcard_id: (progress, deck_id, scheduler)
+                 for progress, deck_id, scheduler in rows}
+        if len(cards) != len(flashcard_ids):
+            raise NotFoundError('Progress not found for this flashcard')
+
+        now = now or datetime.utcnow()
+        parameters = dict(ProgressService.get_scheduler_parameters(user_id),
+                          request_retention=app.config.get('SCHEDULER_TARGET_RETENTION', 0.9))
+        by_scheduler = {}
+        for flashcard_id, rating in reviews:
+            scheduler = cards[flashcard_id][2]
+            by_scheduler.setdefault(scheduler if scheduler in SCHEDULERS else None, []).append(
+                (flashcard_id, rating))
+
+        for name, batch in by_scheduler.items():
+            batch_progress = [cards[flashcard_id][0] for flashcard_id, _ in batch]
+            previous = [(progress.correct_count, progress.last_review_date) for progress in batch_progress]
+            results = get_scheduler(name).schedule_many(
+                batch_progress, [rating for _, rating in batch], now, parameters)
+            for progress, values, (correct_count, last_review_date) in zip(batch_progress, results, previous):
+                for key, value in values.items():
+                    setattr(progress, key, value)
+                progress.updated_at = now
+                # The review is committed (or rolled back) with the progress
+                ReviewLogService.record_review(
+                    user_id, cards[progress.flashcard_id][1], progress.flashcard_id, progress,
+                    last_review_date, correct=progress.correct_count > correct_count)
+
+        ProgressService._save_versioned(db.session.commit)
+        ProgressService.invalidate_forecast(user_id=user_id)
+        # Reload the rows expired by the commit with one query
+        db.session.query(Progress).filter(Progress.flashcard_id.in_(flashcard_ids)).all()
+        return [cards[flashcard_id][0] for flashcard_id in flashcard_ids]
 
     @staticmethod
     def get_user_statistics(user_id: str) -> Dict:
@@ -215,6 +459,48 @@ class ProgressService:
             'new': new
         }
 
+    @staticmethod
+    def reschedule_user_progress(user_id: str) -> int:
+        """
+        Recomputes next review dates from the last review date and interval
+        for every reviewed flashcard of a user
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            Number of progress records that were rescheduled
+        """
+        from app import db
+        from app.models.deck import Deck
+
+        progress_records = db.session.query(Progress)\
+            .join(Flashcard)\
+            .join(Deck)\
+            .filter(Deck.user_id == user_id)\
+            .filter(Progress.review_count > 0)\
+            .all()
+
+        rescheduled = 0
+        for progress in progress_records:
+            if not progress.last_review_date:
+                continue
+            next_review_date = progress.last_review_date + timedelta(days=progress.interval or 1)
+            if progress.next_review_date != next_review_date:
+                progress.next_review_date = next_review_date
+                progress.updated_at = datetime.utcnow()
+                rescheduled += 1
+
+        if rescheduled:
+            try:
+                db.session.commit()
+            except StaleDataError:
+                # A review moved a card meanwhile; the next run realigns the rest
+                db.session.rollback()
+                return 0
+            ProgressService.invalidate_forecast(user_id=user_id)
+        return rescheduled
+
     @staticmethod
     def reset_progress(flashcard_id: str) -> Optional[Progress]:
         """
@@ -237,6 +523,88 @@ class ProgressService:
         progress.last_review_date = datetime.utcnow()
         progress.next_review_date = datetime.utcnow()
         progress.difficulty_rating = None
+        progress.stability = None
+        progress.difficulty = None
         
-        progress.save()
+        ProgressService._save_versioned(progress.save)
+        ProgressService.invalidate_forecast(flashcard_id=flashcard_id)
         return progress
+
+    @staticmethod
+    def get_review_forecast(user_id: str, days: int = 30, now: Optional[datetime] = None) -> Dict:
+        """
+        Counts the user's reviewed cards falling due on each of the next days,
+        served from the forecast cache when possible
+
+        Cards that are already overdue are counted on the first day. Cards
+        never reviewed are reported separately as 'new'.
+
+        Args:
+            user_id: The user ID
+            days: Number of days, today included (at most 365)
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            Dictionary with the 'start' date, 'days', the per-day 'counts'
+            and the number of 'new' cards
+
+        Raises:
+            ValidationError: If days is out of range
+        """
+        if not 1 <= days <= MAX_FORECAST_DAYS:
+            raise ValidationError('days must be between 1 and {}'.format(MAX_FORECAST_DAYS))
+
+        start = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        key = (user_id, start.date().isoformat(), days)
+        forecast = forecast_cache.get(key)
+        if forecast is None:
+            forecast = ProgressService._compute_forecast(user_id, start, days)
+            forecast_cache.set(key, forecast)
+        return forecast
+
+    @staticmethod
+    def _compute_forecast(user_id: str, start: datetime, days: int) -> Dict:
+        """
+        Buckets the user's due dates by day with a single GROUP BY query, or
+        in Python on databases without a suitable DATE()
+
+        Returns:
+            The forecast dictionary described in get_review_forecast
+        """
+        from app import db
+        from app.models.deck import Deck
+
+        end = start + timedelta(days=days)
+        user_progress = db.session.query(Progress).join(
+            Flashcard, Progress.flashcard_id == Flashcard.id).join(
+            Deck, Flashcard.deck_id == Deck.id).filter(Deck.user_id == user_id)
+
+        new = user_progress.filter(Progress.review_count == 0).count()
+        due = user_progress.filter(Progress.review_count > 0, Progress.next_review_date < end)
+
+        counts = [0] * days
+        if db.engine.dialect.name in SQL_DATE_DIALECTS:
+            day = func.date(Progress.next_review_date)
+            for due_date, count in due.with_entities(day, func.count(Progress.id)).group_by(day):
+                # SQLite returns 'YYYY-MM-DD' strings, other drivers dates
+                due_date = datetime.strptime(str(due_date)[:10], '%Y-%m-%d')
+                counts[max(0, (due_date - start).days)] += count
+        else:
+            for (next_review_date,) in due.with_entities(Progress.next_review_date).yield_per(1000):
+                counts[max(0, (next_review_date - start).days)] += 1
+
+        return {'start': start.date().isoformat(), 'days': days, 'counts': counts, 'new': new}
+
+    @staticmethod
+    def invalidate_forecast(user_id: Optional[str] = None, flashcard_id: Optional[str] = None):
+        """
+        Drops a user's cached forecasts, e.g. after a review
+
+        Args:
+            user_id: The user ID
+            flashcard_id: A flashcard of the user, when the user ID is not at hand
+        """
+        if user_id is None and flashcard_id is not None:
+            user_id = ProgressService._get_owner(flashcard_id)[1]
+        if user_id is not None:
+            forecast_cache.invalidate_matching(lambda key: key[0] == user_id)
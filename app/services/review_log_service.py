@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+"""
+Review Log Service Layer
+Records every review in the append-only review log, in the transaction of
+the progress change, and answers history questions (retention, streaks)
+from the log alone
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import case, func
+from app.models.review_log import ReviewLog
+from app.exceptions import ValidationError
+
+MAX_HISTORY_DAYS = 365
+
+# Retention curve buckets: (label, lower bound, upper bound) of the days
+# elapsed since the previous review
+ELAPSED_BUCKETS = (
+    ('<1', 0, 1),
+    ('1', 1, 2),
+    ('2-3', 2, 4),
+    ('4-7', 4, 8),
+    ('8-14', 8, 15),
+    ('15-30', 15, 31),
+    ('31+', 31, None),
+)
+
+
+class ReviewLogService:
+    """Service class for the review history"""
+
+    @staticmethod
+    def record_review(user_id: str, deck_id: str, flashcard_id: str, progress,
+                      previous_review_date: Optional[datetime] = None,
+                      correct: bool = False):
+        """
+        Adds a review to the review log in the current transaction, so that
+        it is written by the same commit as the progress it records
+
+        Args:
+            user_id: The reviewing user's ID
+            deck_id: The flashcard's deck ID
+            flashcard_id: The flashcard ID
+            progress: The card's Progress after the review
+            previous_review_date: The card's previous review time, if any
+            correct: Whether the card was answered correctly
+        """
+        from app import db
+
+        reviewed_at = progress.last_review_date or datetime.utcnow()
+        elapsed_days = None
+        if previous_review_date is not None and progress.review_count > 1:
+            elapsed_days = round(max(0.0, (reviewed_at - previous_review_date).total_seconds() / 86400), 4)
+
+        db.session.add(ReviewLog(
+            id=str(uuid.uuid4()),
+            reviewed_at=reviewed_at,
+            user_id=user_id,
+            deck_id=deck_id,
+            flashcard_id=flashcard_id,
+            rating=progress.difficulty_rating,
+            correct=correct,
+            review_count=progress.review_count,
+            interval=progress.interval,
+            ease_factor=progress.ease_factor,
+            elapsed_days=elapsed_days,
+        ))
+
+    @staticmethod
+    def get_cards_reviewed_since(user_id: str, since: datetime) -> Dict[str, int]:
+        """
+        Gets the cards a user has reviewed since a given time
+
+        Args:
+            user_id: The user ID
+            since: The start of the period
+
+        Returns:
+            Dictionary of flashcard ID -> lowest review count reached in the
+            period (1 when the card's first review was in the period)
+        """
+        from app import db
+
+        return dict(db.session.query(ReviewLog.flashcard_id, func.min(ReviewLog.review_count)).filter(
+            ReviewLog.user_id == user_id, ReviewLog.reviewed_at >= since).group_by(
+            ReviewLog.flashcard_id).all())
+
+    @staticmethod
+    def get_retention(user_id: str, days: int = 30, now: Optional[datetime] = None) -> Dict:
+        """
+        Computes the user's retention over the last days: the share of
+        repeat reviews answered correctly, overall and by the time elapsed
+        since the previous review
+
+        Args:
+            user_id: The user ID
+            days: Size of the window in days (at most 365)
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            Dictionary with 'days', the overall 'reviews' and 'retention'
+            and the 'curve' (one entry per elapsed-days bucket)
+
+        Raises:
+            ValidationError: If days is out of range
+        """
+        from app import db
+
+        if not 1 <= days <= MAX_HISTORY_DAYS:
+            raise ValidationError('days must be between 1 and {}'.format(MAX_HISTORY_DAYS))
+
+        since = (now or datetime.utcnow()) - timedelta(days=days)
+        bucket = case(*[
+            ((ReviewLog.elapsed_days < upper) if upper is not None else (ReviewLog.elapsed_days >= lower), index)
+            for index, (_, lower, upper) in enumerate(ELAPSED_BUCKETS)
+        ])
+        rows = db.session.query(
+            bucket, func.count(ReviewLog.id), func.sum(case((ReviewLog.correct, 1), else_=0))
+        ).filter(
+            ReviewLog.user_id == user_id,
+            ReviewLog.reviewed_at >= since,
+            ReviewLog.elapsed_days.isnot(None)
+        ).group_by(bucket).all()
+
+        counts = {index: (reviews, int(correct or 0)) for index, reviews, correct in rows}
+        curve = []
+        for index, (label, _, _) in enumerate(ELAPSED_BUCKETS):
+            reviews, correct = counts.get(index, (0, 0))
+            curve.append({
+                'elapsed_days': label,
+                'reviews': reviews,
+                'retention': round(correct / reviews, 4) if reviews else None
+            })
+
+        reviews = sum(point['reviews'] for point in curve)
+        correct = sum(correct for _, correct in counts.values())
+        return {
+            'days': days,
+            'reviews': reviews,
+            'retention': round(correct / reviews, 4) if reviews else None,
+            'curve': curve
+        }
+
+    @staticmethod
+    def get_streaks(user_id: str, now: Optional[datetime] = None) -> Dict:
+        """
+        Computes the user's review streaks: consecutive UTC days with at
+        least one review. The current streak survives until the end of the
+        day after the last review.
+
+        Args:
+            user_id: The user ID
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            Dictionary with the 'current' and 'longest' streaks in days,
+            the number of 'days_reviewed' and the 'last_review_date'
+        """
+        from app import db
+
+        day = func.date(ReviewLog.reviewed_at)
+        dates = [datetime.strptime(str(value)[:10], '%Y-%m-%d').date() for (value,) in
+                 db.session.query(day).filter(ReviewLog.user_id == user_id).distinct().order_by(day)]
+
+        longest = run = 0
+        previous = None
+        for date in dates:
+            run = run + 1 if previous is not None and (date - previous).days == 1 else 1
+            longest = max(longest, run)
+            previous = date
+
+        today = (now or datetime.utcnow()).date()
+        current = run if previous is not None and (today - previous).days <= 1 else 0
+        return {
+            'current': current,
+            'longest': longest,
+            'days_reviewed': len(dates),
+            'last_review_date': previous.isoformat() if previous else None
+        }
+
+    @staticmethod
+    def purge(before: datetime, batch_size: int = 5000) -> int:
+        """
+        Deletes the reviews older than a cutoff, in batches so that no
+        transaction holds many row locks
+
+        Args:
+            before: The cutoff time
+            batch_size: Rows deleted per transaction
+
+        Returns:
+            Number of reviews deleted
+        """
+        from app import db
+
+        deleted = 0
+        while True:
+            ids = [review_id for (review_id,) in db.session.query(ReviewLog.id).filter(
+                ReviewLog.reviewed_at < before).limit(batch_size)]
+            if not ids:
+                break
+            deleted += db.session.query(ReviewLog).filter(
+                ReviewLog.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+        return deleted
@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""
+Scheduler Service Layer
+Builds bounded, prioritized review queues under daily study limits
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from flask import current_app as app
+from sqlalchemy import func
+from app.models.deck import Deck
+from app.models.flashcard import Flashcard
+from app.models.progress import Progress
+from app.exceptions import ValidationError
+
+
+class SchedulerService:
+    """Service class for review queue scheduling"""
+
+    @staticmethod
+    def get_daily_counts(user_id: str, now: Optional[datetime] = None) -> Dict:
+        """
+        Counts the new cards and reviews a user has studied today (UTC)
+
+        A card first reviewed today counts as new, even if it has been
+        relearned since; any other card reviewed today counts as a review.
+        The counts come from the review log, since the progress rows only
+        keep each card's latest state.
+
+        Args:
+            user_id: The user ID
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            Dictionary with 'new' and 'reviews' counts
+        """
+        from app.services.review_log_service import ReviewLogService
+
+        now = now or datetime.utcnow()
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        cards = ReviewLogService.get_cards_reviewed_since(user_id, day_start)
+        new = sum(1 for review_count in cards.values() if review_count <= 1)
+        return {'new': new, 'reviews': len(cards) - new}
+
+    @staticmethod
+    def _select_cards(user_id: str, deck_id: Optional[str], due_filter, priority, limit: int) -> List:
+        """
+        Selects up to `limit` (Flashcard, Progress) pairs, interleaving decks:
+        each deck's cards are ranked by priority, then taken rank by rank
+
+        Args:
+            user_id: The user ID
+            deck_id: Restrict to one deck (optional)
+            due_filter: Filter on Progress selecting the candidate cards
+            priority: ORDER BY clauses ranking cards within a deck
+            limit: Maximum number of cards
+
+        Returns:
+            List of (Flashcard, Progress) tuples in queue order
+        """
+        from app import db
+
+        if limit <= 0:
+            return []
+
+        deck_rank = func.row_number().over(partition_by=Flashcard.deck_id, order_by=priority)
+        ranked = db.session.query(Flashcard.id.label('flashcard_id'), deck_rank.label('deck_rank')).join(
+            Progress, Progress.flashcard_id == Flashcard.id).join(
+            Deck, Flashcard.deck_id == Deck.id).filter(Deck.user_id == user_id, due_filter)
+        if deck_id:
+            ranked = ranked.filter(Flashcard.deck_id == deck_id)
+        ranked = ranked.subquery()
+
+        return db.session.query(Flashcard, Progress).join(
+            ranked, ranked.c.flashcard_id == Flashcard.id).join(
+            Progress, Progress.flashcard_id == Flashcard.id).order_by(
+            ranked.c.deck_rank, *priority).limit(limit).all()
+
+    @staticmethod
+    def _interleave(reviews: List, new: List) -> List:
+        """
+        Spreads the new cards evenly among the reviews
+
+        Returns:
+            The merged list
+        """
+        keyed = [((index + 1) / (len(reviews) + 1), 0, card) for index, card in enumerate(reviews)]
+        keyed += [((index + 1) / (len(new) + 1), 1, card) for index, card in enumerate(new)]
+        return [card for _, _, card in sorted(keyed, key=lambda item: item[:2])]
+
+    @staticmethod
+    def get_review_queue(user_id: str, deck_id: Optional[str] = None,
+                         limit: Optional[int] = None, now: Optional[datetime] = None) -> Dict:
+        """
+        Builds the user's next review queue
+
+        Due reviews come first, the most overdue and then the hardest (lowest
+        ease factor) first; new cards fill the remaining room, oldest first,
+        spread among the reviews. Decks are interleaved, and the day's
+        NEW_CARDS_PER_DAY and REVIEWS_PER_DAY limits are enforced.
+
+        Args:
+            user_id: The user ID
+            deck_id: Restrict the queue to one deck (optional)
+            limit: Maximum queue length (defaults to, and is capped at,
+                REVIEW_QUEUE_SIZE)
+            now: The current time (defaults to utcnow)
+
+        Returns:
+            Dictionary with the 'cards' (flashcards with their 'progress' and
+            'queue': 'review' or 'new') and the 'remaining' daily limits
+
+        Raises:
+            ValidationError: If limit is not positive
+        """
+        now = now or datetime.utcnow()
+        max_size = app.config.get('REVIEW_QUEUE_SIZE', 100)
+        limit = max_size if limit is None else limit
+        if limit < 1:
+            raise ValidationError('limit must be a positive integer')
+        limit = min(limit, max_size)
+
+        done = SchedulerService.get_daily_counts(user_id, now)
+        remaining = {
+            'new': max(0, app.config.get('NEW_CARDS_PER_DAY', 20) - done['new']),
+            'reviews': max(0, app.config.get('REVIEWS_PER_DAY', 200) - done['reviews'])
+        }
+
+        reviews = SchedulerService._select_cards(
+            user_id, deck_id,
+            (Progress.review_count > 0) & (Progress.next_review_date <= now),
+            (Progress.next_review_date, Progress.ease_factor),
+            min(limit, remaining['reviews']))
+        new = SchedulerService._select_cards(
+            user_id, deck_id, Progress.review_count == 0,
+            (Flashcard.created_at, Flashcard.id),
+            min(limit - len(reviews), remaining['new']))
+
+        cards = []
+        for kind, (flashcard, progress) in SchedulerService._interleave(
+                [('review', pair) for pair in reviews], [('new', pair) for pair in new]):
+            card = flashcard.to_dict()
+            card['progress'] = progress.to_dict()
+            card['queue'] = kind
+            cards.append(card)
+
+        return {'cards': cards, 'remaining': remaining}
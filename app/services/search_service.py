@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Search Service Layer
+Handles full-text search over a user's flashcards
+"""
+
+import re
+from typing import Dict, List
+from flask import current_app as app
+from sqlalchemy import and_, case, column, literal_column, or_, table, text
+from sqlalchemy.dialects.mysql import match
+from app.models.deck import Deck
+from app.models.flashcard import Flashcard
+from app.exceptions import ValidationError
+
+# Terms beyond this are ignored, bounding the cost of a query
+MAX_TERMS = 8
+MAX_PER_PAGE = 100
+
+
+class SearchService:
+    """Service class for flashcard search"""
+
+    @staticmethod
+    def parse_terms(query: str) -> List[str]:
+        """
+        Splits a search query into lowercase word terms
+
+        Args:
+            query: The raw search query
+
+        Returns:
+            List of terms
+
+        Raises:
+            ValidationError: If the query contains no words
+        """
+        terms = re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+        if not terms:
+            raise ValidationError('Search query must contain at least one word')
+        return terms
+
+    @staticmethod
+    def search_flashcards(user_id: str, query: str, page: int = 1, per_page: int = 20) -> Dict:
+        """
+        Searches the questions and answers of a user's flashcards
+
+        Every term must match; the last one also matches as a prefix, so
+        partially typed words find results. Results are ordered by relevance.
+
+        Args:
+            user_id: The user ID
+            query: The search query
+            page: The 1-based page number
+            per_page: Results per page (at most 100)
+
+        Returns:
+            Dictionary with the page of results (flashcards with a 'score'),
+            'page', 'per_page' and 'has_next'
+
+        Raises:
+            ValidationError: If the query or the pagination is invalid
+        """
+        from app import db
+
+        terms = SearchService.parse_terms(query)
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            raise ValidationError('page must be >= 1 and per_page between 1 and {}'.format(MAX_PER_PAGE))
+
+        backend = app.extensions.get('search_backend', 'like')
+        if backend == 'sqlite':
+            fts = table('flashcards_fts', column('rowid'))
+            rank = literal_column('bm25(flashcards_fts)')
+            expression = ' '.join('"{}"'.format(term) for term in terms) + '*'
+            search = db.session.query(Flashcard, -rank).select_from(fts).join(
+                Flashcard, literal_column('flashcards.rowid') == fts.c.rowid).filter(
+                text('flashcards_fts MATCH :expression')).order_by(rank).params(expression=expression)
+        elif backend == 'mysql':
+            expression = ' '.join('+{}'.format(term) for term in terms) + '*'
+            score = match(Flashcard.question, Flashcard.answer, against=expression).in_boolean_mode()
+            search = db.session.query(Flashcard, score).filter(score > 0).order_by(score.desc())
+        else:
+            # No inverted index: scan, ranking question matches first
+            conditions = [or_(Flashcard.question.ilike('%{}%'.format(term)),
+                              Flashcard.answer.ilike('%{}%'.format(term))) for term in terms]
+            score = case((and_(*[Flashcard.question.ilike('%{}%'.format(term)) for term in terms]), 2),
+                         else_=1)
+            search = db.session.query(Flashcard, score).filter(*conditions).order_by(
+                score.desc(), Flashcard.created_at.desc())
+
+        # One extra row tells whether there is a next page without a COUNT
+        rows = search.join(Deck, Deck.id == Flashcard.deck_id).filter(
+            Deck.user_id == user_id).limit(per_page + 1).offset((page - 1) * per_page).all()
+
+        results = []
+        for flashcard, score in rows[:per_page]:
+            result = flashcard.to_dict()
+            result['score'] = round(float(score), 4)
+            results.append(result)
+
+        return {
+            'results': results,
+            'page': page,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page
+        }
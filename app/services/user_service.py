@@ -2,9 +2,18 @@
 """ User Service Module
 Handles business logic for user operations
 """
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
+from app.cache import TTLCache
 from app.models.user import User
 from app.exceptions import ValidationError
-from werkzeug.security import generate_password_hash
+from app.passwords import hash_password, needs_rehash
+
+# User column values keyed by user ID, sized from Config in create_app
+user_cache = TTLCache()
 
 class UserService:
     """Service class for user-related operations"""
@@ -33,7 +42,7 @@ class UserService:
             raise ValidationError("Password cannot be empty")
         
         # Hash password (business logic in service layer)
-        password_hash = generate_password_hash(password)
+        password_hash = hash_password(password)
         
         # Create user
         user = User(
@@ -65,5 +74,93 @@ class UserService:
         if not user or not user.check_password(password):
             raise ValidationError("Invalid email or password")
         
+        # Upgrade hashes made with outdated parameters while we know the password
+        if needs_rehash(user.password_hash):
+            user.set_password(password)
+            user.save()
+        
         return user
-        
\ No newline at end of file
+
+    @staticmethod
+    def get_user_by_id(user_id: str) -> Optional[User]:
+        """
+        Retrieves a user by primary key
+        
+        Args:
+            user_id: The user ID
+            
+        Returns:
+            User object or None if not found
+        """
+        return db.session.get(User, user_id)
+
+    @staticmethod
+    def _get_cached_columns(user_id: str) -> Optional[Dict]:
+        """
+        Gets the column values of a user, served from the user cache when possible
+        
+        Args:
+            user_id: The user ID
+            
+        Returns:
+            Dictionary mapping column names to values, or None if not found
+        """
+        columns = user_cache.get(user_id)
+        if columns is None:
+            user = UserService.get_user_by_id(user_id)
+            if not user:
+                return None
+            columns = {column.key: getattr(user, column.key)
+                       for column in User.__table__.columns}
+            user_cache.set(user_id, columns)
+        return columns
+
+    @staticmethod
+    def get_identity(user_id: str) -> Optional[Dict]:
+        """
+        Gets the public data of a user, served from the user cache when possible
+        
+        Args:
+            user_id: The user ID
+            
+        Returns:
+            Dictionary with the user data (without the password hash), or None if not found
+        """
+        columns = UserService._get_cached_columns(user_id)
+        if columns is None:
+            return None
+        return {key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in columns.items() if key != 'password_hash'}
+
+    @staticmethod
+    def load_user(user_id: str) -> Optional[User]:
+        """
+        Loads the logged-in user for Flask-Login
+        
+        The user is rebuilt from the user cache and merged into the current
+        session without emitting SQL, so a cache hit costs no query and a
+        miss costs one primary-key lookup. Flask-Login memoizes the result
+        for the rest of the request.
+        
+        Args:
+            user_id: The user ID stored in the session cookie
+            
+        Returns:
+            User object bound to the current session, or None if not found
+        """
+        columns = UserService._get_cached_columns(user_id)
+        if columns is None:
+            return None
+        
+        user = User.__mapper__.class_manager.new_instance()
+        for key, value in columns.items():
+            setattr(user, key, value)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_cached_user(mapper, connection, target):
+    """Drops a user from the identity cache when it changes"""
+    user_cache.invalidate(target.id)
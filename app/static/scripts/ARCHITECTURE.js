@@ -85,11 +85,9 @@
  *          │
  * 
  * ┌─────────────────────────────────────────────────────────────┐
- * │                    sm2-algorithm.js                          │
- * │              (Spaced Repetition Algorithm)                   │
+ * │                    review-format.js                          │
+ * │                (Review Feedback Helpers)                     │
  * │                                                              │
- * │  • sm2Algorithm()                                            │
- * │  • validateProgress()                                        │
  * │  • getNextReviewDescription()                               │
  * │  • calculateLearningStats()                                 │
  * └─────────────────────────────────────────────────────────────┘
@@ -114,8 +112,7 @@
  * 
  * 4. User rates flashcard
  *    UI Button Click → ReviewSession.handleRating()
- *                   → sm2Algorithm()
- *                   → FlashcardAPI.updateProgress()
+ *                   → FlashcardAPI.reviewFlashcard() (scheduled on the server)
  *                   → FlashcardManager.moveToNext()
  *                   → ReviewSession.showNextFlashcard()
  * 
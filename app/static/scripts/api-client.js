@@ -92,6 +92,34 @@ class FlashcardAPI {
         }
     }
 
+    /**
+     * Record a review of a flashcard; the server schedules the next one
+     * @param {string} flashcardId - The flashcard ID
+     * @param {string} rating - The rating ('again', 'hard', 'good', 'easy')
+     * @returns {Promise<Object>} Updated progress object
+     */
+    static async reviewFlashcard(flashcardId, rating) {
+        try {
+            const response = await $.ajax({
+                url: `${CONFIG.API.BASE_URL}/api/v1/users/me/flashcards/${flashcardId}/review`,
+                type: 'POST',
+                data: JSON.stringify({ rating }),
+                contentType: 'application/json; charset=utf-8',
+                dataType: 'json',
+                headers: {
+                    'X-CSRFToken': this.getCsrfToken()
+                }
+            });
+            if (CONFIG.DEBUG) {
+                console.log('Review recorded successfully:', response);
+            }
+            return response;
+        } catch (error) {
+            console.error(`Failed to record review for flashcard ${flashcardId}:`, error);
+            throw error;
+        }
+    }
+
     /**
      * Delete a flashcard
      * @param {string} flashcardId - The flashcard ID
@@ -7,6 +7,20 @@ $(document).ready(function() {
     $('.logout').on('click', function() {
 	window.location.href = `${API_BASE_URL}/auth/logout`;
     });
+
+    $.get(`${API_BASE_URL}/api/v1/users/me/forecast?days=30`, function(forecast) {
+	const max = Math.max(1, ...forecast.counts);
+	const chart = $('.forecast-chart');
+	forecast.counts.forEach(function(count, day) {
+	    const label = day === 0 ? 'Today (and overdue)' : `In ${day} day(s)`;
+	    $('<div class="forecast-bar"></div>')
+		.css('height', `${Math.round(count / max * 100)}%`)
+		.attr('title', `${label}: ${count}`)
+		.appendTo(chart);
+	});
+	const total = forecast.counts.reduce((sum, count) => sum + count, 0);
+	$('.forecast-summary').text(`${total} reviews due, ${forecast.new} new cards waiting`);
+    });
 });
 
 
@@ -0,0 +1,52 @@
+/**
+ * Review Feedback Helpers
+ * 
+ * Formats the progress returned by the server after a review. Scheduling
+ * itself runs on the server, with each deck's algorithm.
+ */
+
+/**
+ * Get human-readable description of when the next review is due
+ * 
+ * @param {string|Date} next_review_date - The next review date
+ * @returns {string} Human-readable description (e.g., "Due in 3 days")
+ */
+function getNextReviewDescription(next_review_date) {
+    const now = new Date();
+    const nextReview = new Date(next_review_date);
+    const diffMs = nextReview - now;
+    
+    if (diffMs <= 0) {
+        return "Due now";
+    }
+    
+    const diffMinutes = Math.floor(diffMs / (1000 * 60));
+    const diffHours = Math.floor(diffMs / (1000 * 60 * 60));
+    const diffDays = Math.floor(diffMs / (1000 * 60 * 60 * 24));
+    
+    if (diffDays > 0) {
+        return `Due in ${diffDays} day${diffDays > 1 ? 's' : ''}`;
+    } else if (diffHours > 0) {
+        return `Due in ${diffHours} hour${diffHours > 1 ? 's' : ''}`;
+    } else {
+        return `Due in ${diffMinutes} minute${diffMinutes > 1 ? 's' : ''}`;
+    }
+}
+
+/**
+ * Calculate learning statistics from progress data
+ * 
+ * @param {Object} progress - Progress object containing review history
+ * @returns {Object} Learning statistics including accuracy, difficulty, and review count
+ */
+function calculateLearningStats(progress) {
+    const { review_count, correct_count, ease_factor } = progress;
+    const accuracy = review_count > 0 ? (correct_count / review_count * 100).toFixed(1) : 0;
+    const difficulty = ease_factor < 2.0 ? 'Hard' : ease_factor > 2.7 ? 'Easy' : 'Medium';
+    
+    return {
+        accuracy: `${accuracy}%`,
+        difficulty,
+        reviews: review_count
+    };
+}
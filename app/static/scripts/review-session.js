@@ -128,12 +128,8 @@ class ReviewSession {
      */
     async updateProgress(flashcardId, rating) {
         try {
-            // Get current progress
-            const progress = await FlashcardAPI.getProgress(flashcardId);
-            
-            // Validate and apply SM2 algorithm
-            const validatedProgress = validateProgress(progress);
-            const updatedProgress = sm2Algorithm(validatedProgress, rating);
+            // The server schedules the next review with the deck's algorithm
+            const updatedProgress = await FlashcardAPI.reviewFlashcard(flashcardId, rating);
             
             // Display user feedback
             const nextReview = getNextReviewDescription(updatedProgress.next_review_date);
@@ -142,10 +138,6 @@ class ReviewSession {
             if (CONFIG.DEBUG) {
                 console.log(`Progress updated! Next review: ${nextReview}. Stats: ${stats.accuracy} accuracy, ${stats.reviews} reviews`);
             }
-
-            // Save to backend
-            await FlashcardAPI.updateProgress(flashcardId, updatedProgress);
-            
         } catch (error) {
             console.error('Failed to update progress:', error);
             throw error;
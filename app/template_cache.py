@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+"""
+Template Caching
+Jinja bytecode caching, so compiled templates are shared by the workers and
+survive restarts
+"""
+
+import os
+from jinja2 import FileSystemBytecodeCache
+
+
+def register_template_cache(app):
+    """
+    Enable template bytecode caching when TEMPLATE_BYTECODE_CACHE is set
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('TEMPLATE_BYTECODE_CACHE', True):
+        return
+
+    directory = app.config.get('TEMPLATE_BYTECODE_CACHE_DIR')
+    if directory:
+        # Jinja writes into the directory but does not create it
+        os.makedirs(directory, exist_ok=True)
+    # Without a directory, Jinja picks one under the system temp dir
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
@@ -13,6 +13,7 @@ from app.models.progress import Progress
 from app.services.flashcard_service import FlashcardService
 from app.services.deck_service import DeckService
 from flask_login import login_required, current_user
+from app.exceptions import ConflictError
 from datetime import datetime
 
 bp = Blueprint('flashcards', __name__)
@@ -29,8 +30,7 @@ def new_flashcard():
     """
     from app.forms.new_flashcard_form import NewFlashcardForm
     form = NewFlashcardForm()
-    decks_list = DeckService.get_decks_by_user(current_user.id)
-    form.deck.choices = [(deck.id, deck.name) for deck in decks_list]
+    form.deck.choices = DeckService.get_deck_choices(current_user.id)
     form.deck.choices.append(('new', 'Add new Deck'))
 
     if form.validate_on_submit():
@@ -58,6 +58,8 @@ def new_flashcard():
             flash('New flashcard added successfully!')
         except ValueError as e:
             flash(str(e))
+        except ConflictError as e:
+            flash(e.message)
         
         return redirect(url_for('flashcards.new_flashcard'))
 
@@ -79,8 +81,7 @@ def edit_flashcard(flashcard_id):
     """
     from app.forms.edit_flashcard_form import EditFlashcardForm
     form = EditFlashcardForm()
-    decks_list = DeckService.get_decks_by_user(current_user.id)
-    form.deck.choices = [(deck.id, deck.name) for deck in decks_list]
+    form.deck.choices = DeckService.get_deck_choices(current_user.id)
     form.deck.choices.append(('new', 'Add new Deck'))
 
     flashcard = FlashcardService.get_flashcard_by_id(flashcard_id)
@@ -123,6 +124,8 @@ def edit_flashcard(flashcard_id):
             flash('Flashcard updated successfully!')
         except ValueError as e:
             flash(str(e))
+        except ConflictError as e:
+            flash(e.message)
         
         return redirect(url_for('decks.decks'))
 
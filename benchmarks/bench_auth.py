@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Authentication throughput benchmark
+
+Measures password verifications (the CPU-bound part of a login) per second
+for several hash methods, single-threaded and through the bounded hashing
+pool, and reports logins/sec per core.
+
+Usage:
+    python benchmarks/bench_auth.py [--methods scrypt:32768:8:1 pbkdf2:sha256:600000]
+                                    [--seconds 3] [--threads 8]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from werkzeug.security import generate_password_hash, check_password_hash  # noqa: E402
+from app import passwords  # noqa: E402
+
+DEFAULT_METHODS = [
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:260000',
+]
+
+
+def _measure(func, seconds):
+    """Calls func repeatedly for about `seconds` and returns calls per second"""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        func()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def bench_method(method, seconds, threads):
+    """
+    Benchmarks password verification for one hash method
+
+    Args:
+        method: The werkzeug hash method string
+        seconds: Time budget per measurement
+        threads: Number of concurrent login threads for the pooled run
+
+    Returns:
+        dict: Sequential and pooled verifications per second
+    """
+    password = 'correct horse battery staple'
+    password_hash = generate_password_hash(password, method=method)
+
+    sequential = _measure(lambda: check_password_hash(password_hash, password), seconds)
+
+    def login_loop(_):
+        calls = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            passwords.verify_password(password_hash, password)
+            calls += 1
+        return calls
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as clients:
+        total = sum(clients.map(login_loop, range(threads)))
+    pooled = total / (time.perf_counter() - start)
+
+    workers = passwords.DEFAULTS['PASSWORD_HASH_WORKERS']
+    return {
+        'method': method,
+        'sequential_logins_per_sec': round(sequential, 1),
+        'pooled_logins_per_sec': round(pooled, 1),
+        'pool_workers': workers,
+        'pooled_logins_per_sec_per_core': round(pooled / min(workers, os.cpu_count() or 1), 1),
+        'ms_per_login': round(1000 / sequential, 2),
+    }
+
+
+def main():
+    """ Runs the benchmark and prints a JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    # Never reject benchmark logins because the pool queue is full
+    passwords.DEFAULTS['PASSWORD_HASH_QUEUE_SIZE'] = args.threads
+
+    results = [bench_method(method, args.seconds, args.threads) for method in args.methods]
+    print(json.dumps({'cpu_count': os.cpu_count(), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
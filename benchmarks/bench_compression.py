@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Response compression benchmark
+
+Seeds one large deck and reports, for the flashcard and progress list
+endpoints, the bytes on the wire and the request latency without
+compression, with gzip and with brotli (when installed), followed by the
+CPU cost and ratio of each gzip level / brotli quality on the same payloads.
+
+Usage:
+    python benchmarks/bench_compression.py [--cards 5000] [--requests 50] [--output compression.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from seed import BENCHMARK_PASSWORD, seed  # noqa: E402
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+
+def time_requests(client, path, encoding, count):
+    """ Returns the response size in bytes and the mean latency in ms """
+    headers = {'Accept-Encoding': encoding}
+    size = len(client.get(path, headers=headers).get_data())
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(path, headers=headers)
+    return size, (time.perf_counter() - start) / count * 1000
+
+
+def time_compression(data, encoding, config, count):
+    """ Returns the compressed size in bytes and the mean CPU time in ms """
+    from app.compression import compress
+    size = len(compress(data, encoding, config))
+    start = time.process_time()
+    for _ in range(count):
+        compress(data, encoding, config)
+    return size, (time.process_time() - start) / count * 1000
+
+
+def main():
+    """ Runs the benchmark and prints a JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=5000, help='Flashcards in the benchmarked deck.')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per endpoint and encoding.')
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+        os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+        from app import create_app, db
+        from app.compression import brotli
+        from app.models.flashcard import Flashcard
+
+        app = create_app()
+        app.config['WTF_CSRF_ENABLED'] = False
+        with app.app_context():
+            seed(users=1, decks_per_user=1, cards_per_deck=args.cards, reviewed_fraction=1.0)
+            deck_id = db.session.query(Flashcard.deck_id).first()[0]
+
+        client = app.test_client()
+        client.post('/auth/login', data={'username': 'user0', 'password': BENCHMARK_PASSWORD})
+
+        encodings = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+        paths = {
+            'flashcards': '/api/v1/users/me/decks/{}/flashcards'.format(deck_id),
+            'progress': '/api/v1/users/me/decks/{}/flashcards/progress'.format(deck_id),
+        }
+
+        report = {'cards': args.cards, 'brotli_available': brotli is not None,
+                  'endpoints': {}, 'levels': {}}
+        for name, path in paths.items():
+            results = {}
+            for encoding in encodings:
+                size, latency = time_requests(client, path, encoding, args.requests)
+                results[encoding] = {'bytes': size, 'latency_ms': round(latency, 3)}
+            identity = results['identity']['bytes']
+            for result in results.values():
+                result['ratio'] = round(identity / result['bytes'], 2)
+            report['endpoints'][name] = results
+
+            data = client.get(path, headers={'Accept-Encoding': 'identity'}).get_data()
+            levels = {}
+            for level in GZIP_LEVELS:
+                size, cpu = time_compression(data, 'gzip', dict(app.config, COMPRESSION_LEVEL=level),
+                                             args.requests)
+                levels['gzip-{}'.format(level)] = {'bytes': size, 'ratio': round(len(data) / size, 2),
+                                                   'cpu_ms': round(cpu, 3)}
+            if brotli is not None:
+                for quality in BROTLI_QUALITIES:
+                    size, cpu = time_compression(
+                        data, 'br', dict(app.config, COMPRESSION_BROTLI_QUALITY=quality), args.requests)
+                    levels['br-{}'.format(quality)] = {'bytes': size, 'ratio': round(len(data) / size, 2),
+                                                       'cpu_ms': round(cpu, 3)}
+            report['levels'][name] = levels
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Request metrics overhead benchmark
+
+Serves the same endpoint through two apps, one with the metrics hooks
+and one without, and checks that the per-request overhead stays under a
+fixed budget. Exits with status 1 when the budget is exceeded.
+
+Usage:
+    python benchmarks/bench_metrics.py [--requests 5000] [--rounds 5] [--budget-us 100]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def build_app(metrics_enabled, database_url):
+    """ Creates an application with the metrics hooks turned on or off """
+    os.environ['METRICS_ENABLED'] = 'true' if metrics_enabled else 'false'
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+    from app import create_app
+    return create_app()
+
+
+def time_requests(client, path, count):
+    """ Returns the mean latency in microseconds of `count` GET requests """
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(path)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    """ Runs the benchmark and prints a JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--budget-us', type=float, default=100.0)
+    parser.add_argument('--path', default='/api/v1/status')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+        baseline_client = build_app(False, database_url).test_client()
+        metrics_client = build_app(True, database_url).test_client()
+
+        # Warm up both apps before measuring
+        time_requests(baseline_client, args.path, 200)
+        time_requests(metrics_client, args.path, 200)
+
+        baseline, instrumented = [], []
+        for _ in range(args.rounds):
+            baseline.append(time_requests(baseline_client, args.path, args.requests))
+            instrumented.append(time_requests(metrics_client, args.path, args.requests))
+
+    from app.metrics import metrics
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        metrics.request_started('bench')
+        metrics.observe('bench', 'bench.endpoint', 'GET', 200, 0.001)
+        metrics.request_finished('bench')
+    registry_us = (time.perf_counter() - start) / args.requests * 1e6
+
+    overhead_us = statistics.median(instrumented) - statistics.median(baseline)
+    report = {
+        'path': args.path,
+        'requests_per_round': args.requests,
+        'baseline_us_per_request': round(statistics.median(baseline), 2),
+        'metrics_us_per_request': round(statistics.median(instrumented), 2),
+        'overhead_us_per_request': round(overhead_us, 2),
+        'registry_us_per_request': round(registry_us, 2),
+        'budget_us': args.budget_us,
+        'within_budget': overhead_us <= args.budget_us,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report['within_budget'] else 1)
+
+
+if __name__ == '__main__':
+    main()
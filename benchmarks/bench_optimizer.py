@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Scheduler optimizer benchmark
+
+Generates synthetic review logs (millions of events, each user with a known
+memory scale k) and reports the runtime of the vectorized parameter fit,
+in one process and fanned out over a process pool the way
+`flask jobs optimize` partitions users, plus how well the known k values
+are recovered.
+
+Usage:
+    python benchmarks/bench_optimizer.py [--events 1000000 5000000] [--users 20000]
+                                         [--workers 4] [--output optimizer.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+REVIEWS_PER_CARD = 8
+
+
+def generate(events, users, seed=0):
+    """
+    Builds review log columns ordered by card, then review time
+
+    Returns:
+        Tuple of (columns dict, true k per user)
+    """
+    rng = np.random.default_rng(seed)
+    true_k = np.exp(rng.normal(0, 0.4, users))
+    cards = events // REVIEWS_PER_CARD
+    card_user = rng.integers(0, users, cards)
+
+    review_count = np.tile(np.arange(1, REVIEWS_PER_CARD + 1), cards)
+    scheduled = np.array([1, 6] + [6 * 2.5 ** n for n in range(1, REVIEWS_PER_CARD - 1)])
+    interval = np.minimum(np.tile(scheduled, cards), 365)
+    user_index = np.repeat(card_user, REVIEWS_PER_CARD)
+    card_index = np.repeat(np.arange(cards), REVIEWS_PER_CARD)
+
+    previous = np.roll(interval, 1)
+    elapsed = previous * rng.lognormal(0, 0.3, len(interval))
+    recall = 0.9 ** (elapsed / (true_k[user_index] * previous))
+    correct = rng.random(len(interval)) < recall
+    elapsed[review_count == 1] = np.nan
+
+    return {
+        'user_index': user_index,
+        'card_index': card_index,
+        'review_count': review_count,
+        'interval': interval,
+        'elapsed_days': elapsed,
+        'correct': correct,
+    }, true_k
+
+
+def fit_chunk(columns, users):
+    """ Fits one partition; the pool's unit of work """
+    from app.jobs.optimizer import fit_parameters
+    return fit_parameters(users=users, **columns)
+
+
+def split(columns, users, parts):
+    """ Splits the columns into contiguous user ranges with local user indexes """
+    bounds = np.linspace(0, users, parts + 1).astype(int)
+    chunks = []
+    for low, high in zip(bounds[:-1], bounds[1:]):
+        mask = (columns['user_index'] >= low) & (columns['user_index'] < high)
+        chunk = {key: value[mask] for key, value in columns.items()}
+        chunk['user_index'] = chunk['user_index'] - low
+        chunks.append((chunk, high - low, low))
+    return chunks
+
+
+def main():
+    """ Runs the benchmark and prints a JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, nargs='+', default=[1000000, 5000000],
+                        help='Review events per run.')
+    parser.add_argument('--users', type=int, default=20000, help='Users per run.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes of the pooled run.')
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file.')
+    args = parser.parse_args()
+
+    from app.jobs.optimizer import fit_parameters
+    from app.services.progress_service import DEFAULT_PARAMETERS
+
+    report = []
+    for events in args.events:
+        columns, true_k = generate(events, args.users)
+
+        start = time.perf_counter()
+        fitted = fit_parameters(users=args.users, **columns)
+        single = time.perf_counter() - start
+
+        chunks = split(columns, args.users, args.workers * 4)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+            # Warm the workers up so the timing excludes interpreter start-up
+            list(executor.map(fit_chunk, [chunks[0][0]] * args.workers, [chunks[0][1]] * args.workers))
+            start = time.perf_counter()
+            list(executor.map(fit_chunk, [chunk for chunk, _, _ in chunks],
+                              [users for _, users, _ in chunks]))
+            pooled = time.perf_counter() - start
+
+        # The interval modifier estimates k of the mature reviews
+        estimated = np.array([parameters['interval_modifier'] / DEFAULT_PARAMETERS['interval_modifier']
+                              for parameters in fitted.values()])
+        errors = np.abs(np.log(estimated) - np.log(true_k[list(fitted)]))
+        report.append({
+            'events': events,
+            'users': args.users,
+            'fitted_users': len(fitted),
+            'single_process_seconds': round(single, 3),
+            'pooled_seconds': round(pooled, 3),
+            'workers': args.workers,
+            'events_per_second': round(events / pooled),
+            'median_log_k_error': round(float(np.median(errors)), 4) if len(errors) else None,
+        })
+        print(json.dumps(report[-1]), file=sys.stderr)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Scheduler throughput benchmark
+
+Reports, for every registered scheduling algorithm, how many cards per
+second it schedules one call at a time (`schedule`) and in batches
+(`schedule_many`), on synthetic cards in a realistic mix of new, learning
+and mature states. No database is involved.
+
+Usage:
+    python benchmarks/bench_schedulers.py [--cards 1000 100000] [--rounds 3] [--output schedulers.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+Card = namedtuple('Card', ['review_count', 'correct_count', 'ease_factor', 'interval',
+                           'last_review_date', 'stability', 'difficulty'])
+
+RATING_WEIGHTS = {'again': 0.1, 'hard': 0.15, 'good': 0.6, 'easy': 0.15}
+
+
+def generate(count, now, seed=0):
+    """ Returns `count` cards and a rating for each """
+    rng = random.Random(seed)
+    cards = []
+    for _ in range(count):
+        review_count = rng.choice((0, 0, 1, 2, 3, 5, 8, 13))
+        interval = rng.choice((1, 6, 15, 40, 100)) if review_count else 1
+        fsrs_state = review_count and rng.random() < 0.5
+        cards.append(Card(
+            review_count=review_count,
+            correct_count=int(review_count * 0.8),
+            ease_factor=rng.uniform(1.3, 2.5),
+            interval=interval,
+            last_review_date=now - timedelta(days=interval * rng.uniform(0.5, 1.5)) if review_count else None,
+            stability=interval * rng.uniform(0.5, 2) if fsrs_state else None,
+            difficulty=rng.uniform(1, 10) if fsrs_state else None,
+        ))
+    ratings = rng.choices(list(RATING_WEIGHTS), weights=list(RATING_WEIGHTS.values()), k=count)
+    return cards, ratings
+
+
+def best_of(rounds, func):
+    """ Returns the fastest of `rounds` timings of func, in seconds """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """ Runs the benchmark and prints a JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, nargs='+', default=[1000, 100000],
+                        help='Cards scheduled per run.')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per measurement (best is kept).')
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file.')
+    args = parser.parse_args()
+
+    from app.schedulers import SCHEDULERS
+
+    now = datetime.utcnow()
+    report = []
+    for count in args.cards:
+        cards, ratings = generate(count, now)
+        for name, scheduler in sorted(SCHEDULERS.items()):
+            single = best_of(args.rounds, lambda: [scheduler.schedule(card, rating, now)
+                                                   for card, rating in zip(cards, ratings)])
+            batch = best_of(args.rounds, lambda: scheduler.schedule_many(cards, ratings, now))
+            report.append({
+                'scheduler': name,
+                'cards': count,
+                'schedule_per_second': round(count / single),
+                'schedule_many_per_second': round(count / batch),
+                'speedup': round(single / batch, 2),
+            })
+            print(json.dumps(report[-1]), file=sys.stderr)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
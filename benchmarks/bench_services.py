@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+Service layer micro-benchmarks
+
+Times the storage, model and service hot paths at several data scales and
+prints a pytest-benchmark-style table (min/median/mean/max/ops per
+benchmark), optionally saved as JSON for comparison between commits.
+
+Each scale is seeded into emptied tables of a temporary SQLite database, or
+of --database-url when given (its tables are dropped). The scale is the
+approximate number of flashcards (and progress rows).
+
+Usage:
+    python benchmarks/bench_services.py [--scales 1000 100000 1000000] [--max-time 2] [--output services.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from seed import BENCHMARK_PASSWORD, seed  # noqa: E402
+from load_test import git_commit  # noqa: E402
+
+DECKS_PER_USER = 5
+CARDS_PER_DECK = 100
+
+
+def bench(func, setup=None, max_time=2.0, min_rounds=3, max_rounds=1000):
+    """
+    Calls func repeatedly until the time budget is spent and returns timing stats
+
+    Args:
+        func (callable): The code under test; receives setup's return value if any.
+        setup (callable): Untimed preparation run before every round (optional).
+        max_time (float): Time budget in seconds.
+        min_rounds (int): Rounds run even when over budget.
+        max_rounds (int): Upper bound on rounds.
+
+    Returns:
+        dict: Timings in milliseconds and operations per second
+    """
+    from app import db
+
+    timings = []
+    deadline = time.perf_counter() + max_time
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() < deadline):
+        # Start each round from an empty identity map, like a new request
+        db.session.remove()
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        func(argument) if setup else func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'rounds': len(timings),
+        'min_ms': round(min(timings), 4),
+        'max_ms': round(max(timings), 4),
+        'mean_ms': round(statistics.mean(timings), 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'stddev_ms': round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        'ops': round(1000 / statistics.mean(timings), 2),
+    }
+
+
+def run_scale(app, scale, max_time):
+    """ Seeds one scale and runs every benchmark against it """
+    from app import db
+    from app.models.deck import Deck
+    from app.models.flashcard import Flashcard
+    from app.models.progress import Progress
+    from app.services.deck_service import DeckService
+    from app.services.flashcard_service import FlashcardService
+    from app.services.progress_service import ProgressService
+    from app.services.search_service import SearchService
+    from app.services.user_service import UserService
+
+    users = max(1, scale // (DECKS_PER_USER * CARDS_PER_DECK))
+    with app.app_context():
+        rows = seed(users=users, decks_per_user=DECKS_PER_USER, cards_per_deck=CARDS_PER_DECK)
+        deck_id = db.session.query(Deck.id).first()[0]
+        flashcard_id = db.session.query(Flashcard.id).order_by(Flashcard.id.desc()).first()[0]
+        user_id = db.session.query(Deck.user_id).filter(Deck.id == deck_id).scalar()
+
+        def new_deck():
+            deck = DeckService.create_deck('bench-{}'.format(time.perf_counter_ns()), user_id)
+            for index in range(CARDS_PER_DECK):
+                FlashcardService.create_flashcard('q{}'.format(index), 'a{}'.format(index), deck.id)
+            return deck.id
+
+        def loaded_flashcard():
+            return db.session.get(Flashcard, flashcard_id)
+
+        def progress():
+            return Progress(review_count=4, correct_count=3, ease_factor=2.3, interval=12)
+
+        benchmarks = {
+            'DBStorage.get': lambda: app.storage.get(Flashcard, flashcard_id),
+            'DBStorage.all': lambda: app.storage.all(Flashcard),
+            'BaseModel.to_dict': (lambda flashcard: flashcard.to_dict(), loaded_flashcard),
+            'ProgressService.calculate_next_review':
+                (lambda record: ProgressService.calculate_next_review(record, 'good'), progress),
+            'FlashcardService.get_statistics': lambda: FlashcardService.get_statistics(deck_id),
+            'DeckService.delete_deck': (DeckService.delete_deck, new_deck),
+            # Every seeded card contains 'question' and 'deck' (worst case); about 1% contain '42'
+        'SearchService.search_flashcards[common]':
+            lambda: SearchService.search_flashcards(user_id, 'question deck'),
+        'SearchService.search_flashcards[selective]':
+            lambda: SearchService.search_flashcards(user_id, '42'),
+        'UserService.authenticate_user':
+                lambda: UserService.authenticate_user('user0@bench.local', BENCHMARK_PASSWORD),
+        }
+
+        results = {}
+        for name, target in benchmarks.items():
+            func, setup = target if isinstance(target, tuple) else (target, None)
+            results[name] = bench(func, setup, max_time=max_time)
+            print('{:<42}{:>8} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.4f} {:>10.2f}'.format(
+                name, scale, results[name]['min_ms'], results[name]['median_ms'],
+                results[name]['mean_ms'], results[name]['max_ms'], results[name]['ops']), flush=True)
+        db.session.remove()
+    return {'rows': rows, 'benchmarks': results}
+
+
+def main():
+    """ Runs the micro-benchmarks at every requested scale """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--max-time', type=float, default=2.0,
+                        help='Time budget per benchmark in seconds (at least 3 rounds run).')
+    parser.add_argument('--database-url', default=None,
+                        help='Scratch database to seed; its tables are dropped (defaults to a temporary SQLite file).')
+    parser.add_argument('--output', default=None, help='Write the JSON results to this file.')
+    args = parser.parse_args()
+
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+    from app import create_app, db
+    from app.search import setup_search_index
+
+    print('{:<42}{:>8} {:>12} {:>12} {:>12} {:>12} {:>10}'.format(
+        'benchmark', 'scale', 'min (ms)', 'median (ms)', 'mean (ms)', 'max (ms)', 'ops/s'))
+
+    report = {'meta': {'commit': git_commit(), 'created_at': datetime.utcnow().isoformat()},
+              'scales': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = args.database_url or 'sqlite:///' + os.path.join(tmp, 'bench.db')
+        app = create_app()
+        for scale in args.scales:
+            # Every scale starts from empty tables
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                setup_search_index(db.engine)
+            report['scales'][str(scale)] = run_scale(app, scale, args.max_time)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Benchmark report comparison
+
+Diffs two JSON reports from benchmarks/load_test.py and exits with status 1
+when any scenario's p95 latency regressed by more than the threshold.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps')
+
+
+def change(before, after):
+    """ Returns the relative change in percent """
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    """ Prints a comparison table and flags p95 regressions """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed p95 latency increase in percent.')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.candidate) as candidate_file:
+        candidate = json.load(candidate_file)
+
+    print('{} -> {}'.format(baseline['meta'].get('commit'), candidate['meta'].get('commit')))
+    print('{:<14}'.format('scenario') + ''.join('{:>26}'.format(metric) for metric in METRICS))
+
+    regressions = []
+    for scenario, after in candidate['results'].items():
+        before = baseline['results'].get(scenario)
+        if before is None:
+            continue
+        cells = ['{:>9.2f} -> {:>9.2f} {:>+5.0f}%'.format(before[metric], after[metric],
+                                                        change(before[metric], after[metric]))
+                 for metric in METRICS]
+        print('{:<14}'.format(scenario) + ''.join('{:>26}'.format(cell) for cell in cells))
+        if change(before['p95_ms'], after['p95_ms']) > args.threshold:
+            regressions.append(scenario)
+
+    if regressions:
+        print('p95 regressions over {}%: {}'.format(args.threshold, ', '.join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
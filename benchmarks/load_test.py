@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+"""
+API load test
+
+Seeds a database, then measures latency percentiles and throughput of the
+main API endpoints, either in-process through the Flask test client or over
+HTTP against a running server. Writes a JSON report that
+benchmarks/compare.py can diff between commits.
+
+Usage:
+    python benchmarks/load_test.py --users 20 --cards-per-deck 200 --requests 500 --output report.json
+    python benchmarks/load_test.py --base-url http://127.0.0.1:5000 --threads 8 --no-seed
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from seed import BENCHMARK_PASSWORD, add_seed_arguments, seed  # noqa: E402
+
+SCENARIOS = ('decks', 'flashcards', 'progress', 'progress_put', 'login')
+CSRF_PATTERN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+class TestClientSession:
+    """ Issues requests through the Flask test client """
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, form=None):
+        """ Returns the status code and body of a request """
+        response = self.client.open(path, method=method, json=json_body, data=form)
+        return response.status_code, response.get_data()
+
+    def login(self, username):
+        """ Opens a Flask-Login session for a user """
+        return self.request('POST', '/auth/login',
+                            form={'username': username, 'password': BENCHMARK_PASSWORD})
+
+
+class HTTPSession:
+    """ Issues requests to a running server, keeping the session cookie """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.csrf_token = None
+
+    def request(self, method, path, json_body=None, form=None):
+        """ Returns the status code and body of a request """
+        headers = {}
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.csrf_token:
+            headers['X-CSRFToken'] = self.csrf_token
+
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(req) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+    def login(self, username):
+        """ Opens a Flask-Login session for a user, passing the login form's CSRF token """
+        _, page = self.request('GET', '/auth/login')
+        match = CSRF_PATTERN.search(page.decode())
+        form = {'username': username, 'password': BENCHMARK_PASSWORD}
+        if match:
+            self.csrf_token = match.group(1)
+            form['csrf_token'] = self.csrf_token
+        return self.request('POST', '/auth/login', form=form)
+
+
+class Worker:
+    """ A logged-in client with the decks and flashcards it exercises """
+
+    def __init__(self, session, user_index, rng):
+        self.session = session
+        self.user_index = user_index
+        self.rng = rng
+        session.login('user{}'.format(user_index))
+
+        _, body = session.request('GET', '/api/v1/users/me/decks')
+        self.deck_ids = [deck['id'] for deck in json.loads(body)]
+        self.flashcard_ids = []
+        for deck_id in self.deck_ids[:3]:
+            _, body = session.request('GET', '/api/v1/users/me/decks/{}/flashcards'.format(deck_id))
+            self.flashcard_ids.extend(card['id'] for card in json.loads(body))
+
+    def next_request(self, scenario):
+        """ Returns (method, path, json_body) for one request of a scenario """
+        if scenario == 'decks':
+            return 'GET', '/api/v1/users/me/decks', None
+        if scenario == 'flashcards':
+            return 'GET', '/api/v1/users/me/decks/{}/flashcards'.format(self.rng.choice(self.deck_ids)), None
+        if scenario == 'progress':
+            return ('GET', '/api/v1/users/me/decks/{}/flashcards/progress'.format(
+                self.rng.choice(self.deck_ids)), None)
+        if scenario == 'progress_put':
+            now = datetime.utcnow()
+            interval = self.rng.randint(1, 30)
+            return ('PUT', '/api/v1/users/me/flashcards/{}/progress'.format(self.rng.choice(self.flashcard_ids)), {
+                'review_count': self.rng.randint(1, 20),
+                'correct_count': self.rng.randint(0, 10),
+                'ease_factor': round(self.rng.uniform(1.3, 2.5), 2),
+                'interval': interval,
+                'last_review_date': now.isoformat(),
+                'next_review_date': (now + timedelta(days=interval)).isoformat(),
+                'difficulty_rating': self.rng.choice(['again', 'hard', 'good', 'easy'])
+            })
+        if scenario == 'login':
+            return 'POST', '/api/v1/login', {'email': 'user{}@bench.local'.format(self.user_index),
+                                             'password': BENCHMARK_PASSWORD}
+        raise ValueError('Unknown scenario {}'.format(scenario))
+
+
+def percentile(sorted_values, fraction):
+    """ Returns the nearest-rank percentile of an ascending list """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(workers, scenario, requests):
+    """
+    Sends `requests` requests of a scenario spread over the workers' threads
+
+    Returns:
+        dict: Request/error counts, latency percentiles (ms) and throughput
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    per_worker = max(1, requests // len(workers))
+
+    def drive(worker):
+        local_latencies = []
+        local_errors = 0
+        for _ in range(per_worker):
+            method, path, body = worker.next_request(scenario)
+            start = time.perf_counter()
+            status, _ = worker.session.request(method, path, json_body=body)
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        list(executor.map(drive, workers))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p90_ms': round(percentile(latencies, 0.90), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(latencies[-1], 3),
+    }
+
+
+def git_commit():
+    """ Returns the current git commit, or None outside a checkout """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """ Runs the load test and writes the JSON report """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_seed_arguments(parser)
+    parser.add_argument('--database-url', default=None,
+                        help='Database to seed and test (defaults to a temporary SQLite file).')
+    parser.add_argument('--no-seed', action='store_true', help='Reuse data from benchmarks/seed.py.')
+    parser.add_argument('--base-url', default=None,
+                        help='Drive a running server over HTTP instead of the test client.')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per scenario.')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file.')
+    args = parser.parse_args()
+
+    counts = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.base_url:
+            sessions = [HTTPSession(args.base_url) for _ in range(args.threads)]
+        else:
+            os.environ['DATABASE_URL'] = args.database_url or 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+            from app import create_app
+            app = create_app()
+            app.config['WTF_CSRF_ENABLED'] = False
+            if not args.no_seed:
+                with app.app_context():
+                    counts = seed(args.users, args.decks_per_user, args.cards_per_deck,
+                                  args.reviewed_fraction, args.due_fraction, args.seed)
+            sessions = [TestClientSession(app) for _ in range(args.threads)]
+
+        workers = [Worker(session, index % args.users, random.Random(args.seed + index))
+                   for index, session in enumerate(sessions)]
+        results = {scenario: run_scenario(workers, scenario, args.requests)
+                   for scenario in args.scenarios}
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'mode': 'http' if args.base_url else 'test_client',
+            'threads': args.threads,
+            'requests_per_scenario': args.requests,
+            'seed_options': {'users': args.users, 'decks_per_user': args.decks_per_user,
+                             'cards_per_deck': args.cards_per_deck,
+                             'reviewed_fraction': args.reviewed_fraction,
+                             'due_fraction': args.due_fraction, 'seed': args.seed},
+            'rows': counts,
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
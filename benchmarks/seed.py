@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Benchmark data seeding
+
+Fills the configured database with synthetic users, decks, flashcards and
+progress rows using bulk inserts. Every seeded user has the password
+BENCHMARK_PASSWORD and the email user<N>@bench.local.
+
+Usage:
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/seed.py --users 100 --decks-per-user 5 --cards-per-deck 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+BATCH_SIZE = 5000
+
+
+def add_seed_arguments(parser):
+    """ Adds the data distribution options shared by the benchmark scripts """
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--decks-per-user', type=int, default=5,
+                        help='Mean number of decks per user.')
+    parser.add_argument('--cards-per-deck', type=int, default=100,
+                        help='Mean number of flashcards per deck.')
+    parser.add_argument('--reviewed-fraction', type=float, default=0.7,
+                        help='Share of flashcards that have been reviewed at least once.')
+    parser.add_argument('--due-fraction', type=float, default=0.3,
+                        help='Share of reviewed flashcards that are due now.')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed.')
+
+
+def _around(rng, mean):
+    """ Returns a count uniformly spread between half and one and a half times the mean """
+    return rng.randint(max(1, mean // 2), max(1, mean * 3 // 2))
+
+
+def _insert(db, table, rows):
+    """ Inserts rows in batches and empties the list """
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+    rows.clear()
+
+
+def seed(users=20, decks_per_user=5, cards_per_deck=100, reviewed_fraction=0.7,
+         due_fraction=0.3, seed=42):
+    """
+    Seeds the database of the current application context.
+
+    Args:
+        users (int): Number of users.
+        decks_per_user (int): Mean number of decks per user.
+        cards_per_deck (int): Mean number of flashcards per deck.
+        reviewed_fraction (float): Share of flashcards reviewed at least once.
+        due_fraction (float): Share of reviewed flashcards due now.
+        seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+        dict: Row counts per table.
+    """
+    from app import db
+    from app.models.user import User
+    from app.models.deck import Deck
+    from app.models.flashcard import Flashcard
+    from app.models.progress import Progress
+    from app.passwords import hash_password
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = hash_password(BENCHMARK_PASSWORD)
+    counts = {'users': 0, 'decks': 0, 'flashcards': 0, 'progress': 0}
+    user_rows, deck_rows, card_rows, progress_rows = [], [], [], []
+
+    def row(**values):
+        return dict(values, id=str(uuid.uuid4()), created_at=now, updated_at=now)
+
+    for user_index in range(users):
+        user = row(name='user{}'.format(user_index), email='user{}@bench.local'.format(user_index),
+                   password_hash=password_hash)
+        user_rows.append(user)
+        counts['users'] += 1
+
+        for deck_index in range(_around(rng, decks_per_user)):
+            deck = row(name='Deck {}'.format(deck_index), description=None, user_id=user['id'])
+            deck_rows.append(deck)
+            counts['decks'] += 1
+
+            for card_index in range(_around(rng, cards_per_deck)):
+                question = 'Question {} of deck {}'.format(card_index, deck_index)
+                answer = 'Answer {}'.format(card_index)
+                card = row(question=question, answer=answer, deck_id=deck['id'],
+                           content_hash=Flashcard.compute_content_hash(question, answer))
+                card_rows.append(card)
+
+                if rng.random() < reviewed_fraction:
+                    interval = rng.randint(1, 60)
+                    review_count = rng.randint(1, 20)
+                    last_review = now - timedelta(days=rng.randint(0, interval))
+                    due = rng.random() < due_fraction
+                    next_review = (now - timedelta(hours=rng.randint(1, 72)) if due
+                                   else now + timedelta(days=rng.randint(1, interval)))
+                    progress = row(review_count=review_count,
+                                   correct_count=rng.randint(0, review_count),
+                                   ease_factor=round(rng.uniform(1.3, 2.5), 2), interval=interval,
+                                   last_review_date=last_review, next_review_date=next_review,
+                                   difficulty_rating=rng.choice(['again', 'hard', 'good', 'easy']),
+                                   flashcard_id=card['id'])
+                else:
+                    progress = row(review_count=0, correct_count=0, ease_factor=2.5, interval=1,
+                                   last_review_date=now, next_review_date=now,
+                                   difficulty_rating='Again', flashcard_id=card['id'])
+                progress_rows.append(progress)
+
+        # Flush parents before children to satisfy foreign keys
+        if len(progress_rows) >= BATCH_SIZE or user_index == users - 1:
+            counts['flashcards'] += len(card_rows)
+            counts['progress'] += len(progress_rows)
+            _insert(db, User.__table__, user_rows)
+            _insert(db, Deck.__table__, deck_rows)
+            _insert(db, Flashcard.__table__, card_rows)
+            _insert(db, Progress.__table__, progress_rows)
+            db.session.commit()
+
+    return counts
+
+
+def main():
+    """ Seeds the database named by DATABASE_URL """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-benchmark-secret')
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        counts = seed(args.users, args.decks_per_user, args.cards_per_deck,
+                      args.reviewed_fraction, args.due_fraction, args.seed)
+    print(counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,97 @@
 import os
-import logging
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# setting the config for debuging
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(asctime)s %(levelname)s %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S',
-                    handlers=[
-                        logging.FileHandler("app.log"),  # Log to a file
-                        logging.StreamHandler()  # Also log to the console
-                    ])
-
-
 class Config:
     SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Logging: records are written by a background thread (see app/logging_config.py)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.environ.get('LOG_FILE', 'app.log')
+    # 'size' rotates at LOG_MAX_BYTES, 'time' rotates at LOG_ROTATE_WHEN
+    LOG_ROTATION = os.environ.get('LOG_ROTATION', 'size')
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN', 'midnight')
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    # High-volume messages (repeated 401/404s...) are capped per window
+    LOG_SAMPLE_WINDOW = int(os.environ.get('LOG_SAMPLE_WINDOW', 60))
+    LOG_SAMPLE_LIMIT = int(os.environ.get('LOG_SAMPLE_LIMIT', 10))
+
+    # Password hashing: any werkzeug method string, e.g. 'scrypt:32768:8:1'
+    # or 'pbkdf2:sha256:600000'. Stored hashes using other parameters are
+    # transparently rehashed on the next successful login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    # Size of the thread pool hashes run in and how many may wait for it
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 32))
+
+    # In-process cache of user identities resolved from JWTs
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 30))
+
+    # Review queues: daily study limits per user and the largest queue served
+    NEW_CARDS_PER_DAY = int(os.environ.get('NEW_CARDS_PER_DAY', 20))
+    REVIEWS_PER_DAY = int(os.environ.get('REVIEWS_PER_DAY', 200))
+    REVIEW_QUEUE_SIZE = int(os.environ.get('REVIEW_QUEUE_SIZE', 100))
+
+    # Cache of review forecasts (one entry per user and date range), invalidated on review
+    FORECAST_CACHE_SIZE = int(os.environ.get('FORECAST_CACHE_SIZE', 1024))
+    FORECAST_CACHE_TTL = int(os.environ.get('FORECAST_CACHE_TTL', 300))
+
+    # Days of history kept by `flask review-log purge` (0 keeps everything)
+    REVIEW_LOG_RETENTION_DAYS = int(os.environ.get('REVIEW_LOG_RETENTION_DAYS', 730))
+
+    # Recall probability the intervals fitted by `flask jobs optimize` aim at
+    SCHEDULER_TARGET_RETENTION = float(os.environ.get('SCHEDULER_TARGET_RETENTION', 0.9))
+
+    # Optional asynchronous progress updates: PUTs are queued in a local SQLite
+    # (WAL) file and applied in batches by a writer thread in each web worker
+    # ('thread') or by `flask ingestion run` ('process'). Enqueueing answers
+    # 503 once PROGRESS_QUEUE_MAX_DEPTH updates are waiting. One writer at a time
+    # holds the queue; the next takes over PROGRESS_QUEUE_CLAIM_TIMEOUT seconds
+    # after it stops renewing its lease.
+    PROGRESS_INGESTION = os.environ.get('PROGRESS_INGESTION', 'false').lower() == 'true'
+    PROGRESS_QUEUE_PATH = os.environ.get('PROGRESS_QUEUE_PATH', 'progress_queue.db')
+    PROGRESS_QUEUE_WRITER = os.environ.get('PROGRESS_QUEUE_WRITER', 'thread')
+    PROGRESS_QUEUE_MAX_DEPTH = int(os.environ.get('PROGRESS_QUEUE_MAX_DEPTH', 10000))
+    PROGRESS_QUEUE_BATCH_SIZE = int(os.environ.get('PROGRESS_QUEUE_BATCH_SIZE', 200))
+    PROGRESS_QUEUE_POLL_INTERVAL = float(os.environ.get('PROGRESS_QUEUE_POLL_INTERVAL', 0.2))
+    PROGRESS_QUEUE_CLAIM_TIMEOUT = float(os.environ.get('PROGRESS_QUEUE_CLAIM_TIMEOUT', 60))
+
+    # Request metrics served at /api/v1/metrics, to scrapers sending
+    # "Authorization: Bearer <METRICS_TOKEN>" (the endpoint is off without a token)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # gzip/brotli compression of /api/ responses larger than COMPRESSION_MIN_SIZE
+    # bytes (brotli needs the optional `brotli` package)
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+
+    # Compiled template cache (defaults to a directory under the system temp
+    # dir; a configured directory is created if missing)
+    TEMPLATE_BYTECODE_CACHE = os.environ.get('TEMPLATE_BYTECODE_CACHE', 'true').lower() == 'true'
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR')
+
+    # Minify the script/stylesheet bundles served from /assets/ (see app/assets.py)
+    ASSETS_MINIFY = os.environ.get('ASSETS_MINIFY', 'true').lower() == 'true'
+
+    # cProfile requests (all of them, or those carrying a token from
+    # `flask profiling token`); results are aggregated per endpoint
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', 'profiles')
+    PROFILING_FLUSH_EVERY = int(os.environ.get('PROFILING_FLUSH_EVERY', 20))
+    PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', 3600))
+
+    # Opt-in per-request SQL profiling (Server-Timing header + log lines)
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', 'false').lower() == 'true'
+    SQL_PROFILING_TOP_N = int(os.environ.get('SQL_PROFILING_TOP_N', 3))
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG', 'slow_queries.log')
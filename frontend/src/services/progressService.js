@@ -18,6 +18,12 @@ const progressService = {
     const response = await api.put(`/users/me/flashcards/${flashcardId}/progress`, progressData);
     return response.data;
   },
+
+  // Record a review ('again', 'hard', 'good' or 'easy'); the server schedules it
+  reviewFlashcard: async (flashcardId, rating) => {
+    const response = await api.post(`/users/me/flashcards/${flashcardId}/review`, { rating });
+    return response.data;
+  },
 };
 
 export default progressService;
@@ -8,13 +8,6 @@ export const CONFIG = {
     HARD: 15,   // 15 minutes
   },
   
-  // SM2 Algorithm defaults
-  SM2: {
-    INITIAL_EASE_FACTOR: 2.5,
-    MIN_EASE_FACTOR: 1.3,
-    MAX_EASE_FACTOR: 2.5,
-  },
-  
   // Messages
   MESSAGES: {
     DECK_COMPLETE: 'Congratulations! You have completed reviewing all cards in this deck.',
@@ -0,0 +1,34 @@
+"""add deck scheduler and fsrs progress state
+
+Revision ID: a2d8f4c6e0b3
+Revises: f1c6a8e2b4d7
+Create Date: 2026-10-19 16:41:09.117350
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d8f4c6e0b3'
+down_revision = 'f1c6a8e2b4d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('decks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scheduler', sa.String(length=20), nullable=False, server_default='sm2'))
+
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('stability', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('difficulty', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.drop_column('difficulty')
+        batch_op.drop_column('stability')
+
+    with op.batch_alter_table('decks', schema=None) as batch_op:
+        batch_op.drop_column('scheduler')
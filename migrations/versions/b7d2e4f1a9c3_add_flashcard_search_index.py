@@ -0,0 +1,56 @@
+"""add flashcard search index
+
+Revision ID: b7d2e4f1a9c3
+Revises: 316d4c2ef495
+Create Date: 2026-10-19 10:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e4f1a9c3'
+down_revision = '316d4c2ef495'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.create_index('ix_flashcards_fulltext', 'flashcards', ['question', 'answer'],
+                        mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        # External-content FTS5 table kept in sync by triggers (see app/search.py)
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS flashcards_fts USING fts5("
+                   "question, answer, content='flashcards', content_rowid='rowid', "
+                   "tokenize='unicode61 remove_diacritics 2')")
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS flashcards_fts_insert AFTER INSERT ON flashcards BEGIN
+                INSERT INTO flashcards_fts(rowid, question, answer)
+                VALUES (new.rowid, new.question, new.answer);
+            END""")
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS flashcards_fts_delete AFTER DELETE ON flashcards BEGIN
+                INSERT INTO flashcards_fts(flashcards_fts, rowid, question, answer)
+                VALUES ('delete', old.rowid, old.question, old.answer);
+            END""")
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS flashcards_fts_update AFTER UPDATE OF question, answer ON flashcards BEGIN
+                INSERT INTO flashcards_fts(flashcards_fts, rowid, question, answer)
+                VALUES ('delete', old.rowid, old.question, old.answer);
+                INSERT INTO flashcards_fts(rowid, question, answer)
+                VALUES (new.rowid, new.question, new.answer);
+            END""")
+        op.execute("INSERT INTO flashcards_fts(flashcards_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.drop_index('ix_flashcards_fulltext', table_name='flashcards')
+    elif dialect == 'sqlite':
+        for trigger in ('flashcards_fts_insert', 'flashcards_fts_delete', 'flashcards_fts_update'):
+            op.execute('DROP TRIGGER IF EXISTS {}'.format(trigger))
+        op.execute('DROP TABLE IF EXISTS flashcards_fts')
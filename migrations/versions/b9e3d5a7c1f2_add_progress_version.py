@@ -0,0 +1,26 @@
+"""add progress version
+
+Revision ID: b9e3d5a7c1f2
+Revises: a2d8f4c6e0b3
+Create Date: 2026-10-19 17:58:12.664091
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9e3d5a7c1f2'
+down_revision = 'a2d8f4c6e0b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,36 @@
+"""microsecond updated_at on mysql
+
+Revision ID: c3f7a9e1d5b8
+Revises: b9e3d5a7c1f2
+Create Date: 2026-10-19 21:14:37.208519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9e1d5b8'
+down_revision = 'b9e3d5a7c1f2'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'decks', 'flashcards', 'progress')
+
+
+def upgrade():
+    # Other databases already store fractional seconds
+    if op.get_bind().dialect.name not in ('mysql', 'mariadb'):
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=mysql.DATETIME(),
+                        type_=mysql.DATETIME(fsp=6), existing_nullable=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name not in ('mysql', 'mariadb'):
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=mysql.DATETIME(fsp=6),
+                        type_=mysql.DATETIME(), existing_nullable=False)
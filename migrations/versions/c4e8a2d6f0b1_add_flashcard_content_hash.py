@@ -0,0 +1,55 @@
+"""add flashcard content hash
+
+Revision ID: c4e8a2d6f0b1
+Revises: b7d2e4f1a9c3
+Create Date: 2026-10-19 11:02:17.840635
+
+"""
+import hashlib
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2d6f0b1'
+down_revision = 'b7d2e4f1a9c3'
+branch_labels = None
+depends_on = None
+
+
+def _normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text or '').casefold().split())
+
+
+def upgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_flashcards_deck_content_hash', ['deck_id', 'content_hash'])
+
+    # Backfill with the same normalization as Flashcard.compute_content_hash
+    connection = op.get_bind()
+    flashcards = table('flashcards',
+        column('id', sa.String),
+        column('question', sa.String),
+        column('answer', sa.String),
+        column('content_hash', sa.String)
+    )
+    rows = connection.execute(sa.select(flashcards.c.id, flashcards.c.question,
+                                        flashcards.c.answer)).fetchall()
+    for start in range(0, len(rows), 1000):
+        connection.execute(
+            flashcards.update().where(flashcards.c.id == sa.bindparam('flashcard_id')).values(
+                content_hash=sa.bindparam('hash')),
+            [{'flashcard_id': row.id,
+              'hash': hashlib.sha256((_normalize(row.question) + '\x1f' + _normalize(row.answer))
+                                     .encode('utf-8')).hexdigest()}
+             for row in rows[start:start + 1000]]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('flashcards', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcards_deck_content_hash')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,26 @@
+"""add progress next_review_date index
+
+Revision ID: d5f9b3e7a1c2
+Revises: c4e8a2d6f0b1
+Create Date: 2026-10-19 11:47:05.226413
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f9b3e7a1c2'
+down_revision = 'c4e8a2d6f0b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_progress_next_review_date'), ['next_review_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_progress_next_review_date'))
@@ -0,0 +1,44 @@
+"""add review log
+
+Revision ID: e3b7c1d9f5a4
+Revises: d5f9b3e7a1c2
+Create Date: 2026-10-19 14:02:31.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b7c1d9f5a4'
+down_revision = 'd5f9b3e7a1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_log',
+    sa.Column('id', sa.String(length=60), nullable=False),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.String(length=60), nullable=False),
+    sa.Column('deck_id', sa.String(length=60), nullable=False),
+    sa.Column('flashcard_id', sa.String(length=60), nullable=False),
+    sa.Column('rating', sa.String(length=60), nullable=True),
+    sa.Column('correct', sa.Boolean(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('interval', sa.Float(), nullable=True),
+    sa.Column('ease_factor', sa.Float(), nullable=True),
+    sa.Column('elapsed_days', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'reviewed_at')
+    )
+    with op.batch_alter_table('review_log', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_review_log_reviewed_at'), ['reviewed_at'], unique=False)
+        batch_op.create_index('ix_review_log_user_reviewed_at', ['user_id', 'reviewed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('review_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_log_user_reviewed_at')
+        batch_op.drop_index(batch_op.f('ix_review_log_reviewed_at'))
+
+    op.drop_table('review_log')
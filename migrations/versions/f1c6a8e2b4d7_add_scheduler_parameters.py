@@ -0,0 +1,38 @@
+"""add scheduler parameters
+
+Revision ID: f1c6a8e2b4d7
+Revises: e3b7c1d9f5a4
+Create Date: 2026-10-19 15:20:44.902137
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6a8e2b4d7'
+down_revision = 'e3b7c1d9f5a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduler_parameters',
+    sa.Column('user_id', sa.String(length=60), nullable=False),
+    sa.Column('first_interval', sa.Float(), nullable=False),
+    sa.Column('second_interval', sa.Float(), nullable=False),
+    sa.Column('interval_modifier', sa.Float(), nullable=False),
+    sa.Column('min_ease', sa.Float(), nullable=False),
+    sa.Column('max_ease', sa.Float(), nullable=False),
+    sa.Column('again_minutes', sa.Float(), nullable=False),
+    sa.Column('hard_minutes', sa.Float(), nullable=False),
+    sa.Column('reviews', sa.Integer(), nullable=False),
+    sa.Column('log_loss', sa.Float(), nullable=True),
+    sa.Column('fitted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_parameters')
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Shared fixtures: an application on a throwaway SQLite database, a helper
+counting the SQL statements a block of code emits, and a seeded user
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Config reads the environment at import time
+TEST_DIR = tempfile.mkdtemp(prefix='flasheeta-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-key-that-is-long-enough-for-hs256')
+os.environ['LOG_FILE'] = os.path.join(TEST_DIR, 'app.log')
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+os.environ['TEMPLATE_BYTECODE_CACHE'] = 'false'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app, db  # noqa: E402
+
+PASSWORD = 'test-password'
+
+
+@pytest.fixture(scope='session')
+def app():
+    """ The application, with CSRF checks disabled for form posts """
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """ A test client """
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Returns a context manager collecting the SQL statements executed
+    inside it into the list it yields
+    """
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+    return counter
+
+
+@pytest.fixture
+def user(app, request):
+    """ A user with one deck, unique to the test """
+    from app.services.user_service import UserService
+    from app.services.deck_service import DeckService
+
+    name = request.node.name[:100]
+    with app.app_context():
+        user = UserService.create_user(name, name + '@test.local', PASSWORD)
+        deck = DeckService.create_deck('Deck', user.id)
+        return {'id': user.id, 'name': name, 'deck_id': deck.id}
+
+
+@pytest.fixture
+def logged_in(client, user):
+    """ A test client logged in to the web session of `user` """
+    response = client.post('/auth/login', data={'username': user['name'], 'password': PASSWORD})
+    assert response.status_code == 302
+    return client
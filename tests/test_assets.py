@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""
+The built-in JavaScript minifier keeps code and literals around comments
+"""
+
+import pytest
+
+from app import assets
+
+
+@pytest.fixture(autouse=True)
+def builtin_minifier(monkeypatch):
+    """ Tests the fallback even where rjsmin is installed """
+    monkeypatch.setattr(assets, 'rjsmin', None)
+
+
+def test_code_after_an_inline_block_comment_is_kept():
+    assert assets.minify_js('/* a */ const a = 1; /* b */ const b = 2;\n') == 'const a = 1;   const b = 2;'
+
+
+def test_comment_markers_inside_literals_are_kept():
+    source = ('const s = "/* not */ a comment // either";\n'
+              "const u = 'http://example.com'; // dropped\n"
+              'const r = /\\/\\*[/]*/g, d = s.length / 2 / 1;\n')
+    assert assets.minify_js(source) == ('const s = "/* not */ a comment // either";\n'
+                                        "const u = 'http://example.com';\n"
+                                        'const r = /\\/\\*[/]*/g, d = s.length / 2 / 1;')
+
+
+def test_template_literals_are_copied_verbatim():
+    source = 'const t = `line\n    /* kept */ ${a + `nested`}\n  end`;\n'
+    assert assets.minify_js(source) == source.rstrip('\n')
+
+
+def test_multi_line_comments_keep_a_line_break():
+    assert assets.minify_js('a = 1\n/* one\n two */b = 2\n') == 'a = 1\nb = 2'
@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+"""
+Daily study counts: a card first studied today stays a new card when it is
+relearned the same day
+"""
+
+from datetime import datetime, timedelta
+
+from app.services.flashcard_service import FlashcardService
+from app.services.progress_service import ProgressService
+from app.services.scheduler_service import SchedulerService
+
+
+def test_relearned_new_card_counts_as_new(app, user):
+    now = datetime.utcnow().replace(hour=12)
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        ProgressService.review_flashcards(user['id'], [(flashcard_id, 'again')], now=now)
+        ProgressService.review_flashcards(user['id'], [(flashcard_id, 'good')],
+                                          now=now + timedelta(minutes=10))
+
+        assert SchedulerService.get_daily_counts(user['id'], now=now) == {'new': 1, 'reviews': 0}
+
+
+def test_card_first_studied_before_today_counts_as_review(app, user):
+    now = datetime.utcnow().replace(hour=12)
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        ProgressService.review_flashcards(user['id'], [(flashcard_id, 'good')], now=now - timedelta(days=1))
+        ProgressService.review_flashcards(user['id'], [(flashcard_id, 'good')], now=now)
+
+        assert SchedulerService.get_daily_counts(user['id'], now=now) == {'new': 0, 'reviews': 1}
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""
+Access to /api/v1/metrics: off without a METRICS_TOKEN, and served only to
+requests carrying it as a bearer token
+"""
+
+import pytest
+
+
+@pytest.fixture
+def metrics_token(app):
+    """ Configures a metrics token for the test """
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+    yield 'scrape-token'
+    app.config['METRICS_TOKEN'] = None
+
+
+def test_metrics_are_off_without_a_token(client):
+    assert client.get('/api/v1/metrics').status_code == 404
+
+
+def test_metrics_need_the_token(client, metrics_token):
+    assert client.get('/api/v1/metrics').status_code == 401
+    response = client.get('/api/v1/metrics', headers={'Authorization': 'Bearer wrong'})
+    assert response.status_code == 401
+
+
+def test_metrics_are_served_with_the_token(client, metrics_token):
+    response = client.get('/api/v1/metrics', headers={'Authorization': 'Bearer ' + metrics_token})
+    assert response.status_code == 200
+    assert 'flasheeta_' in response.get_data(as_text=True)
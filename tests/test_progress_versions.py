@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Optimistic locking of progress rows: a concurrent update surfaces as a
+ConflictError on both the single-row and the batched paths
+"""
+
+import pytest
+
+from app import db
+from app.exceptions import ConflictError
+from app.models.progress import Progress
+from app.services.flashcard_service import FlashcardService
+from app.services.progress_service import ProgressService
+
+
+def bump_version_concurrently(flashcard_id):
+    """ Updates a progress row through another connection, as a second worker would """
+    with db.engine.begin() as connection:
+        connection.execute(Progress.__table__.update().where(
+            Progress.flashcard_id == flashcard_id).values(version=Progress.version + 1))
+
+
+def test_stale_expected_version_is_a_conflict(app, user):
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        with pytest.raises(ConflictError) as error:
+            ProgressService.update_progress(flashcard_id, {'interval': 2}, expected_version=2)
+        assert error.value.payload == {'version': 1}
+
+
+def test_concurrent_update_during_a_batch_is_a_conflict(app, user, monkeypatch):
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        apply_fields = ProgressService._apply_fields
+        calls = []
+
+        def apply_fields_racing(progress, data):
+            if not calls:
+                bump_version_concurrently(flashcard_id)
+            calls.append(data)
+            apply_fields(progress, data)
+
+        monkeypatch.setattr(ProgressService, '_apply_fields', apply_fields_racing)
+        # The second update of the card flushes the first, which finds the row moved on
+        with pytest.raises(ConflictError):
+            ProgressService.apply_progress_updates([(flashcard_id, {'interval': 2}, None),
+                                                    (flashcard_id, {'interval': 3}, None)])
+        assert db.session.get(Progress, ProgressService.get_progress(flashcard_id).id).version == 2
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Query-count checks: the current user is resolved with at most one query
+per request, and the list and batch calls emit the same number of
+statements whatever the number of rows (no N+1 queries)
+"""
+
+from app.services.deck_service import DeckService
+from app.services.flashcard_service import FlashcardService
+from app.services.progress_service import ProgressService
+from app.services.user_service import user_cache
+
+
+def user_queries(statements):
+    """ The statements reading the users table """
+    return [statement for statement in statements if 'FROM users' in statement]
+
+
+def selects(statements):
+    """ The SELECT statements """
+    return [statement for statement in statements if statement.lstrip().startswith('SELECT')]
+
+
+def add_flashcards(app, deck_id, count, start=0):
+    """ Adds `count` flashcards (due immediately) to a deck and returns their IDs """
+    with app.app_context():
+        return [FlashcardService.create_flashcard('Question {}'.format(i), 'Answer', deck_id).id
+                for i in range(start, start + count)]
+
+
+def test_current_user_is_loaded_with_at_most_one_query(logged_in, count_queries):
+    user_cache.clear()
+    with count_queries() as statements:
+        response = logged_in.get('/api/v1/users/me/decks')
+    assert response.status_code == 200
+    assert len(user_queries(statements)) <= 1
+
+    # The user cache now serves the next requests
+    with count_queries() as statements:
+        logged_in.get('/api/v1/users/me/decks')
+        logged_in.get('/api/v1/users/me/flashcards/due')
+    assert user_queries(statements) == []
+
+
+def test_deck_list_query_count_does_not_grow_with_decks(app, logged_in, user, count_queries):
+    logged_in.get('/api/v1/users/me/decks')  # loads the user into the cache
+    with count_queries() as few:
+        assert len(logged_in.get('/api/v1/users/me/decks').get_json()) == 1
+
+    with app.app_context():
+        for i in range(5):
+            DeckService.create_deck('Deck {}'.format(i), user['id'])
+    with count_queries() as many:
+        assert len(logged_in.get('/api/v1/users/me/decks').get_json()) == 6
+    assert len(many) == len(few)
+
+
+def test_due_flashcards_query_count_does_not_grow_with_cards(app, logged_in, user, count_queries):
+    add_flashcards(app, user['deck_id'], 2)
+    logged_in.get('/api/v1/users/me/decks')  # loads the user into the cache
+    with count_queries() as few:
+        assert len(logged_in.get('/api/v1/users/me/flashcards/due').get_json()) == 2
+
+    add_flashcards(app, user['deck_id'], 10, start=2)
+    with count_queries() as many:
+        cards = logged_in.get('/api/v1/users/me/flashcards/due').get_json()
+    assert len(cards) == 12
+    assert all('progress' in card for card in cards)
+    assert len(many) == len(few)
+
+
+def test_review_batch_query_count_does_not_grow_with_reviews(app, user, count_queries):
+    flashcard_ids = add_flashcards(app, user['deck_id'], 12)
+
+    with app.app_context():
+        # Loads the user's scheduler parameters into their cache
+        ProgressService.review_flashcards(user['id'], [(flashcard_ids.pop(), 'good')])
+        with count_queries() as one:
+            ProgressService.review_flashcards(user['id'], [(flashcard_ids[0], 'good')])
+        with count_queries() as ten:
+            progress = ProgressService.review_flashcards(
+                user['id'], [(flashcard_id, 'good') for flashcard_id in flashcard_ids[1:]])
+    assert [row.review_count for row in progress] == [1] * 10
+    # Reads are batched; the unit of work writes one versioned UPDATE per row
+    assert len(selects(ten)) == len(selects(one))
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Review log writes: a review is committed in the transaction of its progress
+change, so other connections see it at once and a failed change leaves no
+review behind
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from app import db
+from app.exceptions import ConflictError
+from app.models.progress import Progress
+from app.models.review_log import ReviewLog
+from app.services.flashcard_service import FlashcardService
+from app.services.progress_service import ProgressService
+
+
+def count_reviews(flashcard_id):
+    """ Counts a card's reviews through another connection, as a second worker would """
+    with db.engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(ReviewLog).where(
+            ReviewLog.flashcard_id == flashcard_id)).scalar()
+
+
+def test_review_is_visible_once_committed(app, user):
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        ProgressService.review_flashcards(user['id'], [(flashcard_id, 'good')])
+        ProgressService.update_progress(flashcard_id, {'review_count': 2, 'correct_count': 2})
+
+        assert count_reviews(flashcard_id) == 2
+
+
+def test_conflicting_batch_writes_no_review(app, user, monkeypatch):
+    with app.app_context():
+        flashcard_id = FlashcardService.create_flashcard('Question', 'Answer', user['deck_id']).id
+        apply_fields = ProgressService._apply_fields
+
+        def apply_fields_racing(progress, data):
+            with db.engine.begin() as connection:
+                connection.execute(Progress.__table__.update().where(
+                    Progress.flashcard_id == flashcard_id).values(version=Progress.version + 1))
+            apply_fields(progress, data)
+
+        monkeypatch.setattr(ProgressService, '_apply_fields', apply_fields_racing)
+        with pytest.raises(ConflictError):
+            ProgressService.apply_progress_updates([(flashcard_id, {'review_count': 1}, None)])
+
+        assert count_reviews(flashcard_id) == 0